@@ -0,0 +1,84 @@
+"""Run the benchmarks.
+
+Usage:
+    python -m benchmarks                         # full size payloads
+    python -m benchmarks --scale 0.1 -k decode   # smaller, decode only
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.2
+
+With --compare, the exit status is 1 when a benchmark got slower, or its
+peak memory grew, by more than the threshold.
+"""
+
+import argparse
+import sys
+
+from . import (  # noqa: F401 registers the benchmarks
+    bench_bulk,
+    bench_codec,
+    bench_hot_path,
+    bench_index,
+    bench_part_out,
+    bench_price_guide,
+    bench_price_stats,
+    bench_records,
+    bench_sync,
+    bench_table,
+)
+from .runner import (
+    BENCHMARKS,
+    Context,
+    load,
+    print_results,
+    regressions,
+    run_benchmark,
+    save,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the bricklink_py benchmarks")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="payload size factor, 1.0 is 50000 lots and 10000 orders",
+    )
+    parser.add_argument(
+        "-k", dest="pattern", help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare to the results in this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slowdown reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    context = Context(args.scale)
+    results = {}
+    try:
+        for bench in BENCHMARKS:
+            if args.pattern and args.pattern not in bench.name:
+                continue
+            results[bench.name] = run_benchmark(bench, context)
+    finally:
+        context.close()
+
+    baseline = load(args.compare) if args.compare else None
+    print_results(results, baseline)
+    if args.save:
+        save(args.save, results)
+
+    if baseline:
+        slower = regressions(results, baseline, args.threshold)
+        if slower:
+            print(f"Regressions over {args.threshold:.0%}: {', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Benchmarks of bulk lot writes against a stub server with 20 ms of
+latency per request."""
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.bulk import BulkUploader
+from bricklink_py.write_behind import WriteBehindBuffer
+
+from .runner import benchmark
+
+
+def _setup(context, max_workers):
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    lot = next(iter(server.data.inventories.values()))
+    bodies = [
+        {
+            "item": {"no": lot["item"]["no"], "type": lot["item"]["type"]},
+            "color_id": lot["color_id"],
+            "quantity": 1,
+            "unit_price": "0.100",
+            "new_or_used": "N",
+        }
+        for _ in range(max(100, int(2000 * context.scale)))
+    ]
+    uploader = BulkUploader(client, chunk_size=100, max_workers=max_workers)
+    return lambda: uploader.create(bodies)
+
+
+@benchmark(repeat=3)
+def bulk_create_serial(context):
+    """Create lots by chunks of 100, one request at a time."""
+    return _setup(context, max_workers=1)
+
+
+@benchmark(repeat=3)
+def bulk_create_parallel(context):
+    """Create lots by chunks of 100, 8 requests at a time."""
+    return _setup(context, max_workers=8)
+
+
+def _update_setup(context):
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    ids = list(server.data.inventories)[:100]
+    return client, [(inventory_id, {"quantity": "+1"}) for inventory_id in ids]
+
+
+@benchmark(repeat=3)
+def update_100_loop(context):
+    """Update 100 lots calling update_store_inventory in a loop."""
+    client, changes = _update_setup(context)
+
+    def loop():
+        for inventory_id, body in changes:
+            client.store_inventory.update_store_inventory(inventory_id, body)
+
+    return loop
+
+
+@benchmark(repeat=3)
+def update_100_bulk(context):
+    """Update 100 lots with update_store_inventories."""
+    client, changes = _update_setup(context)
+    return lambda: client.store_inventory.update_store_inventories(changes)
+
+
+@benchmark(repeat=3)
+def update_100x3_write_behind(context):
+    """Three updates of each of 100 lots through a write-behind buffer."""
+    client, changes = _update_setup(context)
+    buffer = client.store_inventory.attach_write_behind(
+        WriteBehindBuffer(max_delay=None)
+    )
+
+    def run():
+        for inventory_id, body in changes * 3:
+            client.store_inventory.update_store_inventory(inventory_id, body)
+        return buffer.flush()
+
+    return run
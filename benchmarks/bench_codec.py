@@ -0,0 +1,33 @@
+"""Benchmarks of the JSON codecs on large responses and request bodies,
+compared to the default decoding by requests (decode_* in bench_hot_path)."""
+
+from bricklink_py.codec import CODECS, get_codec
+from bricklink_py.utils import handle_response
+
+from .bench_hot_path import encode, make_response
+from .runner import benchmark
+
+
+def register(codec):
+    @benchmark(name=f"decode_inventories_{codec.name}")
+    def decode_inventories(context):
+        payload = encode(list(context.data.inventories.values()))
+        return lambda: handle_response(make_response(payload), codec)
+
+    @benchmark(name=f"decode_orders_{codec.name}")
+    def decode_orders(context):
+        payload = encode(list(context.data.orders.values()))
+        return lambda: handle_response(make_response(payload), codec)
+
+    @benchmark(name=f"encode_lots_{codec.name}", number=10)
+    def encode_lots(context):
+        """Encode the body of a bulk creation of 1000 lots."""
+        lots = list(context.data.inventories.values())[:1000]
+        return lambda: codec.dumps(lots)
+
+
+for name in CODECS:
+    try:
+        register(get_codec(name))
+    except ImportError:
+        continue
@@ -0,0 +1,146 @@
+"""Benchmarks of the request/response hot path:
+BaseResource._request -> request() -> handle_response.
+
+The canned benchmarks replace the network by an adapter answering a
+prebuilt payload, so they measure the library overhead alone. The stub
+benchmarks go through a local StubServer over HTTP.
+"""
+
+import json
+
+from requests import PreparedRequest, Request, Response
+from requests.adapters import BaseAdapter
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.hooks import MetricsAggregator
+from bricklink_py.utils import API_BASE_URL, handle_response, request_key
+
+from .runner import benchmark
+
+INVENTORY_PARAMS = {
+    "item_type": "PART,MINIFIG",
+    "status": "-N,-R",
+    "category_id": None,
+    "color_id": "1,5,11,86",
+}
+
+
+def encode(data) -> bytes:
+    """Encode a successful API response."""
+    return json.dumps({"meta": {"code": 200}, "data": data}).encode()
+
+
+def make_response(payload: bytes, request=None) -> Response:
+    """Build the response requests would return for a payload."""
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = payload
+    response.request = request
+    response.url = request.url if request is not None else API_BASE_URL
+    return response
+
+
+class CannedAdapter(BaseAdapter):
+    """Transport adapter answering every request with the same payload."""
+
+    def __init__(self, payload: bytes):
+        super().__init__()
+        self.payload = payload
+
+    def send(self, request, **kwargs):
+        return make_response(self.payload, request)
+
+    def close(self):
+        pass
+
+
+def canned_client(payload: bytes) -> Bricklink:
+    """Create a client whose requests are answered with payload."""
+    client = Bricklink("ck", "cs", "tk", "tks")
+    client.oauth_session.mount("https://", CannedAdapter(payload))
+    return client
+
+
+@benchmark(number=500)
+def oauth_sign(context):
+    """Build and sign a GET request with query parameters."""
+    session = Bricklink("ck", "cs", "tk", "tks").oauth_session
+    url = f"{API_BASE_URL}inventories"
+    return lambda: session.prepare_request(Request("GET", url, params=INVENTORY_PARAMS))
+
+
+@benchmark(number=2000)
+def param_encoding(context):
+    """Encode query parameters into a URL."""
+    url = f"{API_BASE_URL}inventories"
+    return lambda: PreparedRequest().prepare_url(url, INVENTORY_PARAMS)
+
+
+@benchmark(number=2000)
+def cache_key(context):
+    """Compute the cache and single flight key of a call."""
+    return lambda: request_key("get", "inventories", INVENTORY_PARAMS)
+
+
+@benchmark(number=500)
+def call_overhead(context):
+    """Full call of a small endpoint, without network."""
+    client = canned_client(encode(context.data.colors[1]))
+    return lambda: client.color.get_color(1)
+
+
+@benchmark(number=500)
+def call_overhead_hooks(context):
+    """Full call of a small endpoint with the metrics hooks, without
+    network."""
+    client = canned_client(encode(context.data.colors[1]))
+    MetricsAggregator().register(client.hooks)
+    return lambda: client.color.get_color(1)
+
+
+@benchmark()
+def decode_inventories(context):
+    """Decode a store inventory response of context.lots lots."""
+    payload = encode(list(context.data.inventories.values()))
+    return lambda: handle_response(make_response(payload))
+
+
+@benchmark()
+def decode_orders(context):
+    """Decode an order list response of context.orders orders."""
+    payload = encode(list(context.data.orders.values()))
+    return lambda: handle_response(make_response(payload))
+
+
+@benchmark()
+def call_inventories(context):
+    """Full call returning context.lots lots, without network."""
+    client = canned_client(encode(list(context.data.inventories.values())))
+    return lambda: client.store_inventory.get_store_inventories(**INVENTORY_PARAMS)
+
+
+@benchmark()
+def stub_inventories(context):
+    """Fetch every lot from the stub server."""
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=context.server.base_url)
+    return client.store_inventory.get_store_inventories
+
+
+@benchmark()
+def stub_orders(context):
+    """Fetch every order from the stub server."""
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=context.server.base_url)
+    return client.order.get_orders
+
+
+@benchmark()
+def stub_iter_inventories(context):
+    """Stream every lot from the stub server, one record at a time."""
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=context.server.base_url)
+
+    def consume():
+        for lot in client.store_inventory.iter_store_inventories():
+            pass
+
+    return consume
@@ -0,0 +1,50 @@
+"""Benchmarks of matching order items against the store inventory, with the
+InventoryIndex and with a scan of the lots."""
+
+from bricklink_py.inventory_index import InventoryIndex, lot_key
+
+from .runner import benchmark
+
+# Order items matched per call
+ORDER_ITEMS = 200
+
+
+def _order_items(context):
+    items = [
+        item
+        for batches in context.data.order_items.values()
+        for batch in batches
+        for item in batch
+    ]
+    return items[:ORDER_ITEMS]
+
+
+@benchmark()
+def index_build(context):
+    """Index context.lots lots."""
+    lots = list(context.data.inventories.values())
+    return lambda: InventoryIndex(lots)
+
+
+@benchmark(number=20)
+def match_order_items_index(context):
+    """Match 200 order items against the lots, with the index."""
+    index = InventoryIndex(context.data.inventories.values())
+    items = _order_items(context)
+    return lambda: [index.match(item) for item in items]
+
+
+@benchmark(number=1)
+def match_order_items_scan(context):
+    """Match 200 order items against the lots, scanning them."""
+    keyed = [(lot_key(lot), lot) for lot in context.data.inventories.values()]
+    items = _order_items(context)
+
+    def scan():
+        matches = []
+        for item in items:
+            key = lot_key(item)
+            matches.append([lot for lot_key_, lot in keyed if lot_key_ == key])
+        return matches
+
+    return scan
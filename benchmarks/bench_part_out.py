@@ -0,0 +1,96 @@
+"""Benchmarks of parting out and valuing sets against a stub server with 20 ms of latency
+per request."""
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.part_out import PartOut
+from bricklink_py.price_guide import PriceGuideCache
+
+from .runner import benchmark
+
+try:
+    from bricklink_py.part_out_value import part_out_value
+except ImportError:  # numpy is not installed
+    part_out_value = None
+
+
+def _sets(server, count):
+    sets = [no for type, no in server.data.items if type == "SET"]
+    return [("SET", sets[i % len(sets)]) for i in range(count)]
+
+
+def _bom_recursive(client, type, no):
+    """Bill of materials fetching every sub-assembly where it is found."""
+    bom = {}
+    for group in client.catalog_item.get_subsets(type, no):
+        entry = group["entries"][0]
+        child = (entry["item"]["type"], entry["item"]["no"])
+        if child[0] in ("SET", "MINIFIG"):
+            for key, count in _bom_recursive(client, *child).items():
+                bom[key] = bom.get(key, 0) + count * entry["quantity"]
+        else:
+            key = child + (entry["color_id"],)
+            bom[key] = bom.get(key, 0) + entry["quantity"]
+    return bom
+
+
+@benchmark(number=1, repeat=1)
+def part_out_20_sets_recursive(context):
+    """Part out 20 sets recursing into get_subsets, without memoization."""
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    items = _sets(server, 20)
+    return lambda: [_bom_recursive(client, *item) for item in items]
+
+
+@benchmark(number=1, repeat=3)
+def part_out_500_sets(context):
+    """Part out 500 sets with a new PartOut engine."""
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    items = _sets(server, 500)
+    return lambda: PartOut(client).boms(items)
+
+
+def _value_naive(client, no):
+    """Part-out value pricing every subset with its own get_price_guide."""
+    total = 0
+    for group in client.catalog_item.get_subsets(
+        "SET", no, break_minifigs=True, break_subsets=True
+    ):
+        entry = group["entries"][0]
+        guide = client.catalog_item.get_price_guide(
+            entry["item"]["type"], entry["item"]["no"], entry["color_id"], "sold"
+        )
+        total += entry["quantity"] * float(guide["qty_avg_price"])
+    return total
+
+
+@benchmark(number=1, repeat=1)
+def part_out_value_5_sets_naive(context):
+    """Part-out value of 5 sets, one get_price_guide per subset."""
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    items = [no for _, no in _sets(server, 5)]
+    return lambda: [_value_naive(client, no) for no in items]
+
+
+def register():
+    @benchmark(number=1, repeat=3)
+    def part_out_value_50_sets(context):
+        """Part-out value of 50 sets with part_out_value, cold caches."""
+        server = context.slow_server
+        client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+        items = [no for _, no in _sets(server, 50)]
+
+        def run():
+            with client.catalog_item.attach_price_guide_cache(PriceGuideCache()):
+                try:
+                    return part_out_value(client, items)
+                finally:
+                    client.catalog_item.attach_price_guide_cache(None)
+
+        return run
+
+
+if part_out_value is not None:
+    register()
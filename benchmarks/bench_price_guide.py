@@ -0,0 +1,47 @@
+"""Benchmarks of price guide fetching against a stub server with 20 ms of
+latency per request."""
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.price_guide import PriceGuideCache
+
+from .runner import benchmark
+
+
+def _specs(server, count=100):
+    parts = [key[1] for key in server.data.items if key[0] == "PART"]
+    specs = [
+        ("PART", no, 11, guide_type, new_or_used)
+        for no in parts
+        for guide_type in ("sold", "stock")
+        for new_or_used in ("N", "U")
+    ]
+    return specs[:count]
+
+
+@benchmark(repeat=3)
+def price_guides_100_loop(context):
+    """Fetch 100 price guides calling get_price_guide in a loop."""
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    specs = _specs(server)
+    return lambda: [client.catalog_item.get_price_guide(*spec) for spec in specs]
+
+
+@benchmark(repeat=3)
+def price_guides_100_concurrent(context):
+    """Fetch 100 price guides with get_price_guides."""
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    specs = _specs(server)
+    return lambda: client.catalog_item.get_price_guides(specs)
+
+
+@benchmark(repeat=3)
+def price_guides_100_cached(context):
+    """Get 100 price guides held by a price guide cache."""
+    server = context.slow_server
+    client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+    client.catalog_item.attach_price_guide_cache(PriceGuideCache())
+    specs = _specs(server)
+    client.catalog_item.get_price_guides(specs)
+    return lambda: [client.catalog_item.get_price_guide(*spec) for spec in specs]
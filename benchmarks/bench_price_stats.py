@@ -0,0 +1,80 @@
+"""Benchmarks of price guide statistics over 5,000 guides, vectorized with
+PriceDetails against loops parsing every guide."""
+
+from bricklink_py.stub_server import StubData
+
+from .runner import benchmark
+
+try:
+    from bricklink_py.price_stats import PriceDetails
+except ImportError:  # numpy is not installed
+    PriceDetails = None
+
+_guides = []
+
+
+def _price_guides():
+    if not _guides:
+        data = StubData(parts=2500, lots=1, orders=1)
+        _guides.extend(
+            data.price_guide(type, no, {"guide_type": guide_type})
+            for type, no in data.items
+            if type == "PART"
+            for guide_type in ("sold", "stock")
+        )
+    return _guides
+
+
+def _loop_stats(guide):
+    entries = sorted(
+        (float(entry["unit_price"]), entry["quantity"])
+        for entry in guide["price_detail"]
+    )
+    total = sum(quantity for _, quantity in entries)
+    if not total:
+        return None
+    stats = []
+    for share in (0.1, 0.5, 0.9):
+        seen = 0
+        for price, quantity in entries:
+            seen += quantity
+            if seen >= share * total:
+                stats.append(price)
+                break
+    low, high = 0.1 * total, 0.9 * total
+    amount = kept = seen = 0
+    for price, quantity in entries:
+        weight = max(0, min(seen + quantity, high) - max(seen, low))
+        amount += weight * price
+        kept += weight
+        seen += quantity
+    stats.append(amount / kept)
+    return stats
+
+
+def register():
+    @benchmark(number=5)
+    def price_stats_vectorized(context):
+        """Median, 10th/90th percentiles and trimmed mean of 5,000 guides,
+        packing included."""
+        guides = _price_guides()
+
+        def run():
+            details = PriceDetails.from_guides(guides)
+            return (
+                details.percentile([10, 50, 90]),
+                details.trimmed_mean(0.1),
+            )
+
+        return run
+
+    @benchmark(number=1)
+    def price_stats_loop(context):
+        """Median, 10th/90th percentiles and trimmed mean of 5,000 guides,
+        one guide at a time."""
+        guides = _price_guides()
+        return lambda: [_loop_stats(guide) for guide in guides]
+
+
+if PriceDetails is not None:
+    register()
@@ -0,0 +1,30 @@
+"""Benchmarks of the record types against the plain dicts: memory of a
+decoded inventory, and a hot loop reading fields."""
+
+from bricklink_py.records import InventoryLot, to_records
+from bricklink_py.utils import handle_response
+
+from .bench_hot_path import encode, make_response
+from .runner import benchmark
+
+
+@benchmark()
+def decode_inventories_records(context):
+    """Decode a store inventory response into records. Compare the retained
+    memory to decode_inventories."""
+    payload = encode(list(context.data.inventories.values()))
+    return lambda: to_records(handle_response(make_response(payload)), InventoryLot)
+
+
+@benchmark()
+def stock_value_dicts(context):
+    """Sum quantity times price over the lots, as dicts."""
+    lots = list(context.data.inventories.values())
+    return lambda: sum(lot["quantity"] * float(lot["unit_price"]) for lot in lots)
+
+
+@benchmark()
+def stock_value_records(context):
+    """Sum quantity times price over the lots, as records."""
+    lots = to_records(list(context.data.inventories.values()), InventoryLot)
+    return lambda: sum(lot.quantity * float(lot.unit_price) for lot in lots)
@@ -0,0 +1,17 @@
+"""Benchmarks of the inventory diff of the sync engine."""
+
+import copy
+
+from bricklink_py.sync import diff_inventory
+
+from .runner import benchmark
+
+
+@benchmark(number=5)
+def diff_inventory_1pct(context):
+    """Diff context.lots lots against a desired state changing 1% of them."""
+    current = list(context.data.inventories.values())
+    desired = copy.deepcopy(current)
+    for lot in desired[::100]:
+        lot["quantity"] += 1
+    return lambda: diff_inventory(current, desired)
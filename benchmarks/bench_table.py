@@ -0,0 +1,59 @@
+"""Benchmarks of the columnar InventoryTable against loops over the lots."""
+
+from collections import defaultdict
+
+from .runner import benchmark
+
+try:
+    from bricklink_py.table import InventoryTable
+except ImportError:  # numpy is not installed
+    InventoryTable = None
+
+
+def register():
+    @benchmark()
+    def table_build(context):
+        """Build the table of context.lots lots."""
+        lots = list(context.data.inventories.values())
+        return lambda: InventoryTable.from_lots(lots)
+
+    @benchmark(number=20)
+    def stock_value_by_category_table(context):
+        """Stock value by category, vectorized."""
+        table = InventoryTable.from_lots(context.data.inventories.values())
+        return lambda: table.group_by("category_id").sum("stock_value")
+
+    @benchmark(number=20)
+    def stock_value_by_category_loop(context):
+        """Stock value by category, looping over the lots."""
+        lots = list(context.data.inventories.values())
+
+        def loop():
+            values = defaultdict(float)
+            for lot in lots:
+                values[lot["item"]["category_id"]] += lot["quantity"] * float(
+                    lot["unit_price"]
+                )
+            return values
+
+        return loop
+
+    @benchmark(number=20)
+    def below_price_table(context):
+        """Lots of new parts below a price threshold, vectorized."""
+        table = InventoryTable.from_lots(context.data.inventories.values())
+        return lambda: table.filter(table["unit_price"] < 0.5, new_or_used="N")
+
+    @benchmark(number=20)
+    def below_price_loop(context):
+        """Lots of new parts below a price threshold, looping over the lots."""
+        lots = list(context.data.inventories.values())
+        return lambda: [
+            lot
+            for lot in lots
+            if float(lot["unit_price"]) < 0.5 and lot["new_or_used"] == "N"
+        ]
+
+
+if InventoryTable is not None:
+    register()
@@ -0,0 +1,160 @@
+"""Registry, timing and reporting of the benchmarks."""
+
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+
+from bricklink_py.stub_server import StubData, StubServer
+
+BENCHMARKS = []
+
+
+class Benchmark:
+    """A benchmark: setup(context) prepares and returns the function timed."""
+
+    def __init__(self, name: str, setup, number: int = 1, repeat: int = 5):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+
+
+def benchmark(name: str = None, number: int = 1, repeat: int = 5):
+    """Register a benchmark setup function.
+
+    Keyword Arguments:
+        name -- Name of the benchmark. (default: {the function name})
+        number -- Calls per timing, for fast functions. (default: {1})
+        repeat -- Number of timings. (default: {5})
+    """
+
+    def decorator(setup):
+        BENCHMARKS.append(Benchmark(name or setup.__name__, setup, number, repeat))
+        return setup
+
+    return decorator
+
+
+class Context:
+    """Shared state of a run: the payload sizes, a lazily started stub server
+    holding data of that size, and one with network latency for the
+    benchmarks of concurrent writes."""
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        self.lots = max(1, int(50000 * scale))
+        self.orders = max(1, int(10000 * scale))
+        self._data = None
+        self._server = None
+        self._slow_server = None
+
+    @property
+    def data(self) -> StubData:
+        if self._data is None:
+            self._data = StubData(lots=self.lots, orders=self.orders)
+        return self._data
+
+    @property
+    def server(self) -> StubServer:
+        if self._server is None:
+            self._server = StubServer(data=self.data).start()
+        return self._server
+
+    @property
+    def slow_server(self) -> StubServer:
+        if self._slow_server is None:
+            self._slow_server = StubServer(
+                data=StubData(parts=100, lots=100, orders=10), latency=0.02
+            ).start()
+        return self._slow_server
+
+    def close(self):
+        for server in (self._server, self._slow_server):
+            if server is not None:
+                server.stop()
+
+
+def run_benchmark(bench: Benchmark, context: Context) -> dict:
+    """Time a benchmark, then measure the memory of one call.
+
+    Returns:
+        dict: min and median seconds per call, peak bytes allocated during a
+        call and bytes still held by its result.
+    """
+    func = bench.setup(context)
+    func()  # warm up connections and caches
+
+    timings = []
+    for _ in range(bench.repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(bench.number):
+            func()
+        timings.append((time.perf_counter() - start) / bench.number)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "peak": peak,
+        "retained": retained,
+    }
+
+
+def format_time(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def print_results(results: dict, baseline: dict = None):
+    """Print a table of the results, with the change against the baseline."""
+    print(
+        f"{'benchmark':<28} {'min':>10} {'median':>10} {'peak mem':>11} "
+        f"{'retained':>11} {'change':>8}"
+    )
+    for name, result in results.items():
+        change = ""
+        if baseline and name in baseline:
+            ratio = result["median"] / baseline[name]["median"] - 1
+            change = f"{ratio:+.0%}"
+        print(
+            f"{name:<28} {format_time(result['min']):>10} "
+            f"{format_time(result['median']):>10} "
+            f"{result['peak'] / 2**20:>8.2f} MB "
+            f"{result.get('retained', 0) / 2**20:>8.2f} MB {change:>8}"
+        )
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """Return the benchmarks slower, or using more memory, than the baseline
+    by more than threshold."""
+    slower = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ("median", "peak"):
+            if result[key] > baseline[name][key] * (1 + threshold):
+                slower.append(f"{name} {key}")
+    return slower
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path: str, results: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
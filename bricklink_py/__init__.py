@@ -1,6 +1,7 @@
+from .async_bricklink import AsyncBricklink
 from .bricklink import Bricklink
 
-__all__ = ["Bricklink"]
+__all__ = ["AsyncBricklink", "Bricklink"]
 
 # Package metadata
 __version__ = "0.1.2-beta"
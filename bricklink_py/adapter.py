@@ -0,0 +1,151 @@
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class PoolStats:
+    """Thread safe counters of the connections and requests of an adapter."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all the counters to zero."""
+        with self._lock:
+            self.connections_opened = 0
+            self.connect_time = 0.0
+            self.requests = 0
+            self.request_time = 0.0
+
+    def record_connect(self, seconds: float):
+        with self._lock:
+            self.connections_opened += 1
+            self.connect_time += seconds
+
+    def record_request(self, seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.request_time += seconds
+
+
+class _TimedConnectionMixin:
+    """Measure the time spent opening connections (TCP and TLS handshake)."""
+
+    pool_stats = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            self.pool_stats.record_connect(time.perf_counter() - start)
+
+
+class PoolingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with tunable connection pools, a default timeout and
+    statistics of the opened connections.
+
+    Connections are kept alive and reused by requests as long as the pool has
+    room for them, so pool_maxsize should be at least the number of threads
+    sharing the session.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["timeout"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout=None,
+    ):
+        """
+        Arguments:
+            pool_connections: Number of host pools to cache.
+            pool_maxsize: Maximum number of connections kept per host.
+            pool_block: Block when no free connection is available instead
+                of opening a throwaway connection.
+            timeout: Default timeout in seconds, or (connect, read) tuple,
+                used when a request does not set one.
+        """
+        self.timeout = timeout
+        self.pool_stats = PoolStats()
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+        attrs = {"pool_stats": self.pool_stats}
+        http_connection = type(
+            "TimedHTTPConnection", (_TimedConnectionMixin, HTTPConnection), attrs
+        )
+        https_connection = type(
+            "TimedHTTPSConnection", (_TimedConnectionMixin, HTTPSConnection), attrs
+        )
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "TimedHTTPConnectionPool",
+                (HTTPConnectionPool,),
+                {"ConnectionCls": http_connection},
+            ),
+            "https": type(
+                "TimedHTTPSConnectionPool",
+                (HTTPSConnectionPool,),
+                {"ConnectionCls": https_connection},
+            ),
+        }
+
+    def __setstate__(self, state):
+        # Statistics are not pickled, start with fresh counters
+        self.pool_stats = PoolStats()
+        super().__setstate__(state)
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+
+        start = time.perf_counter()
+        try:
+            return super().send(request, stream=stream, timeout=timeout, **kwargs)
+        finally:
+            self.pool_stats.record_request(time.perf_counter() - start)
+
+    def get_stats(self) -> dict:
+        """Return the statistics of the connection pools.
+
+        Returns:
+            dict: connections_opened and connect_time (total seconds spent
+            in TCP and TLS handshakes), requests and request_time (total
+            seconds spent sending requests, handshakes included), their
+            averages, and per host the num_connections, num_requests and
+            idle connections of its pool.
+        """
+        stats = self.pool_stats
+        pools = {}
+        for key in list(self.poolmanager.pools.keys()):
+            pool = self.poolmanager.pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "num_connections": pool.num_connections,
+                "num_requests": pool.num_requests,
+                "idle": sum(1 for conn in list(pool.pool.queue) if conn is not None),
+            }
+
+        return {
+            "connections_opened": stats.connections_opened,
+            "connect_time": stats.connect_time,
+            "avg_connect_time": stats.connect_time / (stats.connections_opened or 1),
+            "requests": stats.requests,
+            "request_time": stats.request_time,
+            "avg_request_time": stats.request_time / (stats.requests or 1),
+            "pools": pools,
+        }
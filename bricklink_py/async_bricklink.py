@@ -0,0 +1,469 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from urllib.parse import urlencode
+
+from oauthlib.oauth1 import Client
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import requote_uri
+
+from .bulk import BulkReport, async_run_per_lot
+from .cache import BaseCache
+from .catalog_item import CatalogItem, PriceGuideSpec
+from .category import Category
+from .codec import JSONCodec, get_codec
+from .color import Color
+from .concurrency import async_adaptive_map
+from .coupon import Coupon
+from .feedback import Feedback
+from .item_mapping import ItemMapping
+from .member import Member
+from .order import Order
+from .push_notification import PushNotification
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .setting import Setting
+from .store_inventory import StoreInventory
+from .utils import (
+    API_BASE_URL,
+    JSON_HEADERS,
+    BaseResource,
+    data_parser,
+    handle_response,
+)
+
+
+class AsyncOAuth1Session:
+    """OAuth1 signed HTTP session running on aiohttp.
+
+    The aiohttp ClientSession is created lazily on the first request so the
+    object can be built outside of a running event loop.
+    """
+
+    def __init__(
+        self,
+        client_key: str = None,
+        client_secret: str = None,
+        resource_owner_key: str = None,
+        resource_owner_secret: str = None,
+        max_connections: int = 100,
+    ):
+        self._client = Client(
+            client_key,
+            client_secret=client_secret,
+            resource_owner_key=resource_owner_key,
+            resource_owner_secret=resource_owner_secret,
+        )
+        self._max_connections = max_connections
+        self._session = None
+
+    def sign(self, method: str, url: str, params: dict = None):
+        """Sign a request and return the final URL and OAuth headers.
+
+        Arguments:
+            method -- The HTTP method of the request.
+            url -- The URL of the request, without query string.
+
+        Keyword Arguments:
+            params -- The query parameters. None values are dropped, like
+            requests does. (default: {None})
+
+        Returns:
+            tuple: The signed URL and the headers to send.
+        """
+        query = urlencode(
+            [(k, v) for k, v in (params or {}).items() if v is not None], doseq=True
+        )
+        if query:
+            url = f"{url}?{query}"
+        # Quote the URL the way requests does before it is signed
+        signed_url, headers, _ = self._client.sign(
+            requote_uri(url), http_method=method.upper()
+        )
+        return signed_url, headers
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: dict = None,
+        json: Any = None,
+        data: bytes = None,
+    ) -> Response:
+        """Send a signed request and return a requests.Response with the
+        downloaded body, so the synchronous response handling can be reused.
+
+        data is a JSON body already encoded, sent instead of json.
+        """
+        signed_url, headers = self.sign(method, url, params)
+        if data is not None:
+            headers = {**headers, **JSON_HEADERS}
+            return await self._send(method, signed_url, headers, None, data)
+        return await self._send(method, signed_url, headers, json)
+
+    async def _send(
+        self, method: str, url: str, headers: dict, json: Any, data: bytes = None
+    ) -> Response:
+        from yarl import URL
+
+        # The URL is already encoded and signed, it must be sent untouched
+        async with self._client_session().request(
+            method.upper(),
+            URL(url, encoded=True),
+            headers=headers,
+            json=json,
+            data=data,
+        ) as raw:
+            response = Response()
+            response.status_code = raw.status
+            response.reason = raw.reason
+            response.url = url
+            response.headers = CaseInsensitiveDict(raw.headers)
+            response.encoding = raw.charset
+            response._content = await raw.read()
+            return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, params: dict = None):
+        """Send a signed request and return the aiohttp response, whose body
+        is read while it is downloaded."""
+        from yarl import URL
+
+        signed_url, headers = self.sign(method, url, params)
+        async with self._client_session().request(
+            method.upper(), URL(signed_url, encoded=True), headers=headers
+        ) as raw:
+            yield raw
+
+    def _client_session(self):
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._max_connections)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncBaseResource(BaseResource):
+    """Base class for the asyncio flavour of the API resources.
+
+    Resource methods only build the URI and parameters and return
+    self._request(...), so mixing this class into a resource turns every
+    method into a coroutine function.
+    """
+
+    async def _request(
+        self,
+        method: str,
+        uri: str,
+        params: dict = None,
+        body: dict = None,
+        record: type = None,
+    ) -> Any:
+        """Wrapper for the async_request function with error handling"""
+        if self._cache is not None and method.lower() == "get":
+            hit, result = self._cache.lookup(method, uri, params)
+            if hit:
+                return self._as_records(result, record)
+
+        if self._retry_policy is not None:
+            result = await self._retry_policy.call_async(
+                self._send, method, uri, params, body
+            )
+        else:
+            result = await self._send(method, uri, params, body)
+
+        if self._cache is not None:
+            self._update_cache(method, uri, params, result)
+        return self._as_records(result, record)
+
+    async def _then(self, result: Any, callback) -> Any:
+        """Await the coroutine returned by _request and return
+        callback(result)."""
+        return callback(await result)
+
+    async def _stream(
+        self, method: str, uri: str, params: dict = None, record: type = None
+    ) -> AsyncIterator[Any]:
+        """Wrapper for the async_stream_request function, iterated with
+        async for. The rate limiter applies, the cache and retry policy do not.
+        """
+        if self._rate_limiter is not None:
+            delay = self._rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        stream = async_stream_request(
+            method,
+            self._oauth_session,
+            uri,
+            params,
+            base_url=self._request_options.get("base_url"),
+        )
+        convert = record if record is not None and self._records else None
+        async for data in stream:
+            yield data if convert is None else convert(data)
+
+    async def _send(
+        self, method: str, uri: str, params: dict = None, body: dict = None
+    ) -> Any:
+        """Send a single request, once the rate limiter allows it"""
+        if self._rate_limiter is not None:
+            delay = self._rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        return await async_request(
+            method,
+            self._oauth_session,
+            uri,
+            params,
+            body,
+            **self._request_options,
+        )
+
+
+async def async_stream_request(
+    method: str,
+    oauth_session: AsyncOAuth1Session,
+    uri: str,
+    params: dict = None,
+    base_url: str = None,
+    chunk_size: int = 65536,
+) -> AsyncIterator[Any]:
+    """Send a GET request and yield the records of the "data" list of the
+    response while it is downloaded, like stream_request."""
+    if method.lower() != "get":
+        raise ValueError(f"Unsupported HTTP method for streaming: {method}")
+
+    url = f"{base_url or API_BASE_URL}{uri}"
+    async with oauth_session.stream(method, url, params) as raw:
+        if raw.status == 204:
+            return
+        parser = data_parser(raw.headers)
+        try:
+            async for chunk in raw.content.iter_chunked(chunk_size):
+                for record in parser.feed(chunk):
+                    yield record
+            for record in parser.close():
+                yield record
+        except ValueError:
+            raw.raise_for_status()
+            raise
+
+
+async def async_request(
+    method: str,
+    oauth_session: AsyncOAuth1Session,
+    uri: str,
+    params: dict = None,
+    body: dict = None,
+    base_url: str = None,
+    codec=None,
+) -> Any:
+    """Send a request to the specified URI using the provided
+    method and async OAuth session.
+
+    Arguments:
+        method -- The HTTP method to use for the request.
+        oauth_session -- The AsyncOAuth1Session used for authentication.
+        uri -- The URI to send the request to.
+
+    Keyword Arguments:
+        params -- The parameters to include in the request. (default: {{}})
+        body -- The body to include in the request data. (default: {{}})
+        base_url -- Base URL of the API. (default: {API_BASE_URL})
+        codec -- JSONCodec decoding the response and encoding the body.
+        (default: {None})
+
+    Raises:
+        BricklinkError: For API-specific errors.
+        requests.RequestException: For non JSON error responses.
+
+    Returns:
+        The "data" of the response, as returned by handle_response.
+    """
+    if method.lower() not in ("get", "post", "put", "delete"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    url = f"{base_url or API_BASE_URL}{uri}"
+    json = body if method.lower() in ("post", "put") else None
+    if codec is not None and json is not None:
+        response = await oauth_session.request(
+            method, url, params=params, data=codec.dumps(json)
+        )
+    else:
+        response = await oauth_session.request(method, url, params=params, json=json)
+    return handle_response(response, codec)
+
+
+class AsyncOrder(Order, AsyncBaseResource):
+    pass
+
+
+class AsyncStoreInventory(StoreInventory, AsyncBaseResource):
+    def attach_write_behind(self, buffer):
+        """Not supported: the buffer flushes from a thread of its own"""
+        raise TypeError("Write-behind buffers require the synchronous client")
+
+    async def update_store_inventories(
+        self, changes, max_workers: int = 16, retry_policy=None
+    ) -> BulkReport:
+        """Coroutine version of StoreInventory.update_store_inventories"""
+        return await async_run_per_lot(
+            self._update_calls(changes), max_workers, retry_policy
+        )
+
+    async def delete_store_inventories(
+        self, inventory_ids, max_workers: int = 16, retry_policy=None
+    ) -> BulkReport:
+        """Coroutine version of StoreInventory.delete_store_inventories"""
+        return await async_run_per_lot(
+            self._delete_calls(inventory_ids), max_workers, retry_policy
+        )
+
+
+class AsyncCatalogItem(CatalogItem, AsyncBaseResource):
+    def attach_price_guide_cache(self, cache):
+        """Not supported: the cache refreshes from threads of its own"""
+        raise TypeError("Price guide caches require the synchronous client")
+
+    async def get_price_guides(
+        self, specs, max_workers: int = 16, return_exceptions: bool = False
+    ) -> dict:
+        """Coroutine version of CatalogItem.get_price_guides"""
+        unique = list(dict.fromkeys(PriceGuideSpec.of(spec) for spec in specs))
+        results = await async_adaptive_map(
+            self._get_price_guide_of, unique, max_workers, return_exceptions
+        )
+        return dict(zip(unique, results))
+
+
+class AsyncFeedback(Feedback, AsyncBaseResource):
+    pass
+
+
+class AsyncColor(Color, AsyncBaseResource):
+    pass
+
+
+class AsyncCategory(Category, AsyncBaseResource):
+    pass
+
+
+class AsyncPushNotification(PushNotification, AsyncBaseResource):
+    pass
+
+
+class AsyncCoupon(Coupon, AsyncBaseResource):
+    pass
+
+
+class AsyncSetting(Setting, AsyncBaseResource):
+    pass
+
+
+class AsyncMember(Member, AsyncBaseResource):
+    pass
+
+
+class AsyncItemMapping(ItemMapping, AsyncBaseResource):
+    pass
+
+
+class AsyncBricklink:
+    """asyncio client for the Bricklink API.
+
+    Exposes the same resources as Bricklink, but every method is a coroutine
+    function. Requires the optional aiohttp dependency.
+
+    Usage:
+        async with AsyncBricklink(ck, cs, tk, tks) as client:
+            orders = await client.order.get_orders()
+    """
+
+    def __init__(
+        self,
+        consumer_key: str = None,
+        consumer_secret: str = None,
+        token: str = None,
+        token_secret: str = None,
+        max_connections: int = 100,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        cache: BaseCache = None,
+        base_url: str = None,
+        json_codec: JSONCodec = None,
+        records: bool = False,
+    ):
+        """
+        Initialize the asyncio Bricklink API client
+
+        Arguments:
+            consumer_key: OAuth consumer key
+            consumer_secret: OAuth consumer secret
+            token: OAuth token
+            token_secret: OAuth token secret
+            max_connections: Maximum number of simultaneous connections
+            rate_limiter: Limiter consulted before every request, see
+                RateLimiter
+            retry_policy: Policy used to retry failed requests, see
+                RetryPolicy
+            cache: Cache of the GET responses, see ResponseCache
+            base_url: Base URL of the API, e.g. the one of a StubServer
+            json_codec: JSONCodec, or name given to get_codec, e.g. "auto",
+                decoding the responses and encoding the request bodies
+            records: Return InventoryLot, OrderSummary, OrderItem and Item
+                records instead of dicts, see bricklink_py.records
+        """
+        self.oauth_session = AsyncOAuth1Session(
+            client_key=consumer_key,
+            client_secret=consumer_secret,
+            resource_owner_key=token,
+            resource_owner_secret=token_secret,
+            max_connections=max_connections,
+        )
+
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        if isinstance(json_codec, str):
+            json_codec = get_codec(json_codec)
+        self.json_codec = json_codec
+        options = {
+            "rate_limiter": rate_limiter,
+            "retry_policy": retry_policy,
+            "cache": cache,
+            "base_url": base_url,
+            "codec": json_codec,
+            "records": records,
+        }
+
+        self.order = AsyncOrder(self.oauth_session, **options)
+        self.store_inventory = AsyncStoreInventory(self.oauth_session, **options)
+        self.catalog_item = AsyncCatalogItem(self.oauth_session, **options)
+        self.feedback = AsyncFeedback(self.oauth_session, **options)
+        self.color = AsyncColor(self.oauth_session, **options)
+        self.category = AsyncCategory(self.oauth_session, **options)
+        self.push_notification = AsyncPushNotification(self.oauth_session, **options)
+        self.coupon = AsyncCoupon(self.oauth_session, **options)
+        self.setting = AsyncSetting(self.oauth_session, **options)
+        self.member = AsyncMember(self.oauth_session, **options)
+        self.item_mapping = AsyncItemMapping(self.oauth_session, **options)
+
+    async def close(self):
+        """Close the HTTP connections of the client."""
+        await self.oauth_session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
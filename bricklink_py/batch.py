@@ -0,0 +1,77 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List
+
+
+class Batch:
+    """Run API calls concurrently on a thread pool.
+
+    Any resource method can be submitted, they all share the session of the
+    client: sending requests from several threads through one OAuth1Session
+    is safe as long as the session itself (headers, adapters, auth) is not
+    modified meanwhile. The rate limiter and retry policy of the client are
+    thread safe and keep applying to every call.
+
+    Usage:
+        with client.batch(max_workers=8) as batch:
+            for no in part_numbers:
+                batch.submit(client.catalog_item.get_price_guide, "PART", no)
+        price_guides = batch.results()
+    """
+
+    def __init__(self, max_workers: int = 10):
+        """
+        Arguments:
+            max_workers: Number of threads sending requests. It should not
+                exceed the pool_maxsize of the client, or connections will be
+                opened and discarded instead of being reused.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bricklink"
+        )
+        self._futures = []
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Schedule func(*args, **kwargs) and return its Future."""
+        future = self._executor.submit(func, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def map(self, func: Callable, *iterables, return_exceptions: bool = False):
+        """Call func with the arguments taken from the iterables, like the
+        built-in map, and return the results in input order.
+
+        Keyword Arguments:
+            return_exceptions -- Return the exceptions raised by the calls in
+            place of their results instead of raising the first one.
+            (default: {False})
+        """
+        futures = [self._executor.submit(func, *args) for args in zip(*iterables)]
+        return self._gather(futures, return_exceptions)
+
+    def results(self, return_exceptions: bool = False) -> List[Any]:
+        """Wait for the submitted calls and return their results in submission
+        order.
+
+        Keyword Arguments:
+            return_exceptions -- Return the exceptions raised by the calls in
+            place of their results instead of raising the first one.
+            (default: {False})
+        """
+        return self._gather(self._futures, return_exceptions)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the thread pool, waiting for pending calls by default."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=True)
+
+    @staticmethod
+    def _gather(futures: List[Future], return_exceptions: bool) -> List[Any]:
+        if not return_exceptions:
+            return [future.result() for future in futures]
+        return [future.exception() or future.result() for future in futures]
@@ -1,15 +1,23 @@
 from requests_oauthlib import OAuth1Session
 
+from .adapter import PoolingHTTPAdapter
+from .batch import Batch
+from .cache import BaseCache
 from .catalog_item import CatalogItem
 from .category import Category
+from .codec import JSONCodec, get_codec
 from .color import Color
 from .coupon import Coupon
 from .feedback import Feedback
+from .hooks import Hooks
 from .item_mapping import ItemMapping
 from .member import Member
 from .order import Order
 from .push_notification import PushNotification
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
 from .setting import Setting
+from .single_flight import SingleFlight
 from .store_inventory import StoreInventory
 
 
@@ -22,6 +30,18 @@ class Bricklink:
         consumer_secret: str = None,
         token: str = None,
         token_secret: str = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        cache: BaseCache = None,
+        single_flight: SingleFlight = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout=None,
+        base_url: str = None,
+        json_codec: JSONCodec = None,
+        records: bool = False,
     ):
         """
         Initialize the Bricklink API client
@@ -31,22 +51,72 @@ class Bricklink:
             consumer_secret: OAuth consumer secret
             token: OAuth token
             token_secret: OAuth token secret
+            rate_limiter: Limiter consulted before every request, see
+                RateLimiter
+            retry_policy: Policy used to retry failed requests, see
+                RetryPolicy
+            cache: Cache of the GET responses, see ResponseCache
+            single_flight: Group coalescing identical GET requests sent at
+                the same time by several threads, see SingleFlight
+            pool_connections: Number of host connection pools to cache
+            pool_maxsize: Maximum number of connections kept alive per host,
+                should be at least the number of threads using the client
+            pool_block: Wait for a free connection instead of opening a
+                throwaway one when the pool is full
+            keep_alive: Reuse connections between requests
+            timeout: Default timeout in seconds, or (connect, read) tuple
+            base_url: Base URL of the API, e.g. the one of a StubServer
+            json_codec: JSONCodec, or name given to get_codec, e.g. "auto",
+                decoding the responses and encoding the request bodies instead
+                of requests
+            records: Return InventoryLot, OrderSummary, OrderItem and Item
+                records instead of dicts, see bricklink_py.records
         """
         self.oauth_session = self._authenticate(
             consumer_key, consumer_secret, token, token_secret
         )
+        self.pool_maxsize = pool_maxsize
+        self.http_adapter = PoolingHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            timeout=timeout,
+        )
+        self.oauth_session.mount("https://", self.http_adapter)
+        self.oauth_session.mount("http://", self.http_adapter)
+        if not keep_alive:
+            self.oauth_session.headers["Connection"] = "close"
+
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.single_flight = single_flight
+        self.hooks = Hooks()
+        if isinstance(json_codec, str):
+            json_codec = get_codec(json_codec)
+        self.json_codec = json_codec
+        options = {
+            "rate_limiter": rate_limiter,
+            "retry_policy": retry_policy,
+            "cache": cache,
+            "single_flight": single_flight,
+            "hooks": self.hooks,
+            "base_url": base_url,
+            "codec": json_codec,
+            "records": records,
+        }
 
-        self.order = Order(self.oauth_session)
-        self.store_inventory = StoreInventory(self.oauth_session)
-        self.catalog_item = CatalogItem(self.oauth_session)
-        self.feedback = Feedback(self.oauth_session)
-        self.color = Color(self.oauth_session)
-        self.category = Category(self.oauth_session)
-        self.push_notification = PushNotification(self.oauth_session)
-        self.coupon = Coupon(self.oauth_session)
-        self.setting = Setting(self.oauth_session)
-        self.member = Member(self.oauth_session)
-        self.item_mapping = ItemMapping(self.oauth_session)
+        self.order = Order(self.oauth_session, **options)
+        self.store_inventory = StoreInventory(self.oauth_session, **options)
+        self.catalog_item = CatalogItem(self.oauth_session, **options)
+        self.feedback = Feedback(self.oauth_session, **options)
+        self.color = Color(self.oauth_session, **options)
+        self.category = Category(self.oauth_session, **options)
+        self.push_notification = PushNotification(self.oauth_session, **options)
+        self.coupon = Coupon(self.oauth_session, **options)
+        self.setting = Setting(self.oauth_session, **options)
+        self.member = Member(self.oauth_session, **options)
+        self.item_mapping = ItemMapping(self.oauth_session, **options)
 
     def _authenticate(self, ck: str, cs: str, tk: str, tks: str) -> OAuth1Session:
         """
@@ -67,3 +137,27 @@ class Bricklink:
             resource_owner_key=tk,
             resource_owner_secret=tks,
         )
+
+    def batch(self, max_workers: int = None) -> Batch:
+        """
+        Create a Batch to send requests concurrently over the session
+
+        Arguments:
+            max_workers: Number of threads, defaults to the pool_maxsize of
+                the client so every thread keeps its connection alive
+
+        Returns:
+            Batch to be used as a context manager
+        """
+        return Batch(max_workers or self.pool_maxsize)
+
+    def pool_stats(self) -> dict:
+        """
+        Statistics of the HTTP connection pools, see
+        PoolingHTTPAdapter.get_stats
+
+        Returns:
+            Connections opened and time spent opening them, requests sent and
+            time spent sending them, and the state of each host pool
+        """
+        return self.http_adapter.get_stats()
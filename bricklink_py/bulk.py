@@ -0,0 +1,350 @@
+"""Bulk writes of store inventory lots.
+
+BulkUploader creates large numbers of lots with create_store_inventories, in
+chunks sent concurrently. run_per_lot backs the update_store_inventories and
+delete_store_inventories methods of StoreInventory.
+
+Usage:
+    report = BulkUploader(client, chunk_size=200).create(lots)
+    for result in report.failed:
+        print(result.index, result.body["item"]["no"], result.error)
+
+A chunk rejected as a whole because of one bad lot (400) or because it is too
+large for the server (413) is split in two halves, sent again, and so on
+until the bad lots are isolated: a 20,000 lot upload with a few invalid lots
+costs a few more calls instead of failing entirely.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterable, List, Mapping
+
+import requests
+
+from .concurrency import AdaptiveLimit, AsyncAdaptiveLimit, is_congestion
+from .retry import RetryPolicy
+from .utils import BricklinkError, QuotaExceededError
+
+# Statuses of a rejected chunk worth splitting: a bad lot, or too many lots
+BISECT_STATUSES = (400, 413)
+
+
+def default_retry_policy(methods: tuple = ("post",)) -> RetryPolicy:
+    """Retry policy of the bulk writes: only the failures where the server
+    surely wrote nothing (rate limited, unavailable, connection refused) are
+    retried, since replaying a chunk that was created would duplicate its
+    lots, and replaying a "+quantity" update would apply it twice."""
+    return RetryPolicy(
+        max_attempts=4,
+        retry_on=(requests.ConnectTimeout,),
+        retry_statuses=(429, 503),
+        retry_methods=methods,
+    )
+
+
+class LotResult:
+    """Outcome of the write of one lot.
+
+    Attributes:
+        index: Position of the write in the bulk call.
+        body: The lot created, or the changes sent to update it.
+        lot: The lot returned by the API, when it returned one.
+        error: The exception of the failed write, None on success.
+        inventory_id: The lot updated or deleted.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        body: Mapping = None,
+        lot: Any = None,
+        error=None,
+        inventory_id: int = None,
+    ):
+        self.index = index
+        self.body = body
+        self.lot = lot
+        self.error = error
+        self.inventory_id = inventory_id
+
+    @property
+    def ok(self) -> bool:
+        """Whether the write succeeded."""
+        return self.error is None
+
+    def __repr__(self):
+        state = "ok" if self.ok else f"error={self.error!r}"
+        return f"<LotResult {self.index} {state}>"
+
+
+class BulkReport:
+    """Per lot report of a bulk write.
+
+    Attributes:
+        results: One LotResult per write, in input order.
+        requests: Number of requests sent, bisected chunks and retries
+            included.
+    """
+
+    def __init__(self, results: List[LotResult]):
+        self.results = results
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def succeeded(self) -> List[LotResult]:
+        """Results of the successful writes."""
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[LotResult]:
+        """Results of the failed writes."""
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every write succeeded."""
+        return all(result.ok for result in self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __repr__(self):
+        failed = len(self.failed)
+        return (
+            f"<BulkReport succeeded={len(self) - failed} failed={failed} "
+            f"requests={self.requests}>"
+        )
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _succeeded(self, start: int, stop: int, data: Any):
+        # The created lots are only paired with the bodies when the API
+        # returned one per body
+        lots = data if isinstance(data, list) and len(data) == stop - start else None
+        for offset, result in enumerate(self.results[start:stop]):
+            result.lot = lots[offset] if lots is not None else None
+            result.error = None
+
+    def _failed(self, start: int, stop: int, error: Exception):
+        for result in self.results[start:stop]:
+            result.error = error
+
+
+class BulkUploader:
+    """Create lots by chunks of create_store_inventories calls, sent
+    concurrently through a Batch of the client.
+
+    The rate limiter and hooks of the client apply to every chunk, and an
+    index attached to the store_inventory resource gets the created lots.
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size: int = 500,
+        max_workers: int = None,
+        retry_policy: RetryPolicy = None,
+        bisect: bool = True,
+    ):
+        """
+        Arguments:
+            client: Bricklink client.
+            chunk_size: Number of lots per request.
+            max_workers: Number of concurrent requests, defaults to the
+                pool_maxsize of the client.
+            retry_policy: Policy retrying the failed chunks, see
+                default_retry_policy.
+            bisect: Split the rejected chunks to isolate the bad lots. When
+                False, every lot of a rejected chunk is reported as failed.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.retry_policy = retry_policy or default_retry_policy()
+        self.bisect = bisect
+
+    def create(self, lots: Iterable[Mapping]) -> BulkReport:
+        """Create the lots, and report the outcome of each one. Failed chunks
+        do not stop the others.
+
+        Raises:
+            QuotaExceededError: When the rate limiter of the client has less
+            quota left than the chunks need. Nothing is sent then.
+        """
+        bodies = list(lots)
+        report = BulkReport([LotResult(i, body) for i, body in enumerate(bodies)])
+        chunks = [
+            (start, min(start + self.chunk_size, len(bodies)))
+            for start in range(0, len(bodies), self.chunk_size)
+        ]
+
+        remaining = getattr(self.client.rate_limiter, "remaining", None)
+        if remaining is not None and len(chunks) > remaining:
+            raise QuotaExceededError(
+                429, f"The upload needs {len(chunks)} calls, {remaining} are left"
+            )
+
+        with self.client.batch(self.max_workers) as batch:
+            pending = {}
+
+            def submit(start, stop):
+                future = batch.submit(self._send, report, bodies[start:stop])
+                pending[future] = (start, stop)
+
+            for start, stop in chunks:
+                submit(start, stop)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, stop = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        report._succeeded(start, stop, future.result())
+                    elif stop - start > 1 and self._should_bisect(error):
+                        middle = (start + stop) // 2
+                        submit(start, middle)
+                        submit(middle, stop)
+                    else:
+                        report._failed(start, stop, error)
+        return report
+
+    def _send(self, report: BulkReport, chunk: List[Mapping]) -> Any:
+        """Send one chunk, retried according to the retry policy"""
+        return self.retry_policy.call(self._post, "post", report, chunk)
+
+    def _post(self, method: str, report: BulkReport, chunk: List[Mapping]) -> Any:
+        report._count_request()
+        return self.client.store_inventory.create_store_inventories(chunk)
+
+    def _should_bisect(self, error: Exception) -> bool:
+        """Tell whether a chunk may have failed because of some of its lots"""
+        if not self.bisect:
+            return False
+        if isinstance(error, BricklinkError):
+            return error.status_code in BISECT_STATUSES
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in BISECT_STATUSES
+        return False
+
+
+def _group_by_lot(calls: list) -> List[List[int]]:
+    """Return the positions of the calls grouped by lot, in call order."""
+    groups = {}
+    for index, call in enumerate(calls):
+        groups.setdefault(call[0], []).append(index)
+    return list(groups.values())
+
+
+def run_per_lot(
+    calls: list,
+    max_workers: int = 16,
+    retry_policy: RetryPolicy = None,
+    limit: AdaptiveLimit = None,
+) -> BulkReport:
+    """Run resource calls concurrently, the calls of a lot one after the
+    other in the given order. Once a call of a lot fails, the next calls of
+    that lot are not sent and report the same error.
+
+    Arguments:
+        calls -- (inventory_id, method, func, args, body) of each call.
+
+    Keyword Arguments:
+        max_workers -- Number of threads, the highest concurrency.
+        (default: {16})
+        retry_policy -- Policy retrying the failed calls.
+        (default: {default_retry_policy for the methods of the calls})
+        limit -- Adaptive concurrency limit. (default: {AdaptiveLimit up to
+        max_workers})
+
+    Returns:
+        BulkReport: One result per call, in call order.
+    """
+    policy = retry_policy or default_retry_policy(tuple({c[1] for c in calls}))
+    limit = limit or AdaptiveLimit(maximum=max_workers)
+    report = BulkReport(
+        [
+            LotResult(index, body, inventory_id=inventory_id)
+            for index, (inventory_id, _, _, _, body) in enumerate(calls)
+        ]
+    )
+
+    def attempt(method, func, *args):
+        limit.acquire()
+        congested = False
+        try:
+            report._count_request()
+            return func(*args)
+        except Exception as exc:
+            congested = is_congestion(exc)
+            raise
+        finally:
+            limit.release(congested)
+
+    def run_lot(indexes):
+        error = None
+        for index in indexes:
+            result = report.results[index]
+            if error is None:
+                _, method, func, args, _ = calls[index]
+                try:
+                    result.lot = policy.call(attempt, method, func, *args)
+                except Exception as exc:
+                    error = exc
+            result.error = error
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="bricklink") as executor:
+        list(executor.map(run_lot, _group_by_lot(calls)))
+    return report
+
+
+async def async_run_per_lot(
+    calls: list,
+    max_workers: int = 16,
+    retry_policy: RetryPolicy = None,
+    limit: AsyncAdaptiveLimit = None,
+) -> BulkReport:
+    """Coroutine version of run_per_lot, the funcs of the calls being
+    coroutine functions and max_workers the highest number of calls in
+    flight."""
+    policy = retry_policy or default_retry_policy(tuple({c[1] for c in calls}))
+    limit = limit or AsyncAdaptiveLimit(maximum=max_workers)
+    report = BulkReport(
+        [
+            LotResult(index, body, inventory_id=inventory_id)
+            for index, (inventory_id, _, _, _, body) in enumerate(calls)
+        ]
+    )
+
+    async def attempt(method, func, *args):
+        await limit.acquire()
+        congested = False
+        try:
+            report._count_request()
+            return await func(*args)
+        except Exception as exc:
+            congested = is_congestion(exc)
+            raise
+        finally:
+            limit.release(congested)
+
+    async def run_lot(indexes):
+        error = None
+        for index in indexes:
+            result = report.results[index]
+            if error is None:
+                _, method, func, args, _ = calls[index]
+                try:
+                    result.lot = await policy.call_async(attempt, method, func, *args)
+                except Exception as exc:
+                    error = exc
+            result.error = error
+
+    await asyncio.gather(*(run_lot(group) for group in _group_by_lot(calls)))
+    return report
@@ -0,0 +1,363 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Tuple
+
+from .utils import endpoint_template, request_key
+
+DAY = 86400
+
+# Time to live in seconds of the cached responses, by endpoint template.
+# Endpoints not listed use the default ttl of the cache.
+DEFAULT_TTLS = {
+    "colors": DAY,
+    "colors/{color_id}": DAY,
+    "categories": DAY,
+    "categories/{category_id}": DAY,
+    "items/{type}/{no}": DAY,
+    "items/{type}/{no}/images/{color_id}": DAY,
+    "items/{type}/{no}/supersets": DAY,
+    "items/{type}/{no}/subsets": DAY,
+    "items/{type}/{no}/colors": DAY,
+    "items/{type}/{no}/price": 3600,
+    "item_mapping/{type}/{no}": DAY,
+    "item_mapping/{element_id}": DAY,
+    "settings/shipping_methods": 3600,
+    "settings/shipping_methods/{method_id}": 3600,
+}
+
+
+class BaseCache:
+    """Interface of the response caches consulted by BaseResource._request.
+
+    Only GET responses are cached, keyed on method, URI and the parameters
+    that are not None. Successful writes (POST, PUT, DELETE) invalidate the
+    cached responses of the same top level resource, e.g. updating
+    "inventories/1" drops every cached "inventories" response.
+
+    Backends implement _get, _set, _delete and clear.
+    """
+
+    def __init__(self, ttl: float = 0, ttls: dict = None):
+        """
+        Arguments:
+            ttl: Time to live in seconds of the responses of the endpoints
+                missing from ttls. 0 disables caching, None never expires.
+            ttls: Time to live by endpoint template, merged over DEFAULT_TTLS.
+        """
+        self.ttl = ttl
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    make_key = staticmethod(request_key)
+
+    def get_ttl(self, uri: str) -> float:
+        """Return the time to live of the responses of a URI."""
+        return self.ttls.get(endpoint_template(uri), self.ttl)
+
+    def lookup(self, method: str, uri: str, params: dict = None) -> Tuple[bool, Any]:
+        """Look up a cached response.
+
+        Returns:
+            tuple: (True, a copy of the response) on a hit, (False, None) on
+            a miss.
+        """
+        found, value = self._get(self.make_key(method, uri, params), time.time())
+        with self._stats_lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found, value
+
+    def store(self, method: str, uri: str, params: dict, value: Any):
+        """Cache a response, unless its endpoint is not cached."""
+        ttl = self.get_ttl(uri)
+        if ttl == 0:
+            return
+        expires = None if ttl is None else time.time() + ttl
+        self._set(self.make_key(method, uri, params), uri, value, expires)
+
+    def invalidate(self, uri: str = None):
+        """Drop the cached responses of a URI and of the URIs below it, or
+        every response when no URI is given."""
+        if uri is None:
+            self.clear()
+        else:
+            self._delete(uri.strip("/"))
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _get(self, key: str, now: float) -> Tuple[bool, Any]:
+        raise NotImplementedError
+
+    def _set(self, key: str, uri: str, value: Any, expires: float):
+        raise NotImplementedError
+
+    def _delete(self, uri: str):
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every cached response."""
+        raise NotImplementedError
+
+
+class ResponseCache(BaseCache):
+    """In memory TTL cache with least recently used eviction.
+
+    Cached values are deep copied in and out, so callers can modify the
+    responses they get without corrupting the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 0, ttls: dict = None):
+        """
+        Arguments:
+            maxsize: Maximum number of cached responses.
+            ttl: Time to live in seconds of the responses of the endpoints
+                missing from ttls. 0 disables caching, None never expires.
+            ttls: Time to live by endpoint template, merged over DEFAULT_TTLS.
+        """
+        super().__init__(ttl, ttls)
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self), "evictions": self.evictions}
+
+    def _get(self, key: str, now: float) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            _, value, expires = entry
+            if expires is not None and expires <= now:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def _set(self, key: str, uri: str, value: Any, expires: float):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (uri, value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _delete(self, uri: str):
+        prefix = f"{uri}/"
+        with self._lock:
+            for key, (entry_uri, _, _) in list(self._entries.items()):
+                if entry_uri == uri or entry_uri.startswith(prefix):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(BaseCache):
+    """Persistent cache stored in a SQLite database.
+
+    The database runs in WAL mode so it can be shared by several processes
+    (web workers, cron jobs) and threads: readers never block, and writers
+    wait up to timeout seconds for each other. Every thread and process
+    opens its own connection.
+
+    Responses are stored as JSON text, so only JSON serializable values can
+    be cached.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 0,
+        ttls: dict = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        timeout: float = 30.0,
+        prune_every: int = 100,
+    ):
+        """
+        Arguments:
+            path: Path of the database file, created if missing.
+            ttl: Time to live in seconds of the responses of the endpoints
+                missing from ttls. 0 disables caching, None never expires.
+            ttls: Time to live by endpoint template, merged over DEFAULT_TTLS.
+            max_entries: Maximum number of cached responses.
+            max_bytes: Maximum total size of the cached responses.
+            timeout: Seconds to wait for the database lock.
+            prune_every: Enforce the size caps every this many writes.
+        """
+        super().__init__(ttl, ttls)
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._writes = 0
+
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                uri TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires REAL,
+                created REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_uri ON responses (uri);
+            CREATE INDEX IF NOT EXISTS responses_created ON responses (created);
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection of the current thread and process."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def __len__(self):
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        )
+
+    def stats(self) -> dict:
+        size = (
+            self._connection()
+            .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")
+            .fetchone()
+        )
+        return {**super().stats(), "size": size[0], "bytes": size[1]}
+
+    def _get(self, key: str, now: float) -> Tuple[bool, Any]:
+        row = (
+            self._connection()
+            .execute("SELECT value, expires FROM responses WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return False, None
+        if row[1] is not None and row[1] <= now:
+            self._connection().execute(
+                "DELETE FROM responses WHERE key = ? AND expires <= ?", (key, now)
+            )
+            return False, None
+        return True, json.loads(row[0])
+
+    def _set(self, key: str, uri: str, value: Any, expires: float):
+        text = json.dumps(value, separators=(",", ":"))
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, uri, text, expires, time.time(), len(text)),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def _delete(self, uri: str):
+        escaped = uri.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        self._connection().execute(
+            "DELETE FROM responses WHERE uri = ? OR uri LIKE ? ESCAPE '\\'",
+            (uri, f"{escaped}/%"),
+        )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM responses")
+
+    def prune(self):
+        """Drop the expired responses, then the oldest ones until the size
+        caps are met."""
+        conn = self._connection()
+        conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes is not None:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM (SELECT key, "
+                "SUM(size) OVER (ORDER BY created DESC) AS total FROM responses) "
+                "WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def vacuum(self):
+        """Prune the cache and give the freed space back to the system."""
+        self.prune()
+        self._connection().execute("VACUUM")
+
+    def export_snapshot(self, path: str):
+        """Write the responses that have not expired to a JSON file."""
+        rows = self._connection().execute(
+            "SELECT key, uri, value, expires FROM responses "
+            "WHERE expires IS NULL OR expires > ?",
+            (time.time(),),
+        )
+        entries = [
+            {"key": key, "uri": uri, "value": json.loads(value), "expires": expires}
+            for key, uri, value, expires in rows
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+
+    def load_snapshot(self, path: str) -> int:
+        """Pre-warm the cache with the responses of a snapshot written by
+        export_snapshot. Expired responses are skipped.
+
+        Returns:
+            The number of responses loaded.
+        """
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+
+        now = time.time()
+        rows = []
+        for entry in entries:
+            if entry["expires"] is not None and entry["expires"] <= now:
+                continue
+            text = json.dumps(entry["value"], separators=(",", ":"))
+            rows.append(
+                (entry["key"], entry["uri"], text, entry["expires"], now, len(text))
+            )
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self.prune()
+        return len(rows)
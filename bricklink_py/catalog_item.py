@@ -1,8 +1,65 @@
+from typing import NamedTuple
+
+from .concurrency import adaptive_map
+from .records import Item
 from .utils import BaseResource
 
 
+class PriceGuideSpec(NamedTuple):
+    """Parameters of a get_price_guide call, usable as a dict key.
+
+    Plain tuples of the same fields, in the same order, compare equal.
+    """
+
+    type: str
+    no: str
+    color_id: int = None
+    guide_type: str = "stock"
+    new_or_used: str = "N"
+    country_code: str = None
+    region: str = None
+    currency_code: str = None
+    vat: str = "N"
+
+    @classmethod
+    def of(cls, spec) -> "PriceGuideSpec":
+        """Build a normalized spec from a spec, a tuple of its fields or a
+        dict of get_price_guide arguments, so equivalent specs are equal.
+        None stands for the default of get_price_guide, like the API does."""
+        if isinstance(spec, dict):
+            spec = cls(**spec)
+        elif not isinstance(spec, cls):
+            spec = cls(*spec)
+        defaults = cls._field_defaults
+        return spec._replace(
+            type=spec.type.upper(),
+            no=str(spec.no),
+            guide_type=(spec.guide_type or defaults["guide_type"]).lower(),
+            new_or_used=(spec.new_or_used or defaults["new_or_used"]).upper(),
+            vat=(spec.vat or defaults["vat"]).upper(),
+        )
+
+
 class CatalogItem(BaseResource):
 
+    # Cache of the price guides, see attach_price_guide_cache
+    _price_guide_cache = None
+
+    def attach_price_guide_cache(self, cache):
+        """Serve get_price_guide and get_price_guides from a PriceGuideCache.
+
+        The cached calls bypass the response cache and single flight of the
+        client; its rate limiter, retry policy and hooks still apply.
+
+        Arguments:
+            cache -- The PriceGuideCache, or None to detach the current one.
+
+        Returns:
+            PriceGuideCache: The cache.
+        """
+        self._price_guide_cache = cache
+        return cache
+
     def get_item(self, type: str, no: str):
         """Returns information about the specified item in BrickLink catalog.
 
@@ -17,7 +74,7 @@ class CatalogItem(BaseResource):
             requests.Response: The response object returned from the request.
         """
         uri = f"items/{type}/{no}"
-        return self._request("get", uri)
+        return self._request("get", uri, record=Item)
 
     def get_item_image(self, type: str, no: str, color_id: int):
         """Returns image URL of the specified item by colors.
@@ -116,6 +173,7 @@ class CatalogItem(BaseResource):
         region: str = None,
         currency_code: str = None,
         vat: str = "N",
+        max_age: float = None,
     ):
         """Returns the price statistics of the specified item in
         BrickLink catalog.
@@ -177,9 +235,29 @@ class CatalogItem(BaseResource):
                 "Y": Include VAT
                 "O": Include VAT as Norway settings
 
+            max_age -- With a price guide cache attached, refuse cached price
+            guides older than this many seconds and fetch them again.
+            (default: {None})
+
         Returns:
             requests.Response: The response object returned from the request.
+            Price guides served by a price guide cache have an "age" key, the
+            seconds since they were fetched.
         """
+        cache = self._price_guide_cache
+        if cache is not None:
+            spec = PriceGuideSpec(
+                type,
+                no,
+                color_id,
+                guide_type,
+                new_or_used,
+                country_code,
+                region,
+                currency_code,
+                vat,
+            )
+            return cache.fetch(spec, self._fetch_price_guide, max_age)
         params = {
             "color_id": color_id,
             "guide_type": guide_type,
@@ -207,3 +285,42 @@ class CatalogItem(BaseResource):
         """
         uri = f"items/{type}/{no}/colors"
         return self._request("get", uri)
+
+    def get_price_guides(
+        self, specs, max_workers: int = 16, return_exceptions: bool = False
+    ) -> dict:
+        """Returns the price guides of many items, conditions, regions...
+        fetched concurrently.
+
+        Identical specs are fetched once. The number of calls in flight
+        adapts to the server, like update_store_inventories, and the rate
+        limiter, cache and retry policy of the client apply to every call,
+        and an attached price guide cache answers the specs it holds.
+
+        Arguments:
+            specs -- PriceGuideSpec, tuples of its fields or dicts of
+            get_price_guide arguments, e.g.
+            ("PART", "3001", 11, "sold", "U", None, "europe", "EUR").
+
+        Keyword Arguments:
+            max_workers -- Highest number of concurrent calls. (default: {16})
+            return_exceptions -- Return the exceptions raised by the calls in
+            place of their price guides instead of raising the first one.
+            (default: {False})
+
+        Returns:
+            dict: The price guides keyed by normalized PriceGuideSpec.
+        """
+        unique = list(dict.fromkeys(PriceGuideSpec.of(spec) for spec in specs))
+        results = adaptive_map(
+            self._get_price_guide_of, unique, max_workers, return_exceptions
+        )
+        return dict(zip(unique, results))
+
+    def _get_price_guide_of(self, spec: PriceGuideSpec):
+        return self.get_price_guide(*spec)
+
+    def _fetch_price_guide(self, spec: PriceGuideSpec):
+        """Fetch a price guide for the price guide cache"""
+        params = dict(zip(spec._fields[2:], spec[2:]))
+        return self._fetch("get", f"items/{spec.type}/{spec.no}/price", params)
@@ -0,0 +1,98 @@
+import json
+from decimal import Decimal
+from typing import Any
+
+
+def _default(obj):
+    """Encode the values json does not support natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """Decode the API responses and encode the request bodies.
+
+    loads raises ValueError on invalid JSON, whatever the library used.
+    Decimal values are encoded as strings, the way the API expects prices.
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=_default).encode()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec based on orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: bytes) -> Any:
+        # orjson.JSONDecodeError is a ValueError
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=_default)
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec based on msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: str = "auto") -> JSONCodec:
+    """Return a JSON codec by name.
+
+    Arguments:
+        name -- "orjson", "msgspec", "json" (the standard library) or "auto"
+        for the fastest one installed, in that order. (default: {auto})
+
+    Raises:
+        ImportError: When the library of the named codec is not installed.
+        ValueError: For an unknown codec name.
+    """
+    if name == "auto":
+        for codec in CODECS.values():
+            try:
+                return codec()
+            except ImportError:
+                continue
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    return CODECS[name]()
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .utils import BricklinkError, QuotaExceededError
+
+# Statuses telling the server is overloaded
+CONGESTION_STATUSES = (429, 503)
+
+
+def is_congestion(exc: Exception) -> bool:
+    """Tell whether a failed call signals that the server is overloaded: rate
+    limited, unavailable or timing out. The client side quota is not."""
+    if isinstance(exc, QuotaExceededError):
+        return False
+    if isinstance(exc, BricklinkError):
+        return exc.status_code in CONGESTION_STATUSES
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in CONGESTION_STATUSES
+    return isinstance(exc, (requests.Timeout, asyncio.TimeoutError))
+
+
+class AdaptiveLimit:
+    """Concurrency limit adjusted like TCP congestion control: additive
+    increase, multiplicative decrease (AIMD).
+
+    Until the first congestion, every successful call raises the limit by 1,
+    doubling it every round of calls (slow start). Then every successful call
+    raises it by 1 / limit, about one more concurrent call per round, and
+    every congested call (see is_congestion) multiplies it by backoff. The
+    number of calls in flight converges to what the server sustains without
+    rate limiting them.
+
+    Threads call acquire() before a call and release() after it.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        backoff: float = 0.5,
+    ):
+        """
+        Arguments:
+            initial: Concurrency limit to start with.
+            minimum: Lowest limit.
+            maximum: Highest limit.
+            backoff: Factor applied to the limit on congestion.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self.peak = 0
+        self.congestions = 0
+        self._cond = threading.Condition()
+
+    def __repr__(self):
+        return (
+            f"<{type(self).__name__} limit={self.limit:.2f} "
+            f"in_flight={self.in_flight} congestions={self.congestions}>"
+        )
+
+    def acquire(self):
+        """Block until a call can be made within the limit."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self._start()
+
+    def release(self, congested: bool = False):
+        """Report the end of a call, and whether it met congestion."""
+        with self._cond:
+            self._finish(congested)
+            self._cond.notify_all()
+
+    def _start(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def _finish(self, congested: bool):
+        self.in_flight -= 1
+        if congested:
+            self.congestions += 1
+            self.limit = max(self.minimum, self.limit * self.backoff)
+        elif self.congestions:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        else:
+            self.limit = min(self.maximum, self.limit + 1)
+
+
+class AsyncAdaptiveLimit(AdaptiveLimit):
+    """AdaptiveLimit for coroutines: await acquire() before a call and call
+    release() after it. Not thread safe, use it from one event loop."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._waiters = []
+
+    async def acquire(self):
+        """Wait until a call can be made within the limit."""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self._start()
+
+    def release(self, congested: bool = False):
+        """Report the end of a call, and whether it met congestion."""
+        self._finish(congested)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+def adaptive_map(
+    func, items: list, max_workers: int = 16, return_exceptions: bool = False
+) -> list:
+    """Call func on every item from a thread pool, the number of calls in
+    flight following an AdaptiveLimit, and return the results in item order.
+
+    Keyword Arguments:
+        max_workers -- Highest number of concurrent calls. (default: {16})
+        return_exceptions -- Return the exceptions raised by the calls in
+        place of their results instead of raising the first one.
+        (default: {False})
+    """
+    limit = AdaptiveLimit(maximum=max_workers)
+
+    def call(item):
+        limit.acquire()
+        congested = False
+        try:
+            return func(item)
+        except Exception as exc:
+            congested = is_congestion(exc)
+            if return_exceptions:
+                return exc
+            raise
+        finally:
+            limit.release(congested)
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(
+        min(max_workers, len(items)), thread_name_prefix="bricklink"
+    ) as executor:
+        return list(executor.map(call, items))
+
+
+async def async_adaptive_map(
+    func, items: list, max_workers: int = 16, return_exceptions: bool = False
+) -> list:
+    """Coroutine version of adaptive_map, func being a coroutine function."""
+    limit = AsyncAdaptiveLimit(maximum=max_workers)
+
+    async def call(item):
+        await limit.acquire()
+        congested = False
+        try:
+            return await func(item)
+        except Exception as exc:
+            congested = is_congestion(exc)
+            if return_exceptions:
+                return exc
+            raise
+        finally:
+            limit.release(congested)
+
+    return list(await asyncio.gather(*(call(item) for item in items)))
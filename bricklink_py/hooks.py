@@ -0,0 +1,161 @@
+import threading
+from collections import defaultdict, deque
+
+EVENTS = ("before_request", "after_response", "on_error")
+
+
+class RequestInfo:
+    """Details of an API call, passed to the hooks.
+
+    Timings are in seconds. sign_time covers building and OAuth signing the
+    request, network_time sending it and downloading the response, and
+    decode_time decoding the JSON and checking the meta of the response.
+    """
+
+    def __init__(self, method: str, uri: str, endpoint: str, params: dict = None):
+        self.method = method.lower()
+        self.uri = uri
+        self.endpoint = endpoint
+        self.params = params
+        self.attempt = 1
+        self.cache_hit = False
+        self.coalesced = False
+        self.status_code = None
+        self.rate_limit_wait = 0.0
+        self.sign_time = 0.0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.total_time = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.error = None
+
+    @property
+    def retried(self) -> bool:
+        """Whether the call is a retry of a failed attempt."""
+        return self.attempt > 1
+
+    def __repr__(self):
+        return (
+            f"<RequestInfo {self.method.upper()} {self.uri} attempt={self.attempt} "
+            f"status={self.status_code} total_time={self.total_time:.4f}>"
+        )
+
+
+class Hooks:
+    """Callbacks called around the API calls made by the resources.
+
+    before_request callbacks are called before every network attempt,
+    after_response callbacks after every successful attempt and for the calls
+    served by the cache or by another thread's identical call, and on_error
+    callbacks after every failed attempt. They all receive a RequestInfo.
+
+    Exceptions raised by the callbacks propagate to the caller.
+    """
+
+    def __init__(self):
+        self._callbacks = {event: [] for event in EVENTS}
+
+    def __bool__(self):
+        return any(self._callbacks.values())
+
+    def add(self, event: str, callback):
+        """Register a callback for one of the before_request, after_response
+        and on_error events, and return it."""
+        if event not in self._callbacks:
+            raise ValueError(f"Unknown hook event: {event}")
+        self._callbacks[event].append(callback)
+        return callback
+
+    def remove(self, event: str, callback):
+        """Unregister a callback."""
+        self._callbacks[event].remove(callback)
+
+    def emit(self, event: str, info: RequestInfo):
+        """Call the callbacks registered for an event."""
+        for callback in self._callbacks[event]:
+            callback(info)
+
+
+class MetricsAggregator:
+    """Aggregate the latency, size and error metrics of the calls by
+    endpoint template.
+
+    Usage:
+        metrics = MetricsAggregator()
+        metrics.register(client.hooks)
+        ...
+        print(metrics.report()["items/{type}/{no}/price"]["p95"])
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        """
+        Arguments:
+            max_samples: Number of latest latencies kept per endpoint to
+                compute the percentiles.
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every recorded call."""
+        with self._lock:
+            self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+            self._counters = defaultdict(lambda: defaultdict(int))
+
+    def register(self, hooks: Hooks):
+        """Record the calls reported by the given hooks."""
+        hooks.add("after_response", self.record)
+        hooks.add("on_error", self.record)
+
+    def record(self, info: RequestInfo):
+        """Record a call."""
+        with self._lock:
+            counters = self._counters[info.endpoint]
+            counters["count"] += 1
+            counters["errors"] += info.error is not None
+            counters["retries"] += info.retried
+            counters["cache_hits"] += info.cache_hit
+            counters["coalesced"] += info.coalesced
+            counters["request_bytes"] += info.request_bytes
+            counters["response_bytes"] += info.response_bytes
+            counters["sign_time"] += info.sign_time
+            counters["network_time"] += info.network_time
+            counters["decode_time"] += info.decode_time
+            self._samples[info.endpoint].append(info.total_time)
+
+    def report(self) -> dict:
+        """Return the metrics by endpoint template.
+
+        Returns:
+            dict: For each endpoint, the count of calls, errors, retries,
+            cache hits and coalesced calls, the bytes sent and received, the
+            total time spent signing, on the network and decoding, and the
+            p50, p95, p99 and max latencies.
+        """
+        with self._lock:
+            report = {}
+            for endpoint, counters in self._counters.items():
+                samples = sorted(self._samples[endpoint])
+                report[endpoint] = {
+                    **counters,
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "p99": percentile(samples, 99),
+                    "max": samples[-1] if samples else 0.0,
+                }
+            return report
+
+
+def percentile(sorted_values: list, percent: float) -> float:
+    """Return the percentile of sorted values, interpolating linearly."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return (
+        sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+    )
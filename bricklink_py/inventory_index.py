@@ -0,0 +1,176 @@
+"""In memory store inventory with hash indexes, for constant time lot lookups.
+
+Usage:
+    index = InventoryIndex(client.store_inventory.get_store_inventories())
+    client.store_inventory.attach_index(index)
+
+    for item in client.order.get_order_items(order_id)[0]:
+        lots = index.match(item)
+
+Once attached, the lots created, updated and deleted through the
+StoreInventory resource are applied to the index, so it stays consistent
+with the store without reloading it.
+"""
+
+import threading
+from typing import Any, Hashable, Iterable, Iterator, List, Mapping, Tuple
+
+
+def lot_key(entry: Mapping) -> Tuple[str, str, int, str]:
+    """Return the (item type, item number, color ID, condition) key of a lot,
+    or of anything shaped like one: order items, wanted list entries...
+    """
+    item = entry["item"]
+    return (
+        str(item["type"]).upper(),
+        str(item["no"]),
+        int(entry.get("color_id") or 0),
+        str(entry.get("new_or_used", "")).upper(),
+    )
+
+
+class InventoryIndex:
+    """Store inventory lots indexed by inventory ID, by item, color and
+    condition, by category and by remarks (often used as bin location).
+
+    Lookups are dict lookups, whatever the size of the inventory. Several
+    lots may share an item, color and condition (e.g. at different prices),
+    so the other lookups return lists, in insertion order.
+
+    The index is thread safe, so it can be attached to a client shared by a
+    Batch.
+    """
+
+    def __init__(self, lots: Iterable[Mapping] = ()):
+        """
+        Arguments:
+            lots: Initial lots, e.g. the result of get_store_inventories or
+                the iterator returned by iter_store_inventories.
+        """
+        self._lots = {}
+        self._by_key = {}
+        self._by_category = {}
+        self._by_remarks = {}
+        self._lock = threading.RLock()
+        self.update(lots)
+
+    def __len__(self):
+        return len(self._lots)
+
+    def __contains__(self, inventory_id: int):
+        return inventory_id in self._lots
+
+    def __iter__(self) -> Iterator[Mapping]:
+        with self._lock:
+            return iter(list(self._lots.values()))
+
+    def __repr__(self):
+        return f"<InventoryIndex {len(self)} lots>"
+
+    def add(self, lot: Mapping):
+        """Add a lot, or replace the lot of the same inventory ID."""
+        with self._lock:
+            inventory_id = lot["inventory_id"]
+            if inventory_id in self._lots:
+                self._unlink(self._lots[inventory_id])
+            self._lots[inventory_id] = lot
+            _link(self._by_key, lot_key(lot), inventory_id)
+            _link(self._by_category, _category(lot), inventory_id)
+            _link(self._by_remarks, lot.get("remarks") or "", inventory_id)
+
+    def update(self, lots: Iterable[Mapping]):
+        """Add or replace several lots."""
+        with self._lock:
+            for lot in lots:
+                self.add(lot)
+
+    def remove(self, inventory_id: int) -> Mapping:
+        """Remove a lot and return it, or None when it is not indexed."""
+        with self._lock:
+            lot = self._lots.pop(inventory_id, None)
+            if lot is not None:
+                self._unlink(lot)
+            return lot
+
+    def clear(self):
+        """Remove every lot."""
+        with self._lock:
+            self._lots.clear()
+            self._by_key.clear()
+            self._by_category.clear()
+            self._by_remarks.clear()
+
+    def get(self, inventory_id: int, default: Any = None) -> Mapping:
+        """Return the lot of an inventory ID."""
+        return self._lots.get(inventory_id, default)
+
+    def find(
+        self, item_type: str, item_no: str, color_id: int = 0, new_or_used: str = "N"
+    ) -> List[Mapping]:
+        """Return the lots of an item in a color and condition.
+
+        Arguments:
+            item_type -- The type of the item, e.g. "PART".
+            item_no -- Identification number of the item.
+
+        Keyword Arguments:
+            color_id -- The color of the item. (default: {0})
+            new_or_used -- "N" for new, "U" for used. (default: {"N"})
+        """
+        key = (item_type.upper(), str(item_no), int(color_id), new_or_used.upper())
+        return self._select(self._by_key, key)
+
+    def match(self, entry: Mapping) -> List[Mapping]:
+        """Return the lots of the item, color and condition of an order item,
+        wanted list entry or lot."""
+        return self._select(self._by_key, lot_key(entry))
+
+    def by_category(self, category_id: int) -> List[Mapping]:
+        """Return the lots of the items of a category."""
+        return self._select(self._by_category, category_id)
+
+    def by_remarks(self, remarks: str) -> List[Mapping]:
+        """Return the lots whose remarks are exactly the given ones."""
+        return self._select(self._by_remarks, remarks)
+
+    def apply(self, method: str, inventory_id: int = None, result: Any = None):
+        """Apply the result of a store inventory call to the index.
+
+        Called by StoreInventory once the index is attached. Created and
+        updated lots are (re)indexed from the response, deleted lots are
+        removed.
+        """
+        with self._lock:
+            if method == "delete":
+                self.remove(inventory_id)
+            elif isinstance(result, list):
+                self.update(lot for lot in result if "inventory_id" in lot)
+            elif isinstance(result, Mapping) and "inventory_id" in result:
+                self.add(result)
+
+    def _select(self, index: dict, key: Hashable) -> List[Mapping]:
+        with self._lock:
+            return [self._lots[inventory_id] for inventory_id in index.get(key, ())]
+
+    def _unlink(self, lot: Mapping):
+        inventory_id = lot["inventory_id"]
+        _unlink(self._by_key, lot_key(lot), inventory_id)
+        _unlink(self._by_category, _category(lot), inventory_id)
+        _unlink(self._by_remarks, lot.get("remarks") or "", inventory_id)
+
+
+def _category(lot: Mapping):
+    return lot["item"].get("category_id")
+
+
+def _link(index: dict, key: Hashable, inventory_id: int):
+    # Dicts of None are insertion ordered sets
+    index.setdefault(key, {})[inventory_id] = None
+
+
+def _unlink(index: dict, key: Hashable, inventory_id: int):
+    ids = index.get(key)
+    if ids is not None:
+        ids.pop(inventory_id, None)
+        if not ids:
+            del index[key]
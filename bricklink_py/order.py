@@ -1,3 +1,4 @@
+from .records import OrderItem, OrderSummary
 from .utils import BaseResource
 
 
@@ -31,7 +32,23 @@ class Order(BaseResource):
         """
         params = {"direction": direction, "status": status, "filed": filed}
         uri = "orders"
-        return self._request("get", uri, params)
+        return self._request("get", uri, params, record=OrderSummary)
+
+    def iter_orders(
+        self, direction: str = "in", status: str = None, filed: bool = False
+    ):
+        """Iterates over the orders you received or placed, parsing them one
+        at a time while the response is downloaded.
+
+        The filters are the ones of get_orders. The response is not cached
+        nor retried.
+
+        Returns:
+            Iterator of the summaries of the order resources.
+        """
+        params = {"direction": direction, "status": status, "filed": filed}
+        uri = "orders"
+        return self._stream("get", uri, params, record=OrderSummary)
 
     def get_order(self, order_id: int):
         """Retrieves the details of a specific order.
@@ -43,7 +60,7 @@ class Order(BaseResource):
             An order resource as "data" in the response body.
         """
         uri = f"orders/{order_id}"
-        return self._request("get", uri)
+        return self._request("get", uri, record=OrderSummary)
 
     def get_order_items(self, order_id: int):
         """Retrieves a list of items for the specified order.
@@ -57,7 +74,7 @@ class Order(BaseResource):
             (order item batch).
         """
         uri = f"orders/{order_id}/items"
-        return self._request("get", uri)
+        return self._request("get", uri, record=OrderItem)
 
     def get_order_messages(self, order_id: int):
         """Retrieves a list of messages for the specified order that the user
@@ -0,0 +1,187 @@
+"""Part out sets, minifigs and other assemblies into a bill of materials.
+
+Usage:
+    part_out = PartOut(client, break_minifigs=True, break_subsets=True)
+    bom = part_out.bom("SET", "10030-1")
+    for (item_type, item_no, color_id), quantity in bom.items():
+        ...
+    total = part_out.total([("SET", "10030-1", 2), ("SET", "6080-1")])
+
+Every assembly is fetched once with get_subsets, without the server side
+break_minifigs and break_subsets, and its bill of materials is computed once
+from those of its sub-assemblies: a minifig found in 300 sets costs one
+call, not 300. The assemblies of a level of the subset graph (the sets, then
+their minifigs and inner sets, then theirs...) are fetched concurrently.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from .concurrency import adaptive_map
+
+# (item type, item number) of an assembly
+Node = Tuple[str, str]
+
+# (item type, item number, color ID) of a part of a bill of materials
+BomKey = Tuple[str, str, int]
+
+
+def node(type: str, no: str) -> Node:
+    """Return the normalized key of an item."""
+    return (type.upper(), str(no))
+
+
+class PartOut:
+    """Part-out engine memoizing the subsets of the assemblies it breaks.
+
+    The memo lasts as long as the engine: reuse one engine across calls to
+    fetch each assembly once, make a new one to see catalog changes. An
+    engine is not thread safe, but fetches concurrently by itself.
+    """
+
+    def __init__(
+        self,
+        client,
+        break_minifigs: bool = True,
+        break_subsets: bool = True,
+        box: bool = False,
+        instruction: bool = False,
+        include_extra: bool = False,
+        max_workers: int = 16,
+    ):
+        """
+        Arguments:
+            client: Bricklink client.
+            break_minifigs: Break the minifigs down into their parts.
+            break_subsets: Break the sets in sets down into their parts.
+            box: Include the original box of the sets.
+            instruction: Include the original instructions of the sets.
+            include_extra: Count the extra pieces sets come with.
+            max_workers: Highest number of concurrent get_subsets calls.
+        """
+        self.client = client
+        self.break_minifigs = break_minifigs
+        self.break_subsets = break_subsets
+        self.box = box
+        self.instruction = instruction
+        self.include_extra = include_extra
+        self.max_workers = max_workers
+        self.fetches = 0
+        # Assembly -> [(child, color ID, quantity)] of its subsets
+        self._subsets = {}
+        # Assembly -> its flattened bill of materials
+        self._boms = {}
+
+    def __repr__(self):
+        return f"<PartOut assemblies={len(self._subsets)} fetches={self.fetches}>"
+
+    def bom(self, type: str, no: str) -> Dict[BomKey, int]:
+        """Return the bill of materials of an item.
+
+        Arguments:
+            type -- The type of the item, e.g. SET or MINIFIG.
+            no -- Identification number of the item.
+
+        Returns:
+            dict: The quantity of every part, keyed by (item type, item
+            number, color ID).
+        """
+        return self.boms([(type, no)])[node(type, no)]
+
+    def boms(self, items: Iterable[Tuple[str, str]]) -> Dict[Node, Dict[BomKey, int]]:
+        """Return the bills of materials of many items, fetching their
+        subset graphs together.
+
+        Arguments:
+            items -- (type, no) of the items.
+
+        Returns:
+            dict: The bill of materials of every item, keyed by (type, no)
+            with the type in upper case.
+        """
+        roots = list(dict.fromkeys(node(type, no) for type, no in items))
+        self.fetch(roots)
+        return {root: dict(self._flatten(root, ())) for root in roots}
+
+    def total(self, items: Iterable[tuple]) -> Dict[BomKey, int]:
+        """Return the bill of materials of a collection of items.
+
+        Arguments:
+            items -- (type, no) or (type, no, quantity) of the items.
+
+        Returns:
+            dict: The total quantity of every part.
+        """
+        quantities = {}
+        for type, no, *quantity in items:
+            key = node(type, no)
+            quantities[key] = quantities.get(key, 0) + (quantity[0] if quantity else 1)
+        total = {}
+        for root, bom in self.boms(quantities).items():
+            for key, count in bom.items():
+                total[key] = total.get(key, 0) + count * quantities[root]
+        return total
+
+    def fetch(self, items: Iterable[Tuple[str, str]]):
+        """Fetch the subsets of the items and of the assemblies they contain,
+        a level of the graph at a time, skipping those already fetched."""
+        frontier = list(dict.fromkeys(node(*item) for item in items))
+        while frontier:
+            frontier = [item for item in frontier if item not in self._subsets]
+            results = adaptive_map(self._get_subsets, frontier, self.max_workers)
+            self.fetches += len(frontier)
+            children = {}
+            for item, groups in zip(frontier, results):
+                self._subsets[item] = subsets = self._read(groups)
+                for child, _, _ in subsets:
+                    if self._breaks(child) and child not in self._subsets:
+                        children[child] = None
+            frontier = list(children)
+
+    def _get_subsets(self, item: Node) -> list:
+        is_set = item[0] == "SET"
+        return self.client.catalog_item.get_subsets(
+            item[0],
+            item[1],
+            box=self.box and is_set,
+            instruction=self.instruction and is_set,
+        )
+
+    def _read(self, groups: list) -> List[tuple]:
+        """Return the (child, color ID, quantity) of subsets, without the
+        alternate items."""
+        subsets = []
+        for group in groups or ():
+            for entry in group["entries"]:
+                if entry.get("is_alternate"):
+                    continue
+                quantity = entry["quantity"]
+                if self.include_extra:
+                    quantity += entry.get("extra_quantity") or 0
+                item = entry["item"]
+                child = node(item["type"], item["no"])
+                subsets.append((child, int(entry.get("color_id") or 0), quantity))
+        return subsets
+
+    def _breaks(self, item: Node) -> bool:
+        """Tell whether a sub-assembly is broken down into its parts."""
+        return (item[0] == "MINIFIG" and self.break_minifigs) or (
+            item[0] == "SET" and self.break_subsets
+        )
+
+    def _flatten(self, item: Node, path: tuple) -> Dict[BomKey, int]:
+        """Return the memoized bill of materials of an assembly."""
+        bom = self._boms.get(item)
+        if bom is not None:
+            return bom
+        if item in path:
+            raise ValueError(f"{item[0]} {item[1]} contains itself")
+        bom = {}
+        for child, color_id, quantity in self._subsets[item]:
+            if self._breaks(child):
+                for key, count in self._flatten(child, path + (item,)).items():
+                    bom[key] = bom.get(key, 0) + count * quantity
+            else:
+                key = (child[0], child[1], color_id)
+                bom[key] = bom.get(key, 0) + quantity
+        self._boms[item] = bom
+        return bom
@@ -0,0 +1,261 @@
+"""Part-out value of sets: their bill of materials priced with price guides.
+
+Usage:
+    client.catalog_item.attach_price_guide_cache(PriceGuideCache())
+    value = part_out_value(client, ["10030-1", "6080-1"], guide_type="sold")
+    print(value.total, value.set_values)
+    for row in value.rows():
+        print(row["item"]["no"], row["color_id"], row["quantity"], row["value"])
+
+The sets are parted out with a PartOut engine, the part-color pairs of all
+the sets are deduplicated, and their price guides are fetched concurrently
+with get_price_guides, once each. Attach a PriceGuideCache to the
+catalog_item resource to reuse them across calls. Values are computed with
+NumPy, exactly, in 1/10,000 of the currency.
+
+Requires the optional numpy dependency.
+"""
+
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "part_out_value requires numpy: pip install bricklink-py[numpy]"
+    ) from exc
+
+from .catalog_item import PriceGuideSpec
+from .part_out import BomKey, PartOut, node
+from .price_stats import SCALE, PriceDetails, parse_prices
+
+# Price of a part read from its price guide
+GUIDE_FIELDS = ("qty_avg_price", "avg_price", "min_price", "max_price")
+
+# Price of a part computed from the price_detail of its price guide
+DETAIL_STATISTICS = {
+    "median": PriceDetails.weighted_median,
+    "mean": PriceDetails.weighted_mean,
+    "trimmed_mean": PriceDetails.trimmed_mean,
+}
+
+
+class PartOutValue:
+    """Value of the parts of sets.
+
+    Attributes:
+        sets: (type, no) of the sets.
+        set_quantities: Number of copies of every set.
+        keys: (item type, item number, color ID) of every part.
+        quantities: Quantity of every part in all the copies of the sets.
+        unit_prices: Price of one of every part, NaN without price data.
+        values: Value of every part, quantity times unit price.
+        set_values: Value of one copy of every set, without the parts lacking
+            price data.
+        total: Value of all the copies of the sets.
+        missing: Parts without price data.
+        errors: The exceptions of the price guides that could not be fetched,
+            by part.
+    """
+
+    def __init__(
+        self,
+        sets: list,
+        set_quantities: np.ndarray,
+        keys: List[BomKey],
+        bom: tuple,
+        prices: np.ndarray,
+        errors: Dict[BomKey, Exception] = None,
+    ):
+        """
+        Arguments:
+            sets: (type, no) of the sets.
+            set_quantities: Number of copies of every set.
+            keys: The parts.
+            bom: (set index, part index, quantity) arrays of the bills of
+                materials of one copy of the sets.
+            prices: Price of every part in 1/10,000, -1 without price data.
+            errors: Exceptions of the failed price guides by part.
+        """
+        self.sets = sets
+        self.set_quantities = set_quantities
+        self.keys = keys
+        self.errors = errors or {}
+        set_index, part_index, quantity = bom
+        priced = prices >= 0
+        amounts = quantity * np.where(priced, prices, 0)[part_index]
+
+        # Integer sums, so the values are exact
+        self._set_values = np.zeros(len(sets), dtype=np.int64)
+        np.add.at(self._set_values, set_index, amounts)
+        self._quantities = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(self._quantities, part_index, quantity * set_quantities[set_index])
+        self._prices = prices
+        self._priced = priced
+
+    def __len__(self):
+        """Number of distinct parts."""
+        return len(self.keys)
+
+    def __repr__(self):
+        return (
+            f"<PartOutValue sets={len(self.sets)} parts={len(self)} "
+            f"missing={len(self.missing)} total={self.total:.2f}>"
+        )
+
+    @property
+    def quantities(self) -> np.ndarray:
+        return self._quantities
+
+    @property
+    def unit_prices(self) -> np.ndarray:
+        return np.where(self._priced, self._prices / SCALE, np.nan)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._quantities * self.unit_prices
+
+    @property
+    def set_values(self) -> np.ndarray:
+        return self._set_values / SCALE
+
+    @property
+    def total(self) -> float:
+        return int(self._set_values @ self.set_quantities) / SCALE
+
+    @property
+    def missing(self) -> List[BomKey]:
+        return [key for key, priced in zip(self.keys, self._priced) if not priced]
+
+    def rows(self) -> List[dict]:
+        """Return one dict per part, shaped like the subsets, with its
+        quantity, unit_price and value, the most valuable first."""
+        unit_prices, values = self.unit_prices, self.values
+        rows = []
+        for index in np.argsort(-np.nan_to_num(values, nan=-1.0), kind="stable"):
+            type, no, color_id = self.keys[index]
+            priced = bool(self._priced[index])
+            rows.append(
+                {
+                    "item": {"no": no, "type": type},
+                    "color_id": color_id,
+                    "quantity": int(self._quantities[index]),
+                    "unit_price": float(unit_prices[index]) if priced else None,
+                    "value": float(values[index]) if priced else None,
+                }
+            )
+        return rows
+
+
+def part_out_value(
+    client,
+    sets,
+    guide_type: str = "sold",
+    new_or_used: str = "N",
+    price: str = "qty_avg_price",
+    country_code: str = None,
+    region: str = None,
+    currency_code: str = None,
+    vat: str = "N",
+    part_out: PartOut = None,
+    max_workers: int = 16,
+) -> PartOutValue:
+    """Compute the part-out value of one or many sets.
+
+    Arguments:
+        client -- Bricklink client.
+        sets -- A set number, or set numbers, (type, no) or (type, no,
+        quantity) of the items to part out.
+
+    Keyword Arguments:
+        guide_type -- "sold" or "stock" price guides. (default: {"sold"})
+        new_or_used -- "N" or "U" price guides. (default: {"N"})
+        price -- The price of a part: a field of the price guide
+        (qty_avg_price, avg_price, min_price, max_price), or a statistic of
+        its price_detail (median, mean, trimmed_mean).
+        (default: {"qty_avg_price"})
+        country_code, region, currency_code, vat -- Like get_price_guide.
+        part_out -- The PartOut engine breaking the sets down. (default:
+        {PartOut(client), breaking minifigs and sets in sets})
+        max_workers -- Highest number of concurrent calls. (default: {16})
+
+    Returns:
+        PartOutValue: The value of every part and of the sets.
+    """
+    if price not in GUIDE_FIELDS and price not in DETAIL_STATISTICS:
+        raise ValueError(f"Unknown price {price!r}")
+    if part_out is None:
+        part_out = PartOut(client, max_workers=max_workers)
+
+    quantities = {}
+    for item in [sets] if isinstance(sets, str) else sets:
+        if isinstance(item, str):
+            item = ("SET", item)
+        key = node(item[0], item[1])
+        quantities[key] = quantities.get(key, 0) + (item[2] if len(item) > 2 else 1)
+    boms = part_out.boms(quantities)
+
+    # One row per part of every set, the parts numbered in order of
+    # appearance
+    parts = {}
+    set_index, part_index, quantity = [], [], []
+    for index, bom in enumerate(boms.values()):
+        for key, count in bom.items():
+            set_index.append(index)
+            part_index.append(parts.setdefault(key, len(parts)))
+            quantity.append(count)
+    keys = list(parts)
+
+    specs = [
+        PriceGuideSpec(
+            type,
+            no,
+            color_id if type == "PART" else None,
+            guide_type,
+            new_or_used,
+            country_code,
+            region,
+            currency_code,
+            vat,
+        )
+        for type, no, color_id in keys
+    ]
+    guides = client.catalog_item.get_price_guides(
+        specs, max_workers=max_workers, return_exceptions=True
+    )
+    guides = [guides[PriceGuideSpec.of(spec)] for spec in specs]
+    errors = {
+        key: guide for key, guide in zip(keys, guides) if isinstance(guide, Exception)
+    }
+
+    return PartOutValue(
+        list(boms),
+        np.array(list(quantities.values()), dtype=np.int64),
+        keys,
+        (
+            np.array(set_index, dtype=np.int64),
+            np.array(part_index, dtype=np.int64),
+            np.array(quantity, dtype=np.int64),
+        ),
+        _prices(guides, price),
+        errors,
+    )
+
+
+def _prices(guides: list, price: str) -> np.ndarray:
+    """Return the price of every guide in 1/10,000, -1 for the failed guides
+    and those without sales or lots."""
+    if price in DETAIL_STATISTICS:
+        values = DETAIL_STATISTICS[price](PriceDetails.from_guides(guides))
+        return np.where(np.isnan(values), -1, np.rint(values * SCALE)).astype(np.int64)
+    available = np.array(
+        [
+            isinstance(guide, dict) and bool(guide.get("unit_quantity"))
+            for guide in guides
+        ],
+        dtype=bool,
+    )
+    prices = parse_prices(
+        [guide[price] if ok else 0 for guide, ok in zip(guides, available)]
+    )
+    return np.where(available, prices, -1)
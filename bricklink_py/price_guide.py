@@ -0,0 +1,193 @@
+"""Cache of price guides with separate TTLs for sold and stock guides, and
+stale-while-revalidate.
+
+Usage:
+    cache = client.catalog_item.attach_price_guide_cache(
+        PriceGuideCache(sold_ttl=7 * 86400, stock_ttl=3600)
+    )
+    guide = client.catalog_item.get_price_guide("PART", "3001", 11)
+    if guide["age"] > 6 * 3600:
+        ...
+
+Price guides served by the cache carry an "age" key: the seconds since they
+were fetched, 0 when they were just fetched. An expired guide is still
+returned, instantly, during stale_ttl seconds after its expiry while a
+background thread fetches the fresh one. get_price_guide(..., max_age=...)
+refuses guides older than max_age and waits for a fresh one instead.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from .catalog_item import PriceGuideSpec
+
+DAY = 86400
+
+
+class PriceGuideCache:
+    """In memory LRU cache of price guides keyed on every parameter of
+    get_price_guide.
+
+    The cache is thread safe. Guides are returned as shallow copies, treat
+    their price_detail as read-only.
+    """
+
+    def __init__(
+        self,
+        sold_ttl: float = DAY,
+        stock_ttl: float = 3600,
+        stale_ttl: float = DAY,
+        maxsize: int = 10000,
+        refresh_workers: int = 4,
+        clock=time.time,
+    ):
+        """
+        Arguments:
+            sold_ttl: Seconds the "sold" (last 6 months sales) guides are
+                fresh.
+            stock_ttl: Seconds the "stock" (current items for sale) guides
+                are fresh.
+            stale_ttl: Seconds an expired guide is still served while it is
+                refreshed in the background, 0 disables stale answers.
+            maxsize: Maximum number of cached guides.
+            refresh_workers: Threads refreshing the stale guides.
+            clock: Clock of the ages, mainly for testing.
+        """
+        self.sold_ttl = sold_ttl
+        self.stock_ttl = stock_ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self._clock = clock
+        # spec -> (price guide, fetch time)
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            refresh_workers, thread_name_prefix="bricklink-price-guide"
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_ttl(self, spec: PriceGuideSpec) -> float:
+        """Return the seconds the guide of a spec stays fresh."""
+        return self.sold_ttl if spec.guide_type == "sold" else self.stock_ttl
+
+    def age(self, spec) -> float:
+        """Return the age in seconds of the cached guide of a spec, None when
+        it is not cached."""
+        entry = self._entries.get(PriceGuideSpec.of(spec))
+        return None if entry is None else self._clock() - entry[1]
+
+    def fetch(self, spec, fetch: Callable, max_age: float = None) -> dict:
+        """Return the guide of a spec, from the cache when fresh enough.
+
+        Arguments:
+            spec -- The PriceGuideSpec of the guide.
+            fetch -- Called with the spec to fetch the guide from the API.
+
+        Keyword Arguments:
+            max_age -- Refuse cached guides older than this many seconds.
+            (default: {None})
+
+        Returns:
+            dict: The price guide, with its "age" in seconds.
+        """
+        spec = PriceGuideSpec.of(spec)
+        guide, refresh = self._lookup(spec, max_age)
+        if refresh:
+            try:
+                self._executor.submit(self._refresh, spec, fetch)
+            except RuntimeError:  # closed, serve the stale guide anyway
+                with self._lock:
+                    self._refreshing.discard(spec)
+        if guide is not None:
+            return guide
+
+        data = fetch(spec)
+        self.store(spec, data)
+        return dict(data, age=0.0)
+
+    def store(self, spec, data: dict):
+        """Cache the guide of a spec, fetched now."""
+        spec = PriceGuideSpec.of(spec)
+        with self._lock:
+            self._entries[spec] = (data, self._clock())
+            self._entries.move_to_end(spec)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, spec=None):
+        """Drop the guide of a spec, or every guide when no spec is given."""
+        with self._lock:
+            if spec is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(PriceGuideSpec.of(spec), None)
+
+    def stats(self) -> dict:
+        """Return the counters of the cache."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "size": len(self),
+        }
+
+    def close(self, wait: bool = True):
+        """Stop the refresh threads, waiting for running refreshes by
+        default."""
+        self._executor.shutdown(wait=wait)
+
+    def _lookup(self, spec: PriceGuideSpec, max_age: float) -> tuple:
+        """Return the cached guide of a spec, None when missing or too old,
+        and whether a background refresh of it must start."""
+        with self._lock:
+            entry = self._entries.get(spec)
+            if entry is not None:
+                age = self._clock() - entry[1]
+                ttl = self.get_ttl(spec)
+                if (max_age is None or age <= max_age) and age < ttl + self.stale_ttl:
+                    self._entries.move_to_end(spec)
+                    if age < ttl:
+                        self.hits += 1
+                        return dict(entry[0], age=age), False
+                    self.stale_hits += 1
+                    refresh = spec not in self._refreshing
+                    self._refreshing.add(spec)
+                    return dict(entry[0], age=age), refresh
+            self.misses += 1
+            return None, False
+
+    def _refresh(self, spec: PriceGuideSpec, fetch: Callable):
+        """Fetch a stale guide again. On failure the stale guide is kept."""
+        try:
+            data = fetch(spec)
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+        else:
+            self.store(spec, data)
+            with self._lock:
+                self.refreshes += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(spec)
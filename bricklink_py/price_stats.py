@@ -0,0 +1,264 @@
+"""Vectorized statistics over the price_detail of many price guides.
+
+Usage:
+    guides = client.catalog_item.get_price_guides(specs)
+    details = PriceDetails.from_guides(guides)
+    medians = details.weighted_median()
+    p10, p90 = details.percentile([10, 90]).T
+    fair = details.trimmed_mean(0.1)
+    for spec, median in zip(details.keys, medians):
+        ...
+
+The entries of all the guides are packed into flat NumPy arrays, the
+entries of guide i being entries[offsets[i]:offsets[i + 1]], and every
+statistic is computed for all the guides at once. Prices are parsed exactly,
+as integer numbers of 1/10,000 of the currency (the precision of the API):
+medians and percentiles are prices of the guides, exactly. Statistics are
+weighted by the quantity of the entries, and NaN for guides without entries.
+
+Requires the optional numpy dependency.
+"""
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Iterable, List, Mapping
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "PriceDetails requires numpy: pip install bricklink-py[numpy]"
+    ) from exc
+
+# Prices are stored as integer multiples of 1 / SCALE
+DIGITS = 4
+SCALE = 10**DIGITS
+
+
+def parse_price(value: Any) -> int:
+    """Return a price as an integer number of 1/10,000, without the rounding
+    errors of floats: "1.2345" is 12345. Extra decimals are rounded half to
+    even."""
+    if isinstance(value, int):
+        return value * SCALE
+    text = str(value)
+    whole, _, fraction = text.partition(".")
+    exact = len(fraction) <= DIGITS and (fraction.isdigit() or not fraction)
+    if whole.isdigit() and exact:
+        return int(whole) * SCALE + int(fraction.ljust(DIGITS, "0"))
+    return int((Decimal(text) * SCALE).to_integral_value(ROUND_HALF_EVEN))
+
+
+def parse_prices(values: list) -> np.ndarray:
+    """Vectorized parse_price: parse the prices as floats, then round them to
+    1/10,000. Prices of up to 4 decimals are within far less than 1/20,000 of
+    their float, so they come out exact; the rare prices of more decimals
+    close to half a unit are parsed again with parse_price to round them
+    half to even exactly."""
+    scaled = np.array(values, dtype=np.float64) * SCALE
+    prices = np.rint(scaled).astype(np.int64)
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for index in ties:
+        prices[index] = parse_price(values[index])
+    return prices
+
+
+def to_decimals(values: np.ndarray) -> List[Decimal]:
+    """Turn statistics into Decimals of 4 decimals, None for NaN."""
+    return [
+        None if value != value else Decimal(round(value * SCALE)).scaleb(-DIGITS)
+        for value in np.asarray(values, dtype=np.float64).ravel()
+    ]
+
+
+class PriceDetails:
+    """The price_detail entries of many price guides, packed in NumPy arrays.
+
+    Attributes:
+        keys: The key of every guide: its spec when built from the result of
+            get_price_guides, its position otherwise.
+        offsets: Start of the entries of every guide, and the end of the
+            last one.
+        quantities: Quantity of every entry, int64.
+        prices: Unit price of every entry, int64 in 1/10,000 of the currency.
+    """
+
+    def __init__(
+        self,
+        keys: list,
+        offsets: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+    ):
+        if len(offsets) != len(keys) + 1 or len(quantities) != len(prices):
+            raise ValueError("Arrays do not describe the entries of the keys")
+        self.keys = keys
+        self.offsets = offsets
+        self.quantities = quantities
+        self.prices = prices
+        self._sorted = None
+
+    @classmethod
+    def from_guides(cls, guides) -> "PriceDetails":
+        """Pack the entries of price guides.
+
+        Arguments:
+            guides: Price guides returned by get_price_guide, or the dict of
+                get_price_guides. Exceptions in place of guides, kept by
+                return_exceptions, count as guides without entries.
+        """
+        if isinstance(guides, Mapping):
+            keys, guides = list(guides), guides.values()
+        else:
+            guides = list(guides)
+            keys = list(range(len(guides)))
+
+        details = [
+            (guide.get("price_detail") or ()) if isinstance(guide, Mapping) else ()
+            for guide in guides
+        ]
+        entries = [entry for detail in details for entry in detail]
+        offsets = np.zeros(len(details) + 1, dtype=np.int64)
+        np.cumsum([len(detail) for detail in details], out=offsets[1:])
+        return cls(
+            keys,
+            offsets,
+            np.array([entry["quantity"] for entry in entries], dtype=np.int64),
+            parse_prices([entry["unit_price"] for entry in entries]),
+        )
+
+    def __len__(self):
+        """Number of guides."""
+        return len(self.keys)
+
+    def __repr__(self):
+        return f"<PriceDetails guides={len(self)} entries={len(self.prices)}>"
+
+    @property
+    def lots(self) -> np.ndarray:
+        """Number of entries of every guide."""
+        return np.diff(self.offsets)
+
+    def total_quantity(self) -> np.ndarray:
+        """Sum of the quantities of every guide."""
+        return self._sum(self.quantities)
+
+    def min(self) -> np.ndarray:
+        """Lowest price of every guide."""
+        return self.percentile(0)
+
+    def max(self) -> np.ndarray:
+        """Highest price of every guide."""
+        return self.percentile(100)
+
+    def weighted_mean(self) -> np.ndarray:
+        """Average price of every guide, weighted by quantity."""
+        return self.trimmed_mean(0)
+
+    def weighted_median(self) -> np.ndarray:
+        """Median price of every guide, weighted by quantity."""
+        return self.percentile(50)
+
+    def percentile(self, q) -> np.ndarray:
+        """Quantity weighted percentiles of every guide: the lowest price
+        that at least q% of the quantity is sold at or below.
+
+        Arguments:
+            q: A percentage, or a sequence of them.
+
+        Returns:
+            np.ndarray: One value per guide, or one row per guide and one
+            column per percentage when q is a sequence.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 100)):
+            raise ValueError("Percentiles must be between 0 and 100")
+        order, cumulative, before = self._sort()
+        starts, ends = self.offsets[:-1], self.offsets[1:]
+        total = cumulative[ends - 1] - before if len(cumulative) else before
+
+        # Entries are sorted by guide then price, and every quantity is
+        # positive, so the cumulative quantity grows across all the guides
+        targets = before[:, None] + q.reshape(-1)[None, :] / 100 * total[:, None]
+        positions = np.searchsorted(cumulative, targets, side="left")
+        positions = np.clip(
+            positions, starts[:, None], np.maximum(ends - 1, 0)[:, None]
+        )
+
+        values = np.full(positions.shape, np.nan)
+        filled = ends > starts
+        if len(order):
+            values[filled] = self.prices[order][positions[filled]] / SCALE
+        return values.reshape(-1) if q.ndim == 0 else values
+
+    def trimmed_mean(self, proportion: float = 0.1) -> np.ndarray:
+        """Quantity weighted average price of every guide, ignoring the
+        cheapest and the most expensive proportion of the quantity, e.g. the
+        10% most underpriced and the 10% most overpriced pieces.
+
+        Arguments:
+            proportion: Share of the quantity cut at each end, below 0.5.
+        """
+        if not 0 <= proportion < 0.5:
+            raise ValueError("proportion must be in [0, 0.5)")
+        order, cumulative, before = self._sort()
+        if not len(order):
+            return np.full(len(self), np.nan)
+        guides = np.repeat(np.arange(len(self)), self.lots)
+        total = self.total_quantity().astype(np.float64)
+        low = (before + proportion * total)[guides]
+        high = (before + (1 - proportion) * total)[guides]
+
+        # Weight of each entry left within [low, high] of the cumulative
+        # quantity of its guide
+        end = cumulative.astype(np.float64)
+        start = end - self.quantities[order]
+        weights = np.clip(np.minimum(end, high) - np.maximum(start, low), 0, None)
+        amounts = np.bincount(guides, weights * self.prices[order], minlength=len(self))
+        kept = np.bincount(guides, weights, minlength=len(self))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(kept > 0, amounts / kept / SCALE, np.nan)
+
+    def summary(self, percentiles: Iterable[float] = (10, 90), trim: float = 0.1):
+        """Return the main statistics of every guide by name: lots,
+        total_quantity, min, max, mean, median, trimmed_mean and p<N> for
+        every percentile."""
+        stats = {
+            "lots": self.lots,
+            "total_quantity": self.total_quantity(),
+            "min": self.min(),
+            "max": self.max(),
+            "mean": self.weighted_mean(),
+            "median": self.weighted_median(),
+            "trimmed_mean": self.trimmed_mean(trim),
+        }
+        percentiles = list(percentiles)
+        if percentiles:
+            values = self.percentile(percentiles)
+            for column, q in enumerate(percentiles):
+                stats[f"p{q:g}"] = values[:, column]
+        return stats
+
+    def _sum(self, values: np.ndarray) -> np.ndarray:
+        """Sum values of the entries by guide."""
+        sums = np.zeros(len(self), dtype=values.dtype)
+        filled = self.lots > 0
+        if filled.any():
+            sums[filled] = np.add.reduceat(values, self.offsets[:-1][filled])
+        return sums
+
+    def _sort(self):
+        """Return the order sorting the entries by guide then price, the
+        cumulative quantity of the sorted entries, and that cumulative
+        quantity before the entries of every guide."""
+        if self._sorted is None:
+            guides = np.repeat(np.arange(len(self)), self.lots)
+            span = int(self.prices.max()) + 1 if len(self.prices) else 1
+            if self.prices.min(initial=0) >= 0 and len(self) * span < 2**62:
+                # One sort of a combined key is faster than a lexsort
+                order = np.argsort(guides * span + self.prices)
+            else:
+                order = np.lexsort((self.prices, guides))
+            cumulative = np.cumsum(self.quantities[order])
+            before = np.concatenate(([0], cumulative))[self.offsets[:-1]]
+            self._sorted = (order, cumulative, before.astype(np.float64))
+        return self._sorted
@@ -0,0 +1,121 @@
+import math
+import threading
+import time
+from collections import deque
+
+from .utils import QuotaExceededError
+
+
+class RateLimiter:
+    """Client side token bucket limiter with a rolling daily quota.
+
+    BaseResource._request calls acquire() before every API call. Any object
+    with an acquire() method (and reserve() for the async client) can be
+    plugged in instead.
+
+    The limiter is thread safe, so a single instance can be shared by all the
+    resources of a client and by several threads.
+    """
+
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = None,
+        daily_limit: int = None,
+        window: float = 86400.0,
+        wait_for_quota: bool = False,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """
+        Arguments:
+            rate: Sustained number of calls per second. None disables the
+                per second smoothing.
+            burst: Number of calls that can be made at once before the rate
+                applies. Defaults to the rate rounded up, at least 1.
+            daily_limit: Number of calls allowed in the rolling window
+                (BrickLink allows 5000 calls a day). None disables the quota.
+            window: Length in seconds of the rolling quota window.
+            wait_for_quota: Wait for the quota to free up instead of raising
+                QuotaExceededError when it is exhausted.
+            clock: Monotonic clock, mainly for testing.
+            sleep: Sleep function, mainly for testing.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, math.ceil(rate or 1))
+        self.daily_limit = daily_limit
+        self.window = window
+        self.wait_for_quota = wait_for_quota
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        """Calls left in the rolling quota window, None if unlimited."""
+        if self.daily_limit is None:
+            return None
+        with self._lock:
+            self._expire(self._clock())
+            return max(0, self.daily_limit - len(self._calls))
+
+    @property
+    def used(self) -> int:
+        """Calls made (or reserved) in the rolling quota window."""
+        with self._lock:
+            self._expire(self._clock())
+            return len(self._calls)
+
+    def reserve(self) -> float:
+        """Reserve a call and return the number of seconds to wait before it
+        can be made, without sleeping.
+
+        Raises:
+            QuotaExceededError: When the daily quota is exhausted and
+            wait_for_quota is False.
+        """
+        with self._lock:
+            now = self._clock()
+            delay = 0.0
+
+            if self.daily_limit is not None:
+                self._expire(now)
+                if len(self._calls) >= self.daily_limit:
+                    if not self.wait_for_quota:
+                        raise QuotaExceededError(
+                            429, f"Daily quota of {self.daily_limit} calls exhausted"
+                        )
+                    # The call has to wait until enough older calls expire
+                    delay = self._calls[-self.daily_limit] + self.window - now
+
+            if self.rate:
+                elapsed = now - self._updated
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self.rate)
+
+            if self.daily_limit is not None:
+                self._calls.append(now + delay)
+
+            return delay
+
+    def acquire(self):
+        """Block until a call can be made.
+
+        Raises:
+            QuotaExceededError: When the daily quota is exhausted and
+            wait_for_quota is False.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            self._sleep(delay)
+
+    def _expire(self, now: float):
+        """Drop the calls that left the rolling window."""
+        while self._calls and self._calls[0] + self.window <= now:
+            self._calls.popleft()
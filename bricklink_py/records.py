@@ -0,0 +1,335 @@
+"""Compact record types for the most numerous API payloads.
+
+Records store the fields of a payload in __slots__ instead of a dict, which
+takes several times less memory per lot or order and makes attribute access
+cheaper. They are read-only mappings too, so code written for the plain dicts
+keeps working: lot["item"]["no"], lot.get("remarks"), dict(lot) and
+lot == payload all behave as with the dict.
+
+String values repeated across records (dates, colors, zero prices...) are
+interned, so equal values share one object instead of one per record.
+
+Nested objects (the item of a lot, the cost of an order...) are kept as
+decoded by the JSON parser and only turned into records on first access.
+
+Fields missing from the payload are missing from the record: reading them
+raises AttributeError, or KeyError with [] access. Keys that are not known
+fields are kept aside and only reachable with [] access and get().
+
+Enable them with Bricklink(..., records=True).
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any
+
+
+class _Nested:
+    """Descriptor turning the raw dict of a nested field into a record on
+    first access."""
+
+    def __init__(self, slot, record_type: type):
+        self.slot = slot
+        self.record_type = record_type
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if type(value) is dict:
+            value = self.record_type(value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+
+def _slots(fields: tuple, nested: dict) -> tuple:
+    """Return the slot names of the fields, nested ones being prefixed with
+    an underscore to make room for their descriptor."""
+    return tuple(f"_{name}" if name in nested else name for name in fields)
+
+
+class Record(Mapping):
+    """Base class of the records.
+
+    Subclasses list the payload keys in _fields, the record type of the nested
+    fields in _nested, the fields whose string values are interned in
+    _interned, and set __slots__ = _slots(_fields, _nested).
+    """
+
+    __slots__ = ("_extra",)
+    _fields = ()
+    _nested = {}
+    _interned = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        setters = {}
+        for name in cls._fields:
+            if name in cls._nested:
+                slot = getattr(cls, f"_{name}")
+                setattr(cls, name, _Nested(slot, cls._nested[name]))
+                setters[name] = slot.__set__
+            elif name in cls._interned:
+                setters[name] = _interning_setter(getattr(cls, name).__set__)
+            else:
+                setters[name] = getattr(cls, name).__set__
+        cls._setters = setters
+
+    def __init__(self, data: dict):
+        extra = None
+        setters = self._setters
+        for key, value in data.items():
+            setter = setters.get(key)
+            if setter is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                setter(self, value)
+        self._extra = extra
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._setters:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for name in self._fields:
+            if hasattr(self, name):
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """Return the payload as plain dicts and lists."""
+        return {key: _to_plain(value) for key, value in self.items()}
+
+
+def _interning_setter(setter):
+    intern = sys.intern
+
+    def set_interned(obj, value):
+        setter(obj, intern(value) if type(value) is str else value)
+
+    return set_interned
+
+
+def _to_plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(v) for v in value]
+    return value
+
+
+def to_records(data, record_type: type):
+    """Turn a payload, or lists of payloads, into records."""
+    if isinstance(data, dict):
+        return record_type(data)
+    if isinstance(data, list):
+        return [to_records(value, record_type) for value in data]
+    return data
+
+
+class Item(Record):
+    """A catalog item, or the summary of the item of a lot or order item."""
+
+    _fields = (
+        "no",
+        "name",
+        "type",
+        "category_id",
+        "alternate_no",
+        "image_url",
+        "thumbnail_url",
+        "weight",
+        "dim_x",
+        "dim_y",
+        "dim_z",
+        "year_released",
+        "description",
+        "is_obsolete",
+        "language_code",
+    )
+    _interned = ("type", "weight", "dim_x", "dim_y", "dim_z")
+    __slots__ = _slots(_fields, {})
+
+
+class InventoryLot(Record):
+    """A lot of the store inventory."""
+
+    _fields = (
+        "inventory_id",
+        "item",
+        "color_id",
+        "color_name",
+        "quantity",
+        "new_or_used",
+        "completeness",
+        "unit_price",
+        "bind_id",
+        "description",
+        "remarks",
+        "bulk",
+        "is_retain",
+        "is_stock_room",
+        "stock_room_id",
+        "date_created",
+        "my_cost",
+        "sale_rate",
+        "tier_quantity1",
+        "tier_price1",
+        "tier_quantity2",
+        "tier_price2",
+        "tier_quantity3",
+        "tier_price3",
+        "my_weight",
+        "status",
+    )
+    _nested = {"item": Item}
+    _interned = (
+        "color_name",
+        "unit_price",
+        "description",
+        "remarks",
+        "stock_room_id",
+        "date_created",
+        "my_cost",
+        "tier_price1",
+        "tier_price2",
+        "tier_price3",
+        "my_weight",
+    )
+    __slots__ = _slots(_fields, _nested)
+
+
+class OrderItem(Record):
+    """An item of an order."""
+
+    _fields = (
+        "inventory_id",
+        "item",
+        "color_id",
+        "color_name",
+        "quantity",
+        "new_or_used",
+        "completeness",
+        "unit_price",
+        "unit_price_final",
+        "disp_unit_price",
+        "disp_unit_price_final",
+        "currency_code",
+        "disp_currency_code",
+        "remarks",
+        "description",
+        "weight",
+    )
+    _nested = {"item": Item}
+    _interned = (
+        "color_name",
+        "unit_price",
+        "unit_price_final",
+        "disp_unit_price",
+        "disp_unit_price_final",
+        "currency_code",
+        "disp_currency_code",
+        "remarks",
+        "description",
+        "weight",
+    )
+    __slots__ = _slots(_fields, _nested)
+
+
+class OrderPayment(Record):
+    """The payment of an order."""
+
+    _fields = ("method", "currency_code", "date_paid", "status")
+    __slots__ = _slots(_fields, {})
+
+
+class OrderShipping(Record):
+    """The shipping of an order."""
+
+    _fields = (
+        "method_id",
+        "method",
+        "tracking_no",
+        "tracking_link",
+        "date_shipped",
+        "address",
+    )
+    __slots__ = _slots(_fields, {})
+
+
+class OrderCost(Record):
+    """The cost of an order, in the currency of the seller or of the
+    buyer."""
+
+    _fields = (
+        "currency_code",
+        "subtotal",
+        "grand_total",
+        "salesTax_collected_by_BL",
+        "final_total",
+        "etc1",
+        "etc2",
+        "insurance",
+        "shipping",
+        "credit",
+        "coupon",
+        "vat_rate",
+        "vat_amount",
+    )
+    __slots__ = _slots(_fields, {})
+
+
+class OrderSummary(Record):
+    """An order, as listed by get_orders or detailed by get_order."""
+
+    _fields = (
+        "order_id",
+        "date_ordered",
+        "date_status_changed",
+        "seller_name",
+        "store_name",
+        "buyer_name",
+        "buyer_email",
+        "buyer_order_count",
+        "require_insurance",
+        "status",
+        "is_invoiced",
+        "is_filed",
+        "drive_thru_sent",
+        "salesTax_collected_by_bl",
+        "vat_collected_by_bl",
+        "remarks",
+        "total_count",
+        "unique_count",
+        "total_weight",
+        "payment",
+        "shipping",
+        "cost",
+        "disp_cost",
+    )
+    _interned = ("date_ordered", "date_status_changed", "seller_name", "store_name")
+    _nested = {
+        "payment": OrderPayment,
+        "shipping": OrderShipping,
+        "cost": OrderCost,
+        "disp_cost": OrderCost,
+    }
+    __slots__ = _slots(_fields, _nested)
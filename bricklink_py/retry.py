@@ -0,0 +1,146 @@
+import asyncio
+import random
+import threading
+import time
+
+import requests
+
+from .utils import BricklinkError, QuotaExceededError, parse_retry_after
+
+
+class RetryPolicy:
+    """Retry policy with exponential backoff, jitter and Retry-After support.
+
+    BaseResource._request runs every call through call(). Only failures of
+    idempotent methods are retried by default: PUT bodies may hold relative
+    "+quantity" changes, so replaying them is not safe.
+
+    Counters of the retried calls are kept in stats, and the exception raised
+    once the policy gives up carries the number of attempts made in its
+    attempts attribute.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 30.0,
+        jitter: float = 1.0,
+        retry_on: tuple = (requests.ConnectionError, requests.Timeout),
+        retry_statuses: tuple = (429, 500, 502, 503, 504),
+        retry_methods: tuple = ("get",),
+        respect_retry_after: bool = True,
+        sleep=time.sleep,
+    ):
+        """
+        Arguments:
+            max_attempts: Total number of attempts, including the first one.
+            backoff_factor: Delay in seconds before the first retry.
+            backoff_base: Growth of the delay between retries, 1 gives a
+                constant delay.
+            backoff_max: Upper bound of the backoff delay in seconds.
+            jitter: Fraction of the delay that is randomized, 1.0 picks the
+                delay uniformly between 0 and the backoff delay.
+            retry_on: Exception classes that are always retryable.
+            retry_statuses: Status codes of BricklinkError and HTTPError
+                exceptions that are retryable.
+            retry_methods: HTTP methods that can be retried.
+            respect_retry_after: Wait at least the Retry-After delay sent by
+                the server.
+            sleep: Sleep function, mainly for testing.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_on = tuple(retry_on)
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_methods = tuple(m.lower() for m in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "retried_calls": 0, "retries": 0, "gave_up": 0}
+
+    def is_retryable(self, method: str, exc: Exception) -> bool:
+        """Tell whether a failed call of the given method can be retried."""
+        if method.lower() not in self.retry_methods:
+            return False
+        # Waiting for the client side quota is the limiter's business
+        if isinstance(exc, QuotaExceededError):
+            return False
+        if isinstance(exc, BricklinkError):
+            return exc.status_code in self.retry_statuses
+        if isinstance(exc, requests.HTTPError) and exc.response is not None:
+            return exc.response.status_code in self.retry_statuses
+        return isinstance(exc, self.retry_on)
+
+    def get_delay(self, retry: int, exc: Exception = None) -> float:
+        """Return the seconds to wait before the given retry (starting at 1)."""
+        delay = min(
+            self.backoff_max, self.backoff_factor * self.backoff_base ** (retry - 1)
+        )
+        delay -= delay * self.jitter * random.random()
+
+        if self.respect_retry_after and exc is not None:
+            retry_after = getattr(exc, "retry_after", None)
+            response = getattr(exc, "response", None)
+            if retry_after is None and response is not None:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        return delay
+
+    def call(self, func, method: str, *args, **kwargs):
+        """Call func(method, *args, **kwargs), retrying it on failure.
+
+        Raises:
+            The last exception raised by func once the policy gives up.
+        """
+        attempt = 1
+        while True:
+            try:
+                result = func(method, *args, **kwargs)
+            except Exception as exc:
+                if not self._should_retry(method, exc, attempt):
+                    raise
+                self._sleep(self.get_delay(attempt, exc))
+                attempt += 1
+            else:
+                self._record(attempt, gave_up=False)
+                return result
+
+    async def call_async(self, func, method: str, *args, **kwargs):
+        """Coroutine version of call(), func must be a coroutine function."""
+        attempt = 1
+        while True:
+            try:
+                result = await func(method, *args, **kwargs)
+            except Exception as exc:
+                if not self._should_retry(method, exc, attempt):
+                    raise
+                await asyncio.sleep(self.get_delay(attempt, exc))
+                attempt += 1
+            else:
+                self._record(attempt, gave_up=False)
+                return result
+
+    def _should_retry(self, method: str, exc: Exception, attempt: int) -> bool:
+        """Decide whether to retry, and record the outcome when giving up."""
+        retryable = self.is_retryable(method, exc)
+        if retryable and attempt < self.max_attempts:
+            return True
+        exc.attempts = attempt
+        self._record(attempt, gave_up=retryable)
+        return False
+
+    def _record(self, attempt: int, gave_up: bool):
+        with self._lock:
+            self.stats["calls"] += 1
+            if attempt > 1:
+                self.stats["retried_calls"] += 1
+                self.stats["retries"] += attempt - 1
+            if gave_up:
+                self.stats["gave_up"] += 1
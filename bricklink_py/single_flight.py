@@ -0,0 +1,72 @@
+import copy
+import threading
+
+
+class _Call:
+    """Request in flight, shared by the threads waiting for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce identical calls made at the same time by several threads.
+
+    The first thread asking for a key runs the call; threads asking for the
+    same key before it completes wait for it and get a copy of its result, or
+    the exception it raised. BaseResource._request uses it for GET requests.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.saved = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """Run func(*args, **kwargs), unless a call with the same key is
+        already running, in which case its outcome is shared.
+
+        Raises:
+            The exception raised by the shared call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.saved += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            # The waiters copy a snapshot taken before the leader's caller
+            # gets the result and may mutate it
+            if waiters and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.done.set()
+
+    def stats(self) -> dict:
+        """Return the number of calls made and of calls saved by sharing."""
+        return {"calls": self.calls, "saved": self.saved}
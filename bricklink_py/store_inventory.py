@@ -1,8 +1,64 @@
+from .bulk import BulkReport, run_per_lot
+from .inventory_index import InventoryIndex
+from .records import InventoryLot
 from .utils import BaseResource
+from .write_behind import WriteBehindBuffer
 
 
 class StoreInventory(BaseResource):
 
+    # Index kept consistent with the writes, see attach_index
+    _index = None
+    # Buffer of the updates, see attach_write_behind
+    _write_behind = None
+
+    def attach_index(self, index: InventoryIndex) -> InventoryIndex:
+        """Keep an inventory index consistent with the lots created, updated
+        and deleted through this resource. Lots created by
+        create_store_inventories are only indexed when the response contains
+        them; reload the index after such bulk creations otherwise.
+
+        Arguments:
+            index -- The index to maintain, or None to detach the current one.
+
+        Returns:
+            InventoryIndex: The index.
+        """
+        self._index = index
+        return index
+
+    def attach_write_behind(self, buffer: WriteBehindBuffer) -> WriteBehindBuffer:
+        """Buffer the calls to update_store_inventory in a write-behind
+        buffer, merging the updates of a same lot before sending them.
+
+        update_store_inventories and delete_store_inventory still send
+        immediately: flush the buffer before them when they touch lots with
+        pending updates.
+
+        Arguments:
+            buffer -- The buffer, or None to detach the current one, which
+            is not flushed.
+
+        Returns:
+            WriteBehindBuffer: The buffer.
+        """
+        if buffer is not None:
+            buffer.attach(self)
+        self._write_behind = buffer
+        return buffer
+
+    def _indexed(self, result, method: str, inventory_id: int = None):
+        """Apply the result of a write to the attached index, if any"""
+        index = self._index
+        if index is None:
+            return result
+
+        def apply(result):
+            index.apply(method, inventory_id, result)
+            return result
+
+        return self._then(result, apply)
+
     def get_store_inventories(
         self,
         item_type: str = None,
@@ -74,7 +130,33 @@ class StoreInventory(BaseResource):
             "color_id": color_id,
         }
         uri = "inventories"
-        return self._request("get", uri, params)
+        return self._request("get", uri, params, record=InventoryLot)
+
+    def iter_store_inventories(
+        self,
+        item_type: str = None,
+        status: str = None,
+        category_id: int = None,
+        color_id: int = None,
+    ):
+        """Iterates over the inventories you have, parsing them one at a time
+        while the response is downloaded, so memory stays flat even for
+        stores with hundreds of thousands of lots.
+
+        The filters are the ones of get_store_inventories. The response is
+        not cached nor retried.
+
+        Returns:
+            Iterator of the store inventory resources.
+        """
+        params = {
+            "item_type": item_type,
+            "status": status,
+            "category_id": category_id,
+            "color_id": color_id,
+        }
+        uri = "inventories"
+        return self._stream("get", uri, params, record=InventoryLot)
 
     def get_store_inventory(self, inventory_id: int):
         """Retrieves information about a specific inventory.
@@ -86,7 +168,7 @@ class StoreInventory(BaseResource):
             requests.Response: The response object returned from the request.
         """
         uri = f"inventories/{inventory_id}"
-        return self._request("get", uri)
+        return self._request("get", uri, record=InventoryLot)
 
     def create_store_inventory(self, body: dict):
         """Creates a new inventory with an item.
@@ -108,12 +190,16 @@ class StoreInventory(BaseResource):
             requests.Response: The response object returned from the request.
         """
         uri = "inventories"
-        return self._request("post", uri, body=body)
+        result = self._request("post", uri, body=body, record=InventoryLot)
+        return self._indexed(result, "post")
 
     def create_store_inventories(self, body: dict):
         """Creates multiple inventories in a single request. Note that you can
         create an inventory only with items in the BL Catalog.
 
+        To upload thousands of lots, bricklink_py.bulk.BulkUploader splits
+        them into chunks sent concurrently and reports failures per lot.
+
         Arguments:
             body -- Supply a store inventory resource. The store inventory
             resource should include:
@@ -131,7 +217,8 @@ class StoreInventory(BaseResource):
             requests.Response: The response object returned from the request.
         """
         uri = "inventories"
-        return self._request("post", uri, body=body)
+        result = self._request("post", uri, body=body)
+        return self._indexed(result, "post")
 
     def update_store_inventory(self, inventory_id: int, body: dict):
         """Updates properties of the specified inventory.
@@ -151,10 +238,19 @@ class StoreInventory(BaseResource):
                 Note that to set tier price options, all 6 values must be entered
 
         Returns:
-            requests.Response: The response object returned from the request.
+            requests.Response: The response object returned from the request,
+            or None when the update is buffered, see attach_write_behind.
         """
+        if self._write_behind is not None:
+            self._write_behind.add(inventory_id, body)
+            return None
+        return self._update(inventory_id, body)
+
+    def _update(self, inventory_id: int, body: dict):
+        """Send an update, bypassing the write-behind buffer"""
         uri = f"inventories/{inventory_id}"
-        return self._request("put", uri, body=body)
+        result = self._request("put", uri, body=body, record=InventoryLot)
+        return self._indexed(result, "put", inventory_id)
 
     def delete_store_inventory(self, inventory_id: int):
         """Deletes the specified inventory.
@@ -166,4 +262,76 @@ class StoreInventory(BaseResource):
             requests.Response: The response object returned from the request.
         """
         uri = f"inventories/{inventory_id}"
-        return self._request("delete", uri)
+        result = self._request("delete", uri)
+        return self._indexed(result, "delete", inventory_id)
+
+    def update_store_inventories(
+        self, changes, max_workers: int = 16, retry_policy=None
+    ) -> BulkReport:
+        """Updates many inventories concurrently.
+
+        The concurrency adapts to the server: it grows while calls succeed
+        and is halved whenever one is rate limited or the server is
+        unavailable. The rate limiter of the client applies to every call.
+
+        The changes of a same inventory are sent one after the other, in the
+        given order. Once one fails, the next ones of that inventory are not
+        sent and report the same error.
+
+        Arguments:
+            changes -- {inventory_id: body} or (inventory_id, body) pairs, see
+            update_store_inventory for the body.
+
+        Keyword Arguments:
+            max_workers -- Highest number of concurrent calls. (default: {16})
+            retry_policy -- Policy retrying the failed calls. (default: {only
+            retrying rate limited and unavailable calls})
+
+        Returns:
+            BulkReport: One LotResult per change, in the given order, holding
+            the updated inventory or the error.
+        """
+        return run_per_lot(self._update_calls(changes), max_workers, retry_policy)
+
+    def delete_store_inventories(
+        self, inventory_ids, max_workers: int = 16, retry_policy=None
+    ) -> BulkReport:
+        """Deletes many inventories concurrently, with the adaptive
+        concurrency of update_store_inventories. Repeated IDs are deleted
+        once.
+
+        Arguments:
+            inventory_ids -- The IDs of the inventories to delete.
+
+        Keyword Arguments:
+            max_workers -- Highest number of concurrent calls. (default: {16})
+            retry_policy -- Policy retrying the failed calls. (default: {only
+            retrying rate limited and unavailable calls})
+
+        Returns:
+            BulkReport: One LotResult per inventory, in the given order.
+        """
+        calls = self._delete_calls(inventory_ids)
+        return run_per_lot(calls, max_workers, retry_policy)
+
+    def _update_calls(self, changes) -> list:
+        """Calls of update_store_inventories, see bulk.run_per_lot"""
+        if isinstance(changes, dict):
+            changes = changes.items()
+        return [
+            (
+                inventory_id,
+                "put",
+                self._update,
+                (inventory_id, body),
+                body,
+            )
+            for inventory_id, body in changes
+        ]
+
+    def _delete_calls(self, inventory_ids) -> list:
+        """Calls of delete_store_inventories, see bulk.run_per_lot"""
+        return [
+            (inventory_id, "delete", self.delete_store_inventory, (inventory_id,), None)
+            for inventory_id in dict.fromkeys(inventory_ids)
+        ]
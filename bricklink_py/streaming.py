@@ -0,0 +1,153 @@
+import codecs
+import json
+from typing import Any, Callable, List
+
+_WHITESPACE = " \t\n\r"
+
+# Characters continuing a number
+_NUMBER_CHARS = "0123456789.eE+-"
+
+# Parser states
+_START, _KEY, _COLON, _VALUE, _ARRAY, _END = range(6)
+
+
+class JSONArrayStream:
+    """Incremental parser of a JSON object body, yielding the elements of
+    one of its arrays as soon as they are downloaded.
+
+    The body is fed by chunks of bytes. Only the element being downloaded is
+    buffered, so memory stays flat whatever the length of the array. The
+    other members of the object (e.g. "meta") are decoded whole and passed to
+    on_value.
+
+    Usage:
+        parser = JSONArrayStream("data")
+        for chunk in response.iter_content(65536):
+            for record in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self, key: str = "data", on_value: Callable = None):
+        """
+        Arguments:
+            key: Member of the object whose elements are streamed.
+            on_value: Called with the name and value of the other members.
+        """
+        self.key = key
+        self.on_value = on_value
+        self.values = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _START
+        self._current_key = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parse a chunk of the body and return the array elements it
+        completed.
+
+        Raises:
+            ValueError: When the body is not a JSON object.
+        """
+        self._buffer += self._text.decode(chunk)
+        return self._parse(eof=False)
+
+    def close(self) -> List[Any]:
+        """Parse the end of the body and return the last array elements.
+
+        Raises:
+            ValueError: When the body is truncated or not a JSON object.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        records = self._parse(eof=True)
+        if self._state != _END:
+            raise ValueError("Truncated JSON body")
+        return records
+
+    def _decode(self, pos: int, eof: bool):
+        """Decode the value at pos, or return None when it is incomplete."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            return None
+        # A number may go on in the next chunk: "1" of "12", or "1" of "1.5"
+        # and "1e3" when the chunk ends after "1." or "1e"
+        if (
+            not eof
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and (end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS)
+        ):
+            return None
+        return value, end
+
+    def _parse(self, eof: bool) -> List[Any]:
+        records = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer) or self._state == _END:
+                break
+            char = buffer[pos]
+
+            if self._state == _ARRAY:
+                if char == ",":
+                    pos += 1
+                elif char == "]":
+                    pos += 1
+                    self._state = _KEY
+                else:
+                    decoded = self._decode(pos, eof)
+                    if decoded is None:
+                        break
+                    value, pos = decoded
+                    records.append(value)
+            elif self._state == _START:
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                pos += 1
+                self._state = _KEY
+            elif self._state == _KEY:
+                if char == ",":
+                    pos += 1
+                elif char == "}":
+                    pos += 1
+                    self._state = _END
+                elif char == '"':
+                    decoded = self._decode(pos, eof)
+                    if decoded is None:
+                        break
+                    self._current_key, pos = decoded
+                    self._state = _COLON
+                else:
+                    raise ValueError(f"Unexpected {char!r} in JSON object")
+            elif self._state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Unexpected {char!r} in JSON object")
+                pos += 1
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if self._current_key == self.key and char == "[":
+                    pos += 1
+                    self._state = _ARRAY
+                    continue
+                decoded = self._decode(pos, eof)
+                if decoded is None:
+                    break
+                value, pos = decoded
+                self._state = _KEY
+                if self._current_key == self.key:
+                    # Not an array, e.g. a single record
+                    records.append(value)
+                else:
+                    self.values[self._current_key] = value
+                    if self.on_value is not None:
+                        self.on_value(self._current_key, value)
+
+        self._buffer = buffer[pos:]
+        return records
@@ -0,0 +1,1029 @@
+"""Local stand-in for the BrickLink store API, for offline tests and benchmarks.
+
+The server answers the /api/store/v1/ endpoints called by the resources with
+synthetic data generated at the requested scale. It can inject latency and
+answer a fraction of the requests with 429 or 5xx errors.
+
+Usage:
+    with StubServer(data=StubData(lots=50000), latency=0.01) as server:
+        client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url)
+        lots = client.store_inventory.get_store_inventories()
+
+Or from the command line:
+    python -m bricklink_py.stub_server --port 8080 --lots 50000
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from oauthlib.oauth1 import Client
+from oauthlib.oauth1.rfc5849.utils import parse_authorization_header
+
+API_PATH = "/api/store/v1/"
+
+COUNTRIES = ("US", "DE", "FR", "GB", "ES", "NL", "CA", "JP", "AU", "IT")
+ORDER_STATUSES = (
+    "PENDING",
+    "UPDATED",
+    "PROCESSING",
+    "READY",
+    "PAID",
+    "PACKED",
+    "SHIPPED",
+    "RECEIVED",
+    "COMPLETED",
+)
+INVENTORY_STATUSES = ("Y", "S", "B", "C", "N", "R")
+
+
+class StubError(Exception):
+    """Error answered to the client with the given meta code."""
+
+    def __init__(self, code: int, message: str, description: str = ""):
+        self.code = code
+        self.message = message
+        self.description = description or message
+        super().__init__(message)
+
+
+def _price(value: float) -> str:
+    """Format a price like the API does."""
+    return f"{value:.4f}"
+
+
+def _seeded(*key) -> random.Random:
+    """Return a random generator seeded by a stable hash of the key."""
+    return random.Random(zlib.crc32(repr(key).encode()))
+
+
+def _matches(value, spec: str) -> bool:
+    """Tell whether a value passes an include/exclude filter such as
+    "PART,SET" or "-N,-R"."""
+    if spec is None:
+        return True
+    values = [v.strip() for v in spec.split(",") if v.strip()]
+    includes = [v for v in values if not v.startswith("-")]
+    excludes = [v[1:] for v in values if v.startswith("-")]
+    value = str(value)
+    if value in excludes:
+        return False
+    return not includes or value in includes
+
+
+class StubData:
+    """Synthetic, deterministic catalog and store data."""
+
+    def __init__(
+        self,
+        parts: int = 500,
+        minifigs: int = 50,
+        sets: int = 50,
+        lots: int = 1000,
+        orders: int = 100,
+        colors: int = 60,
+        categories: int = 40,
+        seed: int = 0,
+    ):
+        """
+        Arguments:
+            parts: Number of PART items in the catalog.
+            minifigs: Number of MINIFIG items in the catalog.
+            sets: Number of SET items in the catalog.
+            lots: Number of lots in the store inventory.
+            orders: Number of orders received.
+            colors: Number of colors.
+            categories: Number of categories.
+            seed: Seed of the random generator.
+        """
+        rng = random.Random(seed)
+        self.lock = threading.RLock()
+
+        self.colors = {
+            color_id: {
+                "color_id": color_id,
+                "color_name": f"Color {color_id}",
+                "color_code": f"{rng.randrange(0x1000000):06X}",
+                "color_type": rng.choice(("Solid", "Transparent", "Metallic")),
+            }
+            for color_id in range(1, colors + 1)
+        }
+        self.categories = {
+            category_id: {
+                "category_id": category_id,
+                "category_name": f"Category {category_id}",
+                "parent_id": 0,
+            }
+            for category_id in range(1, categories + 1)
+        }
+
+        self.items = {}
+        for type, count, prefix in (
+            ("PART", parts, ""),
+            ("MINIFIG", minifigs, "fig"),
+            ("SET", sets, ""),
+        ):
+            for i in range(count):
+                no = f"{prefix}{3001 + i}" if type != "SET" else f"{10000 + i}-1"
+                self.items[(type, no)] = {
+                    "no": no,
+                    "name": f"{type.title()} {no}",
+                    "type": type,
+                    "category_id": rng.randint(1, categories),
+                    "image_url": f"//img.bricklink.com/{type[0]}/{no}.jpg",
+                    "thumbnail_url": f"//img.bricklink.com/{type[0]}/{no}.t1.jpg",
+                    "weight": _price(rng.uniform(0.1, 500))[:-2],
+                    "dim_x": "0.00",
+                    "dim_y": "0.00",
+                    "dim_z": "0.00",
+                    "year_released": rng.randint(1980, 2025),
+                    "description": "",
+                    "is_obsolete": False,
+                }
+        self.part_nos = [no for type, no in self.items if type == "PART"]
+        self.minifig_nos = [no for type, no in self.items if type == "MINIFIG"]
+        self.set_nos = [no for type, no in self.items if type == "SET"]
+
+        self.subsets = {}
+        for no in self.minifig_nos:
+            self.subsets[("MINIFIG", no)] = self._random_entries(rng, "PART", 3, 6)
+        for index, no in enumerate(self.set_nos):
+            entries = self._random_entries(rng, "PART", 10, 40)
+            entries += self._random_entries(rng, "MINIFIG", 0, 3)
+            # Sets may include smaller sets, always defined before them
+            if index and rng.random() < 0.3:
+                child = rng.choice(self.set_nos[:index])
+                entries.append(self._entry("SET", child, 0, 1))
+            self.subsets[("SET", no)] = entries
+
+        self.inventories = {}
+        self.next_inventory_id = 100000
+        for _ in range(lots):
+            no = rng.choice(self.part_nos)
+            self._add_lot(
+                {
+                    "item": {"no": no, "type": "PART"},
+                    "color_id": rng.randint(1, colors),
+                    "quantity": rng.randint(1, 500),
+                    "unit_price": _price(rng.uniform(0.01, 5)),
+                    "new_or_used": rng.choice("NU"),
+                    "status": rng.choice(INVENTORY_STATUSES),
+                    "remarks": f"BIN-{rng.randint(1, 200):03d}",
+                }
+            )
+
+        self.orders = {}
+        self.order_items = {}
+        sold_lots = list(self.inventories.values())
+        for i in range(orders):
+            order_id = 1000000 + i
+            batch = [
+                self._order_item(rng, rng.choice(sold_lots))
+                for _ in range(rng.randint(1, 10) if sold_lots else 0)
+            ]
+            subtotal = sum(float(i["unit_price_final"]) * i["quantity"] for i in batch)
+            self.orders[order_id] = {
+                "order_id": order_id,
+                "date_ordered": f"2024-{rng.randint(1, 12):02d}-01T10:00:00.000Z",
+                "date_status_changed": "2024-12-01T10:00:00.000Z",
+                "seller_name": "StubStore",
+                "store_name": "Stub Store",
+                "buyer_name": f"buyer{rng.randint(1, 500)}",
+                "buyer_email": "buyer@example.com",
+                "require_insurance": False,
+                "status": rng.choice(ORDER_STATUSES),
+                "is_invoiced": False,
+                "is_filed": rng.random() < 0.2,
+                "remarks": "",
+                "total_count": sum(i["quantity"] for i in batch),
+                "unique_count": len(batch),
+                "payment": {"method": "PayPal", "currency_code": "USD", "status": ""},
+                "shipping": {"method_id": 1, "method": "Standard"},
+                "cost": {
+                    "currency_code": "USD",
+                    "subtotal": _price(subtotal),
+                    "grand_total": _price(subtotal + 5),
+                    "shipping": _price(5),
+                },
+            }
+            self.order_items[order_id] = [batch]
+
+        self.feedback = {
+            i: {
+                "feedback_id": i,
+                "order_id": 1000000 + i,
+                "from": f"buyer{i}",
+                "to": "StubStore",
+                "date_rated": "2024-12-01T10:00:00.000Z",
+                "rating": rng.choice((0, 0, 0, 1, 2)),
+                "rating_of_bs": "S",
+                "comment": "Great seller",
+            }
+            for i in range(1, min(orders, 100) + 1)
+        }
+        self.coupons = {}
+        self.next_coupon_id = 1
+        self.notes = {}
+        self.shipping_methods = {
+            method_id: {
+                "method_id": method_id,
+                "name": name,
+                "note": "",
+                "insurance": False,
+                "is_default": method_id == 1,
+                "area": "International",
+                "is_available": True,
+            }
+            for method_id, name in ((1, "Standard"), (2, "Tracked"), (3, "Express"))
+        }
+        self.notifications = [
+            {"event_type": "Order", "resource_id": order_id, "timestamp": ""}
+            for order_id in list(self.orders)[:10]
+        ]
+
+    def _entry(self, type: str, no: str, color_id: int, quantity: int) -> dict:
+        item = self.items[(type, no)]
+        return {
+            "match_no": 0,
+            "entries": [
+                {
+                    "item": {
+                        "no": no,
+                        "name": item["name"],
+                        "type": type,
+                        "category_id": item["category_id"],
+                    },
+                    "color_id": color_id,
+                    "quantity": quantity,
+                    "extra_quantity": 0,
+                    "is_alternate": False,
+                    "is_counterpart": False,
+                }
+            ],
+        }
+
+    def _random_entries(self, rng, type: str, low: int, high: int) -> list:
+        nos = self.part_nos if type == "PART" else self.minifig_nos
+        entries = []
+        for no in rng.sample(nos, min(len(nos), rng.randint(low, high))):
+            color_id = rng.randint(1, len(self.colors)) if type == "PART" else 0
+            entries.append(self._entry(type, no, color_id, rng.randint(1, 8)))
+        return entries
+
+    def _order_item(self, rng, lot: dict) -> dict:
+        return {
+            "inventory_id": lot["inventory_id"],
+            "item": dict(lot["item"]),
+            "color_id": lot["color_id"],
+            "color_name": lot["color_name"],
+            "quantity": rng.randint(1, 20),
+            "new_or_used": lot["new_or_used"],
+            "completeness": "",
+            "unit_price": lot["unit_price"],
+            "unit_price_final": lot["unit_price"],
+            "disp_unit_price": lot["unit_price"],
+            "disp_unit_price_final": lot["unit_price"],
+            "currency_code": "USD",
+            "disp_currency_code": "USD",
+            "remarks": lot["remarks"],
+            "description": lot["description"],
+            "weight": "1.00",
+        }
+
+    def _add_lot(self, body: dict) -> dict:
+        """Validate and add a lot to the inventory."""
+        item = body.get("item") or {}
+        key = (str(item.get("type", "")).upper(), str(item.get("no", "")))
+        catalog_item = self.items.get(key)
+        if catalog_item is None:
+            raise StubError(400, "INVALID_PARAM", f"Unknown item {key[0]} {key[1]}")
+        if body.get("color_id") not in self.colors and key[0] == "PART":
+            raise StubError(400, "INVALID_PARAM", "Unknown color_id")
+        for field in ("quantity", "unit_price", "new_or_used"):
+            if field not in body:
+                raise StubError(400, "INVALID_PARAM", f"Missing {field}")
+
+        color_id = body.get("color_id", 0)
+        lot = {
+            "inventory_id": self.next_inventory_id,
+            "item": {
+                "no": catalog_item["no"],
+                "name": catalog_item["name"],
+                "type": catalog_item["type"],
+                "category_id": catalog_item["category_id"],
+            },
+            "color_id": color_id,
+            "color_name": self.colors.get(color_id, {}).get(
+                "color_name", "(Not Applicable)"
+            ),
+            "quantity": int(body["quantity"]),
+            "new_or_used": body["new_or_used"],
+            "completeness": body.get("completeness", ""),
+            "unit_price": _price(float(body["unit_price"])),
+            "bind_id": 0,
+            "description": body.get("description", ""),
+            "remarks": body.get("remarks", ""),
+            "bulk": body.get("bulk", 1),
+            "is_retain": body.get("is_retain", False),
+            "is_stock_room": body.get("is_stock_room", False),
+            "stock_room_id": body.get("stock_room_id", ""),
+            "date_created": "2024-12-01T10:00:00.000Z",
+            "my_cost": _price(float(body.get("my_cost", 0))),
+            "sale_rate": body.get("sale_rate", 0),
+            "tier_quantity1": body.get("tier_quantity1", 0),
+            "tier_price1": _price(float(body.get("tier_price1", 0))),
+            "tier_quantity2": body.get("tier_quantity2", 0),
+            "tier_price2": _price(float(body.get("tier_price2", 0))),
+            "tier_quantity3": body.get("tier_quantity3", 0),
+            "tier_price3": _price(float(body.get("tier_price3", 0))),
+            "status": body.get("status", "Y"),
+        }
+        self.inventories[lot["inventory_id"]] = lot
+        self.next_inventory_id += 1
+        return lot
+
+    def price_guide(self, type: str, no: str, query: dict) -> dict:
+        """Generate the price guide of an item, stable for its parameters."""
+        color_id = query.get("color_id", "0")
+        guide_type = query.get("guide_type", "stock")
+        new_or_used = query.get("new_or_used", "N")
+        rng = _seeded(type, no, color_id, guide_type, new_or_used)
+
+        base = rng.uniform(0.02, 2) * (20 if type == "SET" else 1)
+        details = []
+        for _ in range(rng.randint(0, 30)):
+            entry = {
+                "quantity": rng.randint(1, 200),
+                "unit_price": _price(base * rng.uniform(0.5, 1.8)),
+            }
+            if guide_type == "sold":
+                entry["seller_country_code"] = rng.choice(COUNTRIES)
+                entry["buyer_country_code"] = rng.choice(COUNTRIES)
+                entry["date_ordered"] = "2024-11-15T10:00:00.000Z"
+            else:
+                entry["shipping_available"] = rng.random() < 0.9
+            details.append(entry)
+
+        prices = [float(d["unit_price"]) for d in details]
+        quantities = [d["quantity"] for d in details]
+        total_quantity = sum(quantities)
+        qty_avg = (
+            sum(p * q for p, q in zip(prices, quantities)) / total_quantity
+            if total_quantity
+            else 0
+        )
+        return {
+            "item": {"no": no, "type": type},
+            "new_or_used": new_or_used,
+            "currency_code": query.get("currency_code") or "USD",
+            "min_price": _price(min(prices, default=0)),
+            "max_price": _price(max(prices, default=0)),
+            "avg_price": _price(sum(prices) / len(prices) if prices else 0),
+            "qty_avg_price": _price(qty_avg),
+            "unit_quantity": len(details),
+            "total_quantity": total_quantity,
+            "price_detail": details,
+        }
+
+    def break_down(self, type: str, no: str, query: dict) -> list:
+        """Return the subsets of an item, breaking down minifigs and sets as
+        requested."""
+        break_minifigs = query.get("break_minifigs", "False").lower() == "true"
+        break_subsets = query.get("break_subsets", "False").lower() == "true"
+
+        counts = {}
+
+        def walk(key, multiplier):
+            for group in self.subsets.get(key, []):
+                entry = group["entries"][0]
+                child = (entry["item"]["type"], entry["item"]["no"])
+                quantity = entry["quantity"] * multiplier
+                if (child[0] == "MINIFIG" and break_minifigs) or (
+                    child[0] == "SET" and break_subsets
+                ):
+                    walk(child, quantity)
+                    continue
+                index = (child, entry["color_id"])
+                counts[index] = counts.get(index, 0) + quantity
+
+        walk((type, no), 1)
+        return [
+            self._entry(child[0], child[1], color_id, quantity)
+            for (child, color_id), quantity in counts.items()
+        ]
+
+
+class StubServer:
+    """Threaded HTTP server emulating the BrickLink store API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        data: StubData = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        daily_limit: int = None,
+        credentials: tuple = None,
+        seed: int = None,
+        max_bulk_lots: int = None,
+    ):
+        """
+        Arguments:
+            host: Interface to listen on.
+            port: Port to listen on, 0 picks a free one.
+            data: Data served, a default StubData is generated if missing.
+            latency: Seconds added to every response.
+            latency_jitter: Maximum random seconds added to the latency.
+            error_rate: Fraction of the requests answered with a 503 error.
+            rate_limit_rate: Fraction of the requests answered with a 429
+                error.
+            retry_after: Retry-After header sent with the 429 errors.
+            daily_limit: Number of requests answered before every request
+                gets a 429 error.
+            credentials: (consumer_key, consumer_secret, token, token_secret)
+                used to verify the OAuth signatures. Without credentials, only
+                the presence of an OAuth header is checked.
+            seed: Seed of the random latency and error injection.
+            max_bulk_lots: Maximum number of lots created by one request,
+                larger bulk creations get a 413 error.
+        """
+        self.data = data or StubData()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.daily_limit = daily_limit
+        self.credentials = credentials
+        self.max_bulk_lots = max_bulk_lots
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._encoded = {}
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to give to the client."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        """Serve requests in the current thread."""
+        self._httpd.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def dispatch(self, method: str, path: str, query: dict, body) -> tuple:
+        """Answer a request.
+
+        Returns:
+            tuple: HTTP status, extra headers and encoded JSON body.
+        """
+        with self._lock:
+            self.request_count += 1
+            count = self.request_count
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+
+        if delay:
+            time.sleep(delay)
+
+        if self.daily_limit is not None and count > self.daily_limit:
+            return self._error(429, "TOO_MANY_REQUESTS", "Daily limit exceeded")
+        if roll < self.rate_limit_rate:
+            return self._error(429, "TOO_MANY_REQUESTS", "Rate limit exceeded")
+        if roll < self.rate_limit_rate + self.error_rate:
+            return self._error(503, "SERVICE_UNAVAILABLE", "Try again later")
+
+        route = f"{method} {path}"
+        if (
+            self.max_bulk_lots is not None
+            and route == "POST inventories"
+            and isinstance(body, list)
+            and len(body) > self.max_bulk_lots
+        ):
+            return self._error(
+                413, "PAYLOAD_TOO_LARGE", f"At most {self.max_bulk_lots} lots"
+            )
+
+        if method == "GET":
+            with self._lock:
+                cached = self._encoded.get((route, repr(sorted(query.items()))))
+            if cached is not None:
+                return 200, {}, cached
+
+        for pattern, handler in ROUTES:
+            match = pattern.fullmatch(route)
+            if match is None:
+                continue
+            try:
+                with self.data.lock:
+                    data = handler(self.data, query, body, *match.groups())
+            except StubError as exc:
+                return self._error(exc.code, exc.message, exc.description)
+            payload = _encode({"meta": _meta(200), "data": data})
+            if method == "GET":
+                with self._lock:
+                    self._encoded[(route, repr(sorted(query.items())))] = payload
+            else:
+                with self._lock:
+                    self._encoded.clear()
+            return 200, {}, payload
+
+        return self._error(404, "RESOURCE_NOT_FOUND", f"No route for {route}")
+
+    def _error(self, code: int, message: str, description: str) -> tuple:
+        headers = {"Retry-After": str(self.retry_after)} if code == 429 else {}
+        meta = {"code": code, "message": message, "description": description}
+        return code, headers, _encode({"meta": meta})
+
+    def check_oauth(self, method: str, url: str, authorization: str) -> bool:
+        """Tell whether the Authorization header of a request is valid."""
+        if not authorization or not authorization.startswith("OAuth "):
+            return False
+        params = dict(parse_authorization_header(authorization))
+        if "oauth_signature" not in params:
+            return False
+        if self.credentials is None:
+            return True
+
+        ck, cs, tk, tks = self.credentials
+        client = Client(
+            ck,
+            client_secret=cs,
+            resource_owner_key=tk,
+            resource_owner_secret=tks,
+            nonce=params.get("oauth_nonce"),
+            timestamp=params.get("oauth_timestamp"),
+        )
+        _, headers, _ = client.sign(url, http_method=method)
+        expected = dict(parse_authorization_header(headers["Authorization"]))
+        return (
+            params.get("oauth_consumer_key") == ck
+            and params.get("oauth_token") == tk
+            and expected["oauth_signature"] == params["oauth_signature"]
+        )
+
+
+def _meta(code: int) -> dict:
+    return {"code": code, "message": "OK", "description": "OK"}
+
+
+def _encode(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _make_handler(server: StubServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately: without TCP_NODELAY,
+        # small responses wait for the delayed ACK of the client (~40 ms)
+        disable_nagle_algorithm = True
+
+        def handle_any(self):
+            parts = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+
+            url = f"http://{self.headers.get('Host')}{self.path}"
+            if not server.check_oauth(
+                self.command, url, self.headers.get("Authorization")
+            ):
+                status, headers, payload = server._error(
+                    401, "INVALID_SIGNATURE", "Missing or invalid OAuth signature"
+                )
+            elif not parts.path.startswith(API_PATH):
+                status, headers, payload = server._error(
+                    404, "RESOURCE_NOT_FOUND", "Unknown API path"
+                )
+            else:
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                path = unquote(parts.path[len(API_PATH) :]).strip("/")
+                status, headers, payload = server.dispatch(
+                    self.command, path, query, body
+                )
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = handle_any
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+# Handlers, called with the data, the query, the JSON body and the groups of
+# their route pattern
+
+
+def _get(mapping: dict, key, name: str):
+    try:
+        return mapping[key]
+    except KeyError:
+        raise StubError(404, "RESOURCE_NOT_FOUND", f"{name} {key} not found")
+
+
+def _get_orders(data, query, body):
+    direction = query.get("direction", "in")
+    filed = query.get("filed", "False").lower() == "true"
+    if direction != "in":
+        return []
+    return [
+        order
+        for order in data.orders.values()
+        if _matches(order["status"], query.get("status")) and order["is_filed"] == filed
+    ]
+
+
+def _get_order(data, query, body, order_id):
+    return _get(data.orders, int(order_id), "Order")
+
+
+def _get_order_items(data, query, body, order_id):
+    return _get(data.order_items, int(order_id), "Order")
+
+
+def _get_order_messages(data, query, body, order_id):
+    _get(data.orders, int(order_id), "Order")
+    return []
+
+
+def _get_order_feedback(data, query, body, order_id):
+    return [f for f in data.feedback.values() if f["order_id"] == int(order_id)]
+
+
+def _update_order(data, query, body, order_id):
+    order = _get(data.orders, int(order_id), "Order")
+    for key, value in (body or {}).items():
+        if isinstance(value, dict):
+            order.setdefault(key, {}).update(value)
+        else:
+            order[key] = value
+    return order
+
+
+def _update_order_status(data, query, body, order_id):
+    order = _get(data.orders, int(order_id), "Order")
+    order["status"] = (body or {}).get("value", order["status"])
+    return {}
+
+
+def _update_payment_status(data, query, body, order_id):
+    order = _get(data.orders, int(order_id), "Order")
+    order["payment"]["status"] = (body or {}).get("value", "")
+    return {}
+
+
+def _send_drive_thru(data, query, body, order_id):
+    _get(data.orders, int(order_id), "Order")
+    return {}
+
+
+def _get_inventories(data, query, body):
+    return [
+        lot
+        for lot in data.inventories.values()
+        if _matches(lot["item"]["type"], query.get("item_type"))
+        and _matches(lot["status"], query.get("status"))
+        and _matches(lot["item"]["category_id"], query.get("category_id"))
+        and _matches(lot["color_id"], query.get("color_id"))
+    ]
+
+
+def _get_inventory(data, query, body, inventory_id):
+    return _get(data.inventories, int(inventory_id), "Inventory")
+
+
+def _create_inventories(data, query, body):
+    if isinstance(body, list):
+        # The whole request fails if any lot is invalid
+        for lot in body:
+            item = lot.get("item") or {}
+            key = (str(item.get("type", "")).upper(), str(item.get("no", "")))
+            if key not in data.items:
+                raise StubError(400, "INVALID_PARAM", f"Unknown item {key[0]} {key[1]}")
+        return [data._add_lot(lot) for lot in body]
+    return data._add_lot(body or {})
+
+
+def _update_inventory(data, query, body, inventory_id):
+    lot = _get(data.inventories, int(inventory_id), "Inventory")
+    for key, value in (body or {}).items():
+        if key == "quantity":
+            if isinstance(value, str) and value[:1] in "+-":
+                lot["quantity"] = max(0, lot["quantity"] + int(value))
+            else:
+                lot["quantity"] = int(value)
+        elif key in lot and key not in ("inventory_id", "item", "color_id"):
+            lot[key] = value
+    return lot
+
+
+def _delete_inventory(data, query, body, inventory_id):
+    _get(data.inventories, int(inventory_id), "Inventory")
+    del data.inventories[int(inventory_id)]
+    return {}
+
+
+def _get_item(data, query, body, type, no):
+    return _get(data.items, (type.upper(), no), "Item")
+
+
+def _get_item_image(data, query, body, type, no, color_id):
+    item = _get(data.items, (type.upper(), no), "Item")
+    return {
+        "type": item["type"],
+        "no": no,
+        "color_id": int(color_id),
+        "thumbnail_url": item["thumbnail_url"],
+    }
+
+
+def _get_supersets(data, query, body, type, no):
+    _get(data.items, (type.upper(), no), "Item")
+    entries = []
+    for (parent_type, parent_no), groups in data.subsets.items():
+        for group in groups:
+            entry = group["entries"][0]
+            if entry["item"]["type"] == type.upper() and entry["item"]["no"] == no:
+                entries.append(
+                    {
+                        "item": {"no": parent_no, "type": parent_type},
+                        "quantity": entry["quantity"],
+                        "appears_as": "R",
+                    }
+                )
+    return [{"color_id": int(query.get("color_id") or 0), "entries": entries}]
+
+
+def _get_subsets(data, query, body, type, no):
+    _get(data.items, (type.upper(), no), "Item")
+    return data.break_down(type.upper(), no, query)
+
+
+def _get_price_guide(data, query, body, type, no):
+    _get(data.items, (type.upper(), no), "Item")
+    return data.price_guide(type.upper(), no, query)
+
+
+def _get_known_colors(data, query, body, type, no):
+    _get(data.items, (type.upper(), no), "Item")
+    rng = _seeded(type, no)
+    colors = rng.sample(list(data.colors), min(5, len(data.colors)))
+    return [{"color_id": c, "quantity": rng.randint(1, 100)} for c in colors]
+
+
+def _get_feedback_list(data, query, body):
+    return list(data.feedback.values())
+
+
+def _get_feedback(data, query, body, feedback_id):
+    return _get(data.feedback, int(feedback_id), "Feedback")
+
+
+def _post_feedback(data, query, body):
+    feedback_id = max(data.feedback, default=0) + 1
+    data.feedback[feedback_id] = dict(body or {}, feedback_id=feedback_id)
+    return data.feedback[feedback_id]
+
+
+def _reply_feedback(data, query, body, feedback_id):
+    feedback = _get(data.feedback, int(feedback_id), "Feedback")
+    feedback["reply"] = (body or {}).get("reply", "")
+    return {}
+
+
+def _get_colors(data, query, body):
+    return list(data.colors.values())
+
+
+def _get_color(data, query, body, color_id):
+    return _get(data.colors, int(color_id), "Color")
+
+
+def _get_categories(data, query, body):
+    return list(data.categories.values())
+
+
+def _get_category(data, query, body, category_id):
+    return _get(data.categories, int(category_id), "Category")
+
+
+def _get_notifications(data, query, body):
+    return data.notifications
+
+
+def _get_coupons(data, query, body):
+    return [
+        c for c in data.coupons.values() if _matches(c["status"], query.get("status"))
+    ]
+
+
+def _get_coupon(data, query, body, coupon_id):
+    return _get(data.coupons, int(coupon_id), "Coupon")
+
+
+def _create_coupon(data, query, body):
+    coupon = dict(body or {}, coupon_id=data.next_coupon_id, status="O")
+    data.coupons[coupon["coupon_id"]] = coupon
+    data.next_coupon_id += 1
+    return coupon
+
+
+def _update_coupon(data, query, body, coupon_id):
+    coupon = _get(data.coupons, int(coupon_id), "Coupon")
+    coupon.update(body or {})
+    return coupon
+
+
+def _delete_coupon(data, query, body, coupon_id):
+    _get(data.coupons, int(coupon_id), "Coupon")
+    del data.coupons[int(coupon_id)]
+    return {}
+
+
+def _get_shipping_methods(data, query, body):
+    return list(data.shipping_methods.values())
+
+
+def _get_shipping_method(data, query, body, method_id):
+    return _get(data.shipping_methods, int(method_id), "Shipping method")
+
+
+def _get_member_rating(data, query, body, username):
+    return {
+        "user_name": username,
+        "rating": {"PRAISE": 10, "NEUTRAL": 0, "COMPLAINT": 0},
+    }
+
+
+def _get_member_note(data, query, body, username):
+    return _get(data.notes, username, "Note")
+
+
+def _set_member_note(data, query, body, username):
+    data.notes[username] = dict(body or {}, user_name=username)
+    return data.notes[username]
+
+
+def _delete_member_note(data, query, body, username):
+    _get(data.notes, username, "Note")
+    del data.notes[username]
+    return {}
+
+
+def _get_element_id(data, query, body, type, no):
+    _get(data.items, (type.upper(), no), "Item")
+    color_id = int(query.get("color_id") or 1)
+    element_id = str(zlib.crc32(f"{no}-{color_id}".encode()) % 10000000)
+    return [
+        {
+            "item": {"no": no, "type": type.upper()},
+            "color_id": color_id,
+            "element_id": element_id,
+        }
+    ]
+
+
+def _get_item_number(data, query, body, element_id):
+    rng = _seeded(element_id)
+    no = rng.choice(data.part_nos)
+    return [
+        {"item": {"no": no, "type": "PART"}, "color_id": 1, "element_id": element_id}
+    ]
+
+
+_SEGMENT = r"([^/]+)"
+
+ROUTES = [
+    (re.compile(route.replace("{}", _SEGMENT)), handler)
+    for route, handler in (
+        ("GET orders", _get_orders),
+        ("GET orders/{}", _get_order),
+        ("GET orders/{}/items", _get_order_items),
+        ("GET orders/{}/messages", _get_order_messages),
+        ("GET orders/{}/feedback", _get_order_feedback),
+        ("PUT orders/{}", _update_order),
+        ("PUT orders/{}/status", _update_order_status),
+        ("PUT orders/{}/payment_status", _update_payment_status),
+        ("POST orders/{}/drive_thru", _send_drive_thru),
+        ("GET inventories", _get_inventories),
+        ("POST inventories", _create_inventories),
+        ("GET inventories/{}", _get_inventory),
+        ("PUT inventories/{}", _update_inventory),
+        ("DELETE inventories/{}", _delete_inventory),
+        ("GET items/{}/{}", _get_item),
+        ("GET items/{}/{}/images/{}", _get_item_image),
+        ("GET items/{}/{}/supersets", _get_supersets),
+        ("GET items/{}/{}/subsets", _get_subsets),
+        ("GET items/{}/{}/price", _get_price_guide),
+        ("GET items/{}/{}/colors", _get_known_colors),
+        ("GET feedback", _get_feedback_list),
+        ("POST feedback", _post_feedback),
+        ("GET feedback/{}", _get_feedback),
+        ("POST feedback/{}/reply", _reply_feedback),
+        ("GET colors", _get_colors),
+        ("GET colors/{}", _get_color),
+        ("GET categories", _get_categories),
+        ("GET categories/{}", _get_category),
+        ("GET notifications", _get_notifications),
+        ("GET coupons", _get_coupons),
+        ("POST coupons", _create_coupon),
+        ("GET coupons/{}", _get_coupon),
+        ("PUT coupons/{}", _update_coupon),
+        ("DELETE coupons/{}", _delete_coupon),
+        ("GET settings/shipping_methods", _get_shipping_methods),
+        ("GET settings/shipping_methods/{}", _get_shipping_method),
+        ("GET members/{}/ratings", _get_member_rating),
+        ("GET members/{}/notes", _get_member_note),
+        ("POST members/{}/notes", _set_member_note),
+        ("PUT members/{}/notes", _set_member_note),
+        ("DELETE members/{}/notes", _delete_member_note),
+        ("GET item_mapping/{}/{}", _get_element_id),
+        ("GET item_mapping/{}", _get_item_number),
+    )
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--parts", type=int, default=500)
+    parser.add_argument("--sets", type=int, default=50)
+    parser.add_argument("--lots", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--daily-limit", type=int, default=None)
+    parser.add_argument("--max-bulk-lots", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = StubServer(
+        host=args.host,
+        port=args.port,
+        data=StubData(
+            parts=args.parts, sets=args.sets, lots=args.lots, orders=args.orders
+        ),
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        daily_limit=args.daily_limit,
+        max_bulk_lots=args.max_bulk_lots,
+    )
+    print(f"Serving the BrickLink API stub on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
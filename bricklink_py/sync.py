@@ -0,0 +1,357 @@
+"""Sync the store inventory to a desired state with as few API calls as
+possible.
+
+Usage:
+    sync = InventorySync(client)
+    plan = sync.plan(lots_from_our_database)
+    result = sync.apply(plan)
+
+The desired lots are shaped like the store inventory resources. They are
+matched to the current lots by inventory_id when they have one of the
+store, by item, color and condition otherwise. Then only the differences are written:
+
+- one create per desired lot with no current lot,
+- one update per lot with changed fields, sending only those fields and the
+  quantity as a "+N" or "-N" delta,
+- one delete per current lot with no desired lot (unless delete_missing is
+  False), or whose desired quantity is 0.
+
+Lots left unchanged cost no call at all.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable, List, Mapping, Tuple
+
+from .inventory_index import lot_key
+from .utils import QuotaExceededError
+
+# Fields sent when creating a lot
+CREATE_FIELDS = (
+    "color_id",
+    "quantity",
+    "unit_price",
+    "new_or_used",
+    "completeness",
+    "description",
+    "remarks",
+    "bulk",
+    "is_retain",
+    "is_stock_room",
+    "stock_room_id",
+    "my_cost",
+    "sale_rate",
+    "tier_quantity1",
+    "tier_price1",
+    "tier_quantity2",
+    "tier_price2",
+    "tier_quantity3",
+    "tier_price3",
+)
+
+# Fields update_store_inventory can change, besides the quantity
+UPDATE_FIELDS = (
+    "unit_price",
+    "description",
+    "remarks",
+    "bulk",
+    "is_retain",
+    "is_stock_room",
+    "stock_room_id",
+    "my_cost",
+    "sale_rate",
+)
+
+# The API only accepts the tier prices all together
+TIER_FIELDS = (
+    "tier_quantity1",
+    "tier_price1",
+    "tier_quantity2",
+    "tier_price2",
+    "tier_quantity3",
+    "tier_price3",
+)
+
+PRICE_FIELDS = frozenset(
+    ("unit_price", "my_cost", "tier_price1", "tier_price2", "tier_price3")
+)
+
+
+class SyncPlan:
+    """The API writes bringing the store inventory to the desired state.
+
+    Attributes:
+        creates: Bodies of the lots to create.
+        updates: (inventory_id, body) of the lots to update, the body only
+            holding the changed fields.
+        deletes: Inventory IDs of the lots to delete.
+        unchanged: Number of lots already in the desired state.
+    """
+
+    def __init__(
+        self,
+        creates: List[dict] = None,
+        updates: List[Tuple[int, dict]] = None,
+        deletes: List[int] = None,
+        unchanged: int = 0,
+    ):
+        self.creates = creates or []
+        self.updates = updates or []
+        self.deletes = deletes or []
+        self.unchanged = unchanged
+
+    def __len__(self):
+        """Number of API calls of the plan."""
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        return (
+            f"<SyncPlan creates={len(self.creates)} updates={len(self.updates)} "
+            f"deletes={len(self.deletes)} unchanged={self.unchanged}>"
+        )
+
+
+class SyncResult:
+    """Outcome of applying a SyncPlan.
+
+    Attributes:
+        created: Lots returned by the creations.
+        updated: Lots returned by the updates.
+        deleted: Inventory IDs of the deleted lots.
+        errors: (operation, body or inventory ID, exception) of the failed
+            calls, operation being "create", "update" or "delete".
+    """
+
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.deleted = []
+        self.errors = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every call succeeded."""
+        return not self.errors
+
+    def __repr__(self):
+        return (
+            f"<SyncResult created={len(self.created)} updated={len(self.updated)} "
+            f"deleted={len(self.deleted)} errors={len(self.errors)}>"
+        )
+
+
+def diff_inventory(
+    current: Iterable[Mapping],
+    desired: Iterable[Mapping],
+    delete_missing: bool = True,
+) -> SyncPlan:
+    """Compute the writes turning the current lots into the desired ones.
+
+    Arguments:
+        current -- The lots of the store, e.g. get_store_inventories() or an
+        InventoryIndex.
+        desired -- The lots the store should have.
+
+    Keyword Arguments:
+        delete_missing -- Delete the current lots missing from the desired
+        ones. (default: {True})
+
+    Returns:
+        SyncPlan: The creates, updates and deletes to send.
+    """
+    plan = SyncPlan()
+    by_id = {lot["inventory_id"]: lot for lot in current}
+    keys = {inventory_id: lot_key(lot) for inventory_id, lot in by_id.items()}
+    by_key = None
+    matched = set()
+
+    def match(lot):
+        nonlocal by_key
+        inventory_id = lot.get("inventory_id")
+        if inventory_id is not None and inventory_id not in matched:
+            found = by_id.get(inventory_id)
+            if found is not None:
+                return found
+        # Without a current lot of its inventory ID, e.g. a lot recreated by
+        # an earlier sync, match it like a lot without inventory ID
+        if by_key is None:
+            by_key = {}
+            for inventory_id, key in keys.items():
+                by_key.setdefault(key, []).append(by_id[inventory_id])
+        # Prefer the lot of the same remarks among those of the same item
+        candidates = [
+            c for c in by_key.get(lot_key(lot), ()) if c["inventory_id"] not in matched
+        ]
+        for candidate in candidates:
+            if candidate.get("remarks") == lot.get("remarks"):
+                return candidate
+        return candidates[0] if candidates else None
+
+    for lot in desired:
+        found = match(lot)
+        if found is not None:
+            matched.add(found["inventory_id"])
+        wanted = int(lot.get("quantity", 1)) > 0
+
+        if found is None:
+            if wanted:
+                plan.creates.append(create_body(lot))
+        elif not wanted:
+            plan.deletes.append(found["inventory_id"])
+        elif keys[found["inventory_id"]] != lot_key(lot):
+            # Item, color and condition cannot be updated
+            plan.deletes.append(found["inventory_id"])
+            plan.creates.append(create_body(lot))
+        else:
+            body = update_body(found, lot)
+            if body:
+                plan.updates.append((found["inventory_id"], body))
+            else:
+                plan.unchanged += 1
+
+    if delete_missing:
+        plan.deletes.extend(i for i in by_id if i not in matched)
+    return plan
+
+
+def create_body(lot: Mapping) -> dict:
+    """Return the body creating a lot, without its read-only fields."""
+    item = lot["item"]
+    body = {"item": {"no": item["no"], "type": item["type"]}}
+    for field in CREATE_FIELDS:
+        if field in lot:
+            body[field] = lot[field]
+    return body
+
+
+def update_body(current: Mapping, desired: Mapping) -> dict:
+    """Return the body updating the fields of a lot that differ from the
+    desired ones, with the quantity as a delta. Fields missing from desired
+    are left alone.
+    """
+    body = {}
+    if "quantity" in desired:
+        delta = int(desired["quantity"]) - int(current.get("quantity", 0))
+        if delta:
+            body["quantity"] = f"{delta:+d}"
+    for field in UPDATE_FIELDS:
+        if field in desired and not _same(field, current.get(field), desired[field]):
+            body[field] = desired[field]
+    for field in TIER_FIELDS:
+        if field in desired and not _same(field, current.get(field), desired[field]):
+            for tier in TIER_FIELDS:
+                body[tier] = desired.get(tier, current.get(tier))
+            break
+    return body
+
+
+def _same(field: str, current: Any, desired: Any) -> bool:
+    """Compare a field, prices by value since the API returns "1.2000"."""
+    if current == desired:
+        return True
+    if field in PRICE_FIELDS:
+        try:
+            return Decimal(str(current)) == Decimal(str(desired))
+        except InvalidOperation:
+            pass
+    return False
+
+
+class InventorySync:
+    """Sync the store inventory to a desired state, sending the writes of the
+    plan concurrently through a Batch of the client.
+
+    The writes go through the resources of the client, so its rate limiter,
+    retry policy and hooks apply, and an index attached to the
+    store_inventory resource is kept up to date. The updates bypass a
+    write-behind buffer attached to it: they are sent by apply.
+    """
+
+    def __init__(self, client, max_workers: int = None, delete_missing: bool = True):
+        """
+        Arguments:
+            client: Bricklink client.
+            max_workers: Number of concurrent calls, defaults to the
+                pool_maxsize of the client.
+            delete_missing: Delete the lots of the store missing from the
+                desired state.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.delete_missing = delete_missing
+
+    def plan(
+        self, desired: Iterable[Mapping], current: Iterable[Mapping] = None
+    ) -> SyncPlan:
+        """Diff the desired lots against the current ones, fetched with
+        get_store_inventories when not given, after flushing the pending
+        updates of a write-behind buffer."""
+        if current is None:
+            buffer = self.client.store_inventory._write_behind
+            if buffer is not None:
+                buffer.flush()
+            current = self.client.store_inventory.get_store_inventories()
+        return diff_inventory(current, desired, delete_missing=self.delete_missing)
+
+    def apply(self, plan: SyncPlan) -> SyncResult:
+        """Send the writes of a plan. A failed call does not stop the others,
+        its error is reported in the result.
+
+        Raises:
+            QuotaExceededError: When the rate limiter of the client has less
+            quota left than the plan needs. Nothing is sent then, rather than
+            leaving the store half synced.
+        """
+        limiter = self.client.rate_limiter
+        remaining = getattr(limiter, "remaining", None)
+        if remaining is not None and len(plan) > remaining:
+            raise QuotaExceededError(
+                429, f"The sync needs {len(plan)} calls, {remaining} are left"
+            )
+
+        resource = self.client.store_inventory
+        calls = (
+            [
+                ("create", resource.create_store_inventory, (body,), body)
+                for body in plan.creates
+            ]
+            + [
+                # Bypass a write-behind buffer: the updates are sent now
+                ("update", resource._update, (inventory_id, body), body)
+                for inventory_id, body in plan.updates
+            ]
+            + [
+                (
+                    "delete",
+                    resource.delete_store_inventory,
+                    (inventory_id,),
+                    inventory_id,
+                )
+                for inventory_id in plan.deletes
+            ]
+        )
+
+        result = SyncResult()
+        with self.client.batch(self.max_workers) as batch:
+            for _, func, args, _ in calls:
+                batch.submit(func, *args)
+            outcomes = batch.results(return_exceptions=True)
+
+        for (operation, _, args, target), outcome in zip(calls, outcomes):
+            if isinstance(outcome, Exception):
+                result.errors.append((operation, target, outcome))
+            elif operation == "create":
+                result.created.append(outcome)
+            elif operation == "update":
+                result.updated.append(outcome)
+            else:
+                result.deleted.append(args[0])
+        return result
+
+    def sync(
+        self, desired: Iterable[Mapping], current: Iterable[Mapping] = None
+    ) -> SyncResult:
+        """Plan and apply the sync to the desired lots."""
+        return self.apply(self.plan(desired, current))
@@ -0,0 +1,241 @@
+"""Columnar store inventory backed by NumPy arrays, for vectorized queries.
+
+Usage:
+    table = InventoryTable.from_lots(client.store_inventory.get_store_inventories())
+    cheap = table.filter(table["unit_price"] < 0.05, item_type="PART")
+    by_category = table.group_by("category_id").agg(
+        lots=("inventory_id", "count"), value=("stock_value", "sum")
+    )
+
+Requires the optional numpy dependency.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "InventoryTable requires numpy: pip install bricklink-py[numpy]"
+    ) from exc
+
+# Column name, dtype and how to read it from a lot
+COLUMNS = (
+    ("inventory_id", np.int64, lambda lot: lot["inventory_id"]),
+    ("item_no", np.str_, lambda lot: lot["item"]["no"]),
+    ("item_type", np.str_, lambda lot: lot["item"]["type"]),
+    ("category_id", np.int64, lambda lot: lot["item"].get("category_id", 0)),
+    ("color_id", np.int64, lambda lot: lot.get("color_id", 0)),
+    ("quantity", np.int64, lambda lot: lot.get("quantity", 0)),
+    ("unit_price", np.float64, lambda lot: lot.get("unit_price", 0)),
+    ("new_or_used", np.str_, lambda lot: lot.get("new_or_used", "")),
+    ("completeness", np.str_, lambda lot: lot.get("completeness", "")),
+    ("status", np.str_, lambda lot: lot.get("status", "")),
+    ("remarks", np.str_, lambda lot: lot.get("remarks", "")),
+    ("bulk", np.int64, lambda lot: lot.get("bulk", 1)),
+    ("my_cost", np.float64, lambda lot: lot.get("my_cost", 0)),
+    ("sale_rate", np.int64, lambda lot: lot.get("sale_rate", 0)),
+    ("is_stock_room", np.bool_, lambda lot: lot.get("is_stock_room", False)),
+    ("stock_room_id", np.str_, lambda lot: lot.get("stock_room_id", "")),
+)
+
+# Columns computed from the stored ones
+COMPUTED = {
+    "stock_value": lambda table: table["quantity"] * table["unit_price"],
+    "cost_value": lambda table: table["quantity"] * table["my_cost"],
+}
+
+AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+
+class InventoryTable:
+    """Store inventory lots stored column by column in NumPy arrays.
+
+    Tables are not modified in place: filter, sort, row selection and
+    with_column return new tables. Prices are float64, fine for reports
+    and repricing thresholds; round before sending them back to the API.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Arguments:
+            columns: Arrays of equal length by column name.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns must have the same length")
+        self._columns = dict(columns)
+
+    @classmethod
+    def from_lots(cls, lots: Iterable) -> "InventoryTable":
+        """Build a table from store inventory lots, as dicts or records.
+
+        Arguments:
+            lots: Lots, e.g. the result of get_store_inventories or the
+                iterator returned by iter_store_inventories.
+        """
+        values = {name: [] for name, _, _ in COLUMNS}
+        readers = [(values[name].append, read) for name, _, read in COLUMNS]
+        for lot in lots:
+            for append, read in readers:
+                append(read(lot))
+        return cls(
+            {name: np.array(values[name], dtype=dtype) for name, dtype, _ in COLUMNS}
+        )
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Names of the stored columns."""
+        return tuple(self._columns)
+
+    def __len__(self):
+        if not self._columns:
+            return 0
+        return len(next(iter(self._columns.values())))
+
+    def __repr__(self):
+        return f"<InventoryTable {len(self)} lots>"
+
+    def __getitem__(self, key):
+        """Return a column by name, or the table of the rows selected by a
+        boolean mask, an index array or a slice."""
+        if isinstance(key, str):
+            return self.column(key)
+        return InventoryTable(
+            {name: values[key] for name, values in self._columns.items()}
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a stored column, or a computed one (stock_value,
+        cost_value)."""
+        if name in self._columns:
+            return self._columns[name]
+        if name in COMPUTED:
+            return COMPUTED[name](self)
+        raise KeyError(name)
+
+    def with_column(self, name: str, values) -> "InventoryTable":
+        """Return a table with a column added or replaced."""
+        values = np.asarray(values)
+        if values.shape != (len(self),):
+            raise ValueError(f"Column {name} must have {len(self)} values")
+        return InventoryTable({**self._columns, name: values})
+
+    def mask(self, **conditions) -> np.ndarray:
+        """Return the boolean mask of the rows matching every condition.
+
+        Keyword Arguments:
+            column=value keeps the rows equal to value, column=[values] the
+            rows equal to any of the values.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in conditions.items():
+            column = self.column(name)
+            if isinstance(value, (list, tuple, set, frozenset, np.ndarray)):
+                mask &= np.isin(column, list(value))
+            else:
+                mask &= column == value
+        return mask
+
+    def filter(self, mask=None, **conditions) -> "InventoryTable":
+        """Return the rows selected by a boolean mask and matching the
+        conditions, see mask.
+
+        Usage:
+            table.filter(table["unit_price"] < 0.05, new_or_used="N")
+        """
+        selected = self.mask(**conditions)
+        if mask is not None:
+            selected &= np.asarray(mask, dtype=bool)
+        return self[selected]
+
+    def sort(self, *names: str, descending: bool = False) -> "InventoryTable":
+        """Return the table sorted by columns, the first one being the
+        primary key."""
+        order = np.lexsort([self.column(name) for name in reversed(names)])
+        if descending:
+            order = order[::-1]
+        return self[order]
+
+    def group_by(self, *keys: str) -> "GroupBy":
+        """Group the rows by the values of one or more columns."""
+        return GroupBy(self, keys)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the rows as dicts of Python values."""
+        names = list(self._columns)
+        for values in zip(*(self._columns[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+
+class GroupBy:
+    """Rows of a table grouped by key columns, see InventoryTable.group_by."""
+
+    def __init__(self, table: InventoryTable, keys: Tuple[str, ...]):
+        if not keys:
+            raise ValueError("Group by at least one column")
+        self.table = table
+        self.keys = keys
+
+        # Combine the codes of every key column into one group code
+        codes = np.zeros(len(table), dtype=np.int64)
+        for key in keys:
+            unique, inverse = np.unique(table.column(key), return_inverse=True)
+            codes = codes * len(unique) + inverse.reshape(-1)
+        groups, self._first, inverse = np.unique(
+            codes, return_index=True, return_inverse=True
+        )
+        self._inverse = inverse.reshape(-1)
+        self.ngroups = len(groups)
+
+    def agg(self, **aggregations: Tuple[str, str]) -> Dict[str, np.ndarray]:
+        """Aggregate columns by group.
+
+        Keyword Arguments:
+            name=(column, function), function being one of count, sum, mean,
+            min and max.
+
+        Returns:
+            dict: The key columns and the aggregated columns, one value per
+            group, groups being sorted by key.
+        """
+        result = {key: self.table.column(key)[self._first] for key in self.keys}
+        counts = np.bincount(self._inverse, minlength=self.ngroups)
+        order = None
+
+        for name, (column, function) in aggregations.items():
+            if function not in AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation: {function}")
+            if function == "count":
+                result[name] = counts
+                continue
+
+            values = self.table.column(column)
+            if function in ("sum", "mean"):
+                sums = np.bincount(
+                    self._inverse, weights=values, minlength=self.ngroups
+                )
+                if function == "mean":
+                    result[name] = sums / counts
+                elif np.issubdtype(values.dtype, np.integer):
+                    result[name] = sums.round().astype(np.int64)
+                else:
+                    result[name] = sums
+            else:
+                if order is None:
+                    order = np.argsort(self._inverse, kind="stable")
+                    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+                ufunc = np.minimum if function == "min" else np.maximum
+                if self.ngroups:
+                    result[name] = ufunc.reduceat(values[order], starts)
+                else:
+                    result[name] = values[:0]
+        return result
+
+    def sum(self, column: str) -> Dict[str, np.ndarray]:
+        """Sum a column by group."""
+        return self.agg(**{column: (column, "sum")})
+
+    def count(self) -> Dict[str, np.ndarray]:
+        """Count the rows of every group."""
+        return self.agg(count=(self.keys[0], "count"))
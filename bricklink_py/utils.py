@@ -1,17 +1,73 @@
-from typing import Any
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from time import perf_counter, time
+from typing import Any, Iterator
+from urllib.parse import urlencode
 
+from requests import Request
 from requests_oauthlib import OAuth1Session
 
+from .hooks import RequestInfo
+from .records import to_records
+from .streaming import JSONArrayStream
+
 API_BASE_URL = "https://api.bricklink.com/api/store/v1/"
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# URI templates of every endpoint called by the resources
+ENDPOINT_TEMPLATES = (
+    "orders",
+    "orders/{order_id}",
+    "orders/{order_id}/items",
+    "orders/{order_id}/messages",
+    "orders/{order_id}/feedback",
+    "orders/{order_id}/status",
+    "orders/{order_id}/payment_status",
+    "orders/{order_id}/drive_thru",
+    "inventories",
+    "inventories/{inventory_id}",
+    "items/{type}/{no}",
+    "items/{type}/{no}/images/{color_id}",
+    "items/{type}/{no}/supersets",
+    "items/{type}/{no}/subsets",
+    "items/{type}/{no}/price",
+    "items/{type}/{no}/colors",
+    "feedback",
+    "feedback/{feedback_id}",
+    "feedback/{feedback_id}/reply",
+    "colors",
+    "colors/{color_id}",
+    "categories",
+    "categories/{category_id}",
+    "notifications",
+    "coupons",
+    "coupons/{coupon_id}",
+    "settings/shipping_methods",
+    "settings/shipping_methods/{method_id}",
+    "members/{username}/ratings",
+    "members/{username}/notes",
+    "item_mapping/{type}/{no}",
+    "item_mapping/{element_id}",
+)
+
+_SPLIT_TEMPLATES = [(t, t.split("/")) for t in ENDPOINT_TEMPLATES]
+
 
 class BricklinkError(Exception):
     """Base exception for Bricklink API errors"""
 
-    def __init__(self, status_code: int, message: str, response_data: dict = None):
+    def __init__(
+        self,
+        status_code: int,
+        message: str,
+        response_data: dict = None,
+        retry_after: float = None,
+    ):
         self.status_code = status_code
         self.message = message
         self.response_data = response_data or {}
+        self.retry_after = retry_after
         super().__init__(f"Bricklink API Error ({status_code}): {message}")
 
 
@@ -27,6 +83,12 @@ class RateLimitError(BricklinkError):
     pass
 
 
+class QuotaExceededError(RateLimitError):
+    """Raised by the client side rate limiter when the daily quota is used up"""
+
+    pass
+
+
 class AuthenticationError(BricklinkError):
     """Raised for authentication issues"""
 
@@ -36,48 +98,273 @@ class AuthenticationError(BricklinkError):
 class BaseResource:
     """Base class for all Bricklink API resources with common utilities"""
 
-    def __init__(self, oauth_session: OAuth1Session):
-        """Initialize with OAuth session"""
+    def __init__(
+        self,
+        oauth_session: OAuth1Session,
+        rate_limiter=None,
+        retry_policy=None,
+        cache=None,
+        single_flight=None,
+        hooks=None,
+        base_url: str = None,
+        codec=None,
+        records: bool = False,
+    ):
+        """Initialize with OAuth session, and optional rate limiter, retry
+        policy, response cache, single flight group, hooks, API base URL,
+        JSON codec and whether to return record types instead of dicts"""
         self._oauth_session = oauth_session
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._cache = cache
+        self._single_flight = single_flight
+        self._hooks = hooks
+        self._records = records
+        # Only the options differing from the defaults are passed to request()
+        self._request_options = {}
+        if base_url:
+            self._request_options["base_url"] = base_url
+        if codec is not None:
+            self._request_options["codec"] = codec
 
     def _request(
-        self, method: str, uri: str, params: dict = None, body: dict = None
+        self,
+        method: str,
+        uri: str,
+        params: dict = None,
+        body: dict = None,
+        record: type = None,
     ) -> Any:
-        """Wrapper for the request function with error handling"""
+        """Wrapper for the request function with error handling. The data is
+        turned into the given record type when records are enabled."""
+        is_get = method.lower() == "get"
+        if self._cache is not None and is_get:
+            hit, result = self._cache.lookup(method, uri, params)
+            if hit:
+                if self._hooks:
+                    self._emit_shared("cache_hit", method, uri, params)
+                return self._as_records(result, record)
+
+        if self._single_flight is not None and is_get:
+            fetched = []
+
+            def fetch(*args):
+                fetched.append(True)
+                return self._fetch(*args)
+
+            key = request_key(method, uri, params)
+            result = self._single_flight.do(key, fetch, method, uri, params, body)
+            if self._hooks and not fetched:
+                self._emit_shared("coalesced", method, uri, params)
+        else:
+            result = self._fetch(method, uri, params, body)
+
+        if self._cache is not None:
+            self._update_cache(method, uri, params, result)
+        return self._as_records(result, record)
+
+    def _stream(
+        self, method: str, uri: str, params: dict = None, record: type = None
+    ) -> Iterator[Any]:
+        """Wrapper for the stream_request function. The rate limiter applies,
+        the cache, single flight, retry policy and hooks do not."""
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        stream = stream_request(
+            method,
+            self._oauth_session,
+            uri,
+            params,
+            base_url=self._request_options.get("base_url"),
+        )
+        if record is not None and self._records:
+            return map(record, stream)
+        return stream
+
+    def _as_records(self, result: Any, record: type) -> Any:
+        """Turn the data of a response into records, when enabled"""
+        if record is None or not self._records:
+            return result
+        return to_records(result, record)
+
+    def _then(self, result: Any, callback) -> Any:
+        """Return callback(result). Lets resource methods post-process the
+        result of _request the same way for the async resources, whose
+        _request returns a coroutine."""
+        return callback(result)
+
+    def _fetch(self, method: str, uri: str, params: dict = None, body: dict = None):
+        """Send a request, retrying it according to the retry policy"""
+        send = self._send
+        if self._hooks:
+            attempts = []
+
+            def send_once(*args):
+                attempts.append(True)
+                return self._send_instrumented(*args, attempt=len(attempts))
+
+            send = send_once
+
+        if self._retry_policy is not None:
+            return self._retry_policy.call(send, method, uri, params, body)
+        return send(method, uri, params, body)
+
+    def _send_instrumented(
+        self, method: str, uri: str, params: dict, body: dict, attempt: int
+    ):
+        """Send a single request, reporting it to the hooks"""
+        info = RequestInfo(method, uri, endpoint_template(uri), params)
+        info.attempt = attempt
+        self._hooks.emit("before_request", info)
+
+        start = perf_counter()
         try:
-            return request(method, self._oauth_session, uri, params, body)
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            info.rate_limit_wait = perf_counter() - start
+            result = request(
+                method,
+                self._oauth_session,
+                uri,
+                params,
+                body,
+                info,
+                **self._request_options,
+            )
+        except Exception as exc:
+            info.error = exc
+            info.total_time = perf_counter() - start
+            self._hooks.emit("on_error", info)
+            raise
+
+        info.total_time = perf_counter() - start
+        self._hooks.emit("after_response", info)
+        return result
+
+    def _emit_shared(self, flag: str, method: str, uri: str, params: dict):
+        """Report a call answered without a request of its own"""
+        info = RequestInfo(method, uri, endpoint_template(uri), params)
+        setattr(info, flag, True)
+        self._hooks.emit("after_response", info)
+
+    def _update_cache(self, method: str, uri: str, params: dict, result: Any):
+        """Cache the result of a GET, or invalidate the cached responses of
+        the resource modified by a write"""
+        if method.lower() == "get":
+            self._cache.store(method, uri, params, result)
+        else:
+            self._cache.invalidate(uri.split("/", 1)[0])
+
+    def _send(self, method: str, uri: str, params: dict = None, body: dict = None):
+        """Send a single request, once the rate limiter allows it"""
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+
+        try:
+            return request(
+                method,
+                self._oauth_session,
+                uri,
+                params,
+                body,
+                **self._request_options,
+            )
         except BricklinkError:
             raise
         except Exception:
             raise
 
 
-def handle_response(response):
+def request_key(method: str, uri: str, params: dict = None) -> str:
+    """Build a key identifying a request, ignoring None parameters and the
+    order of the parameters."""
+    items = sorted((k, v) for k, v in (params or {}).items() if v is not None)
+    query = urlencode(items, doseq=True)
+    return f"{method.upper()} {uri}?{query}" if query else f"{method.upper()} {uri}"
+
+
+@lru_cache(maxsize=1024)
+def endpoint_template(uri: str) -> str:
+    """Return the endpoint template of a URI, e.g. "items/{type}/{no}/price"
+    for "items/PART/3001/price". Unknown URIs are returned unchanged."""
+    segments = uri.split("?", 1)[0].strip("/").split("/")
+    best, best_literals = uri, -1
+    for template, parts in _SPLIT_TEMPLATES:
+        if len(parts) != len(segments):
+            continue
+        literals = 0
+        for part, segment in zip(parts, segments):
+            if part.startswith("{"):
+                continue
+            if part != segment:
+                break
+            literals += 1
+        else:
+            if literals > best_literals:
+                best, best_literals = template, literals
+    return best
+
+
+def parse_retry_after(value) -> float:
+    """Parse a Retry-After header, given in seconds or as an HTTP date.
+
+    Returns:
+        The number of seconds to wait, or None if the value is not valid.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+def raise_for_meta(response_data: dict, headers=None):
+    """Raise the exception matching the meta of an error response."""
+    if response_data["meta"]["code"] in (200, 201, 204):
+        return
+
+    error_code = response_data["meta"]["code"]
+    error_message = response_data["meta"].get("message", "Unknown error")
+
+    if error_code == 404:
+        raise ResourceNotFoundError(error_code, error_message, response_data)
+    elif error_code == 429:
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        raise RateLimitError(
+            error_code, "Rate limit exceeded", response_data, retry_after
+        )
+    elif error_code in (401, 403):
+        raise AuthenticationError(error_code, error_message, response_data)
+    else:
+        raise BricklinkError(error_code, error_message, response_data)
+
+
+def handle_response(response, codec=None):
     """Process API response and handle errors appropriately.
-    https://www.bricklink.com/v3/api.page?page=error-handling"""
+    https://www.bricklink.com/v3/api.page?page=error-handling
+
+    The body is decoded by response.json(), or by the given JSONCodec."""
 
     # Handle successful empty responses (204 NO CONTENT)
     if response.status_code == 204:
         return {}
 
     try:
-        response_data = response.json()
+        if codec is None:
+            response_data = response.json()
+        else:
+            response_data = codec.loads(response.content)
     except ValueError:
         response.raise_for_status()
         return response
 
-    if "meta" in response_data and response_data["meta"]["code"] not in (200, 201, 204):
-        error_code = response_data["meta"]["code"]
-        error_message = response_data["meta"].get("message", "Unknown error")
-
-        if error_code == 404:
-            raise ResourceNotFoundError(error_code, error_message, response_data)
-        elif error_code == 429:
-            raise RateLimitError(error_code, "Rate limit exceeded", response_data)
-        elif error_code in (401, 403):
-            raise AuthenticationError(error_code, error_message, response_data)
-        else:
-            raise BricklinkError(error_code, error_message, response_data)
+    if "meta" in response_data:
+        raise_for_meta(response_data, getattr(response, "headers", None))
 
     if "data" in response_data:
         return response_data["data"]
@@ -91,6 +378,9 @@ def request(
     uri: str,
     params: dict = None,
     body: dict = None,
+    metrics=None,
+    base_url: str = None,
+    codec=None,
 ) -> Any:
     """Send a request to the specified URI using the provided
     method and OAuth session.
@@ -103,6 +393,11 @@ def request(
     Keyword Arguments:
         params -- The parameters to include in the request. (default: {{}})
         body -- The body to include in the request data. (default: {{}})
+        metrics -- RequestInfo filled with the timings and sizes of the
+        request. (default: {None})
+        base_url -- Base URL of the API. (default: {API_BASE_URL})
+        codec -- JSONCodec decoding the response and encoding the body,
+        instead of requests. (default: {None})
 
     Raises:
         BricklinkError: For API-specific errors.
@@ -111,23 +406,130 @@ def request(
     Returns:
         requests.Response: The response object returned from the request.
     """
-    url = f"{API_BASE_URL}{uri}"
+    url = f"{base_url or API_BASE_URL}{uri}"
+
+    if metrics is not None:
+        return _measured_request(
+            method, oauth_session, url, params, body, metrics, codec
+        )
 
     try:
+        if codec is not None and body is not None:
+            # Send the body encoded by the codec, as requests would with json=
+            data = {"data": codec.dumps(body), "headers": JSON_HEADERS}
+        else:
+            data = {"json": body}
+
         if method.lower() == "get":
             response = oauth_session.get(url, params=params)
         elif method.lower() == "post":
-            response = oauth_session.post(url, params=params, json=body)
+            response = oauth_session.post(url, params=params, **data)
         elif method.lower() == "put":
-            response = oauth_session.put(url, params=params, json=body)
+            response = oauth_session.put(url, params=params, **data)
         elif method.lower() == "delete":
             response = oauth_session.delete(url, params=params)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
-        return handle_response(response)
+        return handle_response(response, codec)
 
     except BricklinkError:
         raise
     except Exception:
         raise
+
+
+def data_parser(headers=None) -> JSONArrayStream:
+    """Return a parser streaming the "data" list of a response, raising the
+    API error as soon as the meta of the response is parsed."""
+
+    def check_meta(key, value):
+        if key == "meta":
+            raise_for_meta({"meta": value}, headers)
+
+    return JSONArrayStream("data", check_meta)
+
+
+def stream_request(
+    method: str,
+    oauth_session: OAuth1Session,
+    uri: str,
+    params: dict = None,
+    base_url: str = None,
+    chunk_size: int = 65536,
+) -> Iterator[Any]:
+    """Send a GET request and yield the records of the "data" list of the
+    response while it is downloaded.
+
+    Arguments:
+        method -- The HTTP method to use for the request, only GET.
+        oauth_session -- The OAuth object used for authentication.
+        uri -- The URI to send the request to.
+
+    Keyword Arguments:
+        params -- The parameters to include in the request. (default: {{}})
+        base_url -- Base URL of the API. (default: {API_BASE_URL})
+        chunk_size -- Bytes read from the connection at once.
+        (default: {65536})
+
+    Raises:
+        BricklinkError: For API-specific errors.
+        requests.RequestException: For general request errors.
+    """
+    if method.lower() != "get":
+        raise ValueError(f"Unsupported HTTP method for streaming: {method}")
+
+    url = f"{base_url or API_BASE_URL}{uri}"
+    with oauth_session.get(url, params=params, stream=True) as response:
+        if response.status_code == 204:
+            return
+        parser = data_parser(response.headers)
+        try:
+            for chunk in response.iter_content(chunk_size):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        except ValueError:
+            response.raise_for_status()
+            raise
+
+
+def _measured_request(
+    method: str,
+    oauth_session: OAuth1Session,
+    url: str,
+    params: dict,
+    body: dict,
+    metrics,
+    codec=None,
+) -> Any:
+    """Send a request like request() does, splitting its steps to measure
+    them into metrics."""
+    if method.lower() not in ("get", "post", "put", "delete"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+    json = body if method.lower() in ("post", "put") else None
+
+    start = perf_counter()
+    if codec is not None and json is not None:
+        data = {"data": codec.dumps(json), "headers": JSON_HEADERS}
+    else:
+        data = {"json": json}
+    prepared = oauth_session.prepare_request(
+        Request(method.upper(), url, params=params, **data)
+    )
+    settings = oauth_session.merge_environment_settings(
+        prepared.url, {}, None, None, None
+    )
+    metrics.sign_time = perf_counter() - start
+    metrics.request_bytes = len(prepared.body or b"")
+
+    start = perf_counter()
+    response = oauth_session.send(prepared, **settings)
+    metrics.response_bytes = len(response.content)
+    metrics.network_time = perf_counter() - start
+    metrics.status_code = response.status_code
+
+    start = perf_counter()
+    try:
+        return handle_response(response, codec)
+    finally:
+        metrics.decode_time = perf_counter() - start
@@ -0,0 +1,327 @@
+"""Write-behind buffer coalescing the updates of store inventory lots.
+
+Usage:
+    buffer = client.store_inventory.attach_write_behind(
+        WriteBehindBuffer(max_pending=500, max_delay=5.0, journal="updates.log")
+    )
+    client.store_inventory.update_store_inventory(42, {"unit_price": "0.12"})
+    client.store_inventory.update_store_inventory(42, {"quantity": "-1"})
+    ...
+    buffer.close()  # flushes, e.g. at exit
+
+Once attached, update_store_inventory only records the update and returns
+None. Updates of a same lot are merged: "+N"/"-N" quantity deltas are summed
+and the other fields keep the last value written. The merged updates are
+sent concurrently, like update_store_inventories does, when max_pending lots
+are waiting, when the oldest one waited max_delay seconds, or on flush().
+
+Every update is appended to the journal before update_store_inventory
+returns, and a buffer opened on an existing journal resumes the updates that
+were not sent. Delivery is at least once: an update sent right before a
+crash, but not yet marked as sent in the journal, is sent again.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import List
+
+from .bulk import BulkReport, run_per_lot
+from .concurrency import is_congestion
+from .utils import QuotaExceededError
+
+
+def merge_updates(first: dict, second: dict) -> dict:
+    """Return the update equivalent to sending first, then second.
+
+    Quantity deltas ("+3", "-1") are summed, an absolute quantity overrides
+    what came before, other fields keep the value of second.
+    """
+    merged = {**first, **second}
+    if "quantity" in first and "quantity" in second:
+        second_delta = _delta(second["quantity"])
+        if second_delta is not None:
+            first_delta = _delta(first["quantity"])
+            if first_delta is None:
+                merged["quantity"] = int(first["quantity"]) + second_delta
+            elif first_delta + second_delta:
+                merged["quantity"] = f"{first_delta + second_delta:+d}"
+            else:
+                del merged["quantity"]
+    return merged
+
+
+def _delta(quantity):
+    """Return the delta of a "+N"/"-N" quantity, None for an absolute one."""
+    if isinstance(quantity, str) and quantity[:1] in ("+", "-"):
+        return int(quantity)
+    return None
+
+
+class Journal:
+    """Append-only JSON lines file recording the buffered updates, and the
+    updates sent, so pending ones can be replayed after a crash."""
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Arguments:
+            path: Path of the journal, created if missing.
+            fsync: Force every record to disk, so the updates also survive a
+                power loss, not only a crash of the process.
+        """
+        self.path = str(path)
+        self.fsync = fsync
+        self._file = open(self.path, "a+", encoding="utf-8")
+
+    def replay(self) -> List[tuple]:
+        """Return the (seq, inventory_id, body) of the updates not sent, in
+        the order they were made, and cut off a last record torn by a crash.
+        Call it before recording new updates."""
+        pending = {}
+        self._file.seek(0)
+        # The text after the last line end is a record cut short by a crash
+        records, _, torn = self._file.read().rpartition("\n")
+        end = 0  # Byte offset of the end of the last complete record
+        for line in records.split("\n") if records else ():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                torn = True
+                break
+            end += len(line.encode("utf-8")) + 1
+            inventory_id = record["id"]
+            if "body" in record:
+                pending.setdefault(inventory_id, []).append(
+                    (record["seq"], inventory_id, record["body"])
+                )
+            elif inventory_id in pending:
+                pending[inventory_id] = [
+                    entry for entry in pending[inventory_id] if entry[0] > record["seq"]
+                ]
+        if torn:
+            # Cut the torn record off, so the next ones start on a line
+            self._file.truncate(end)
+            self._sync()
+        return sorted(entry for entries in pending.values() for entry in entries)
+
+    def update(self, seq: int, inventory_id: int, body: dict):
+        """Record a buffered update."""
+        self._write({"seq": seq, "id": inventory_id, "body": body})
+
+    def sent(self, seq: int, inventory_id: int):
+        """Record that the updates of a lot up to seq were sent."""
+        self._write({"seq": seq, "id": inventory_id})
+
+    def truncate(self):
+        """Empty the journal, once no update is pending."""
+        self._file.seek(0)
+        self._file.truncate()
+        self._sync()
+
+    def close(self):
+        self._file.close()
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+
+class WriteBehindBuffer:
+    """Buffer merging the updates of store inventory lots before sending
+    them, see the module documentation.
+
+    The buffer is thread safe. Attach it with
+    StoreInventory.attach_write_behind.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 500,
+        max_delay: float = 5.0,
+        journal: str = None,
+        fsync: bool = True,
+        max_workers: int = 16,
+        clock=time.monotonic,
+    ):
+        """
+        Arguments:
+            max_pending: Number of pending lots triggering a flush.
+            max_delay: Seconds an update waits at most before a flush, None
+                to only flush on max_pending and flush().
+            journal: Path of the journal file, None keeps the pending updates
+                in memory only.
+            fsync: Force every journal record to disk.
+            max_workers: Highest number of concurrent updates of a flush.
+            clock: Monotonic clock, mainly for testing.
+        """
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        self.failed = []
+        self.updates = 0
+        self.sent = 0
+        self._clock = clock
+        self._resource = None
+        # inventory_id -> [merged body, time of the first update, last seq]
+        self._pending = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+        self._journal = Journal(journal, fsync) if journal else None
+        if self._journal is not None:
+            for seq, inventory_id, body in self._journal.replay():
+                self._merge(inventory_id, body, seq)
+                self._seq = max(self._seq, seq)
+
+    def __len__(self):
+        """Number of lots with pending updates."""
+        return len(self._pending)
+
+    def __repr__(self):
+        return f"<WriteBehindBuffer pending={len(self)} failed={len(self.failed)}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def pending(self) -> dict:
+        """Return the merged pending update of every lot."""
+        with self._lock:
+            return {key: dict(entry[0]) for key, entry in self._pending.items()}
+
+    def attach(self, resource):
+        """Send the updates through a StoreInventory resource, and start the
+        thread flushing them after max_delay."""
+        self._resource = resource
+        if self.max_delay is not None and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="bricklink-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def add(self, inventory_id: int, body: dict):
+        """Buffer an update, flushing when max_pending lots are waiting.
+
+        Raises:
+            RuntimeError: When the buffer is closed.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write-behind buffer is closed")
+            self._seq += 1
+            if self._journal is not None:
+                self._journal.update(self._seq, inventory_id, body)
+            self._merge(inventory_id, body, self._seq)
+            self.updates += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+
+    def flush(self) -> BulkReport:
+        """Send the pending updates, one merged update per lot.
+
+        Lots whose update was rate limited, met an unavailable server, or
+        was held back by the daily quota of the client are kept pending for
+        the next flush. Other failures are dropped, and
+        kept in failed.
+
+        Returns:
+            BulkReport: The report of update_store_inventories.
+        """
+        if self._resource is None:
+            raise RuntimeError("Attach the buffer with attach_write_behind first")
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return BulkReport([])
+
+            # Updates cancelling out, e.g. "+1" then "-1", need no call
+            changes = [(key, entry[0]) for key, entry in batch.items() if entry[0]]
+            report = run_per_lot(
+                self._resource._update_calls(changes), self.max_workers
+            )
+
+            with self._lock:
+                if self._journal is not None:
+                    for key, (body, _, seq) in batch.items():
+                        if not body:
+                            self._journal.sent(seq, key)
+                for result in report.results:
+                    body, first, seq = batch[result.inventory_id]
+                    if not result.ok and (
+                        is_congestion(result.error)
+                        # Refused by the client, never sent
+                        or isinstance(result.error, QuotaExceededError)
+                    ):
+                        self._requeue(result.inventory_id, body, first, seq)
+                        continue
+                    if self._journal is not None:
+                        self._journal.sent(seq, result.inventory_id)
+                    if result.ok:
+                        self.sent += 1
+                    else:
+                        self.failed.append(result)
+                if not self._pending and self._journal is not None:
+                    self._journal.truncate()
+            return report
+
+    def close(self):
+        """Stop the flushing thread, detach the buffer from its resource,
+        flush, and close the journal. Updates made afterwards through the
+        resource are sent immediately."""
+        if self._closed:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        resource = self._resource
+        if resource is not None and resource._write_behind is self:
+            resource._write_behind = None
+        with self._lock:
+            self._closed = True
+        if resource is not None:
+            self.flush()
+        if self._journal is not None:
+            self._journal.close()
+
+    def _merge(self, inventory_id: int, body: dict, seq: int):
+        entry = self._pending.get(inventory_id)
+        if entry is None:
+            self._pending[inventory_id] = [dict(body), self._clock(), seq]
+        else:
+            entry[0] = merge_updates(entry[0], body)
+            entry[2] = seq
+
+    def _requeue(self, inventory_id: int, body: dict, first: float, seq: int):
+        """Put back a failed update ahead of the updates made meanwhile."""
+        entry = self._pending.get(inventory_id)
+        if entry is None:
+            self._pending[inventory_id] = [body, first, seq]
+        else:
+            entry[0] = merge_updates(body, entry[0])
+            entry[1] = first
+
+    def _oldest(self) -> float:
+        with self._lock:
+            return min((entry[1] for entry in self._pending.values()), default=None)
+
+    def _run(self):
+        interval = self.max_delay / 4
+        while not self._stop.wait(interval):
+            oldest = self._oldest()
+            if oldest is not None and self._clock() - oldest >= self.max_delay:
+                self.flush()
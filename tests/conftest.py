@@ -4,9 +4,16 @@ import pytest
 from requests_oauthlib import OAuth1Session
 
 from bricklink_py.bricklink import Bricklink
+from bricklink_py.stub_server import StubData, StubServer
 from bricklink_py.utils import BaseResource
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "stub_data(**kwargs): StubData arguments of the stub servers"
+    )
+
+
 @pytest.fixture
 def mock_oauth_session():
     """Create a mock OAuth1Session for testing."""
@@ -74,3 +81,34 @@ def mock_error_response():
         return mock
 
     return _create_error
+
+
+def stub_server(request):
+    """Build a stub server serving the StubData of the closest stub_data
+    marker, the default StubData without one."""
+    marker = request.node.get_closest_marker("stub_data")
+    return StubServer(data=StubData(**(marker.kwargs if marker else {})))
+
+
+@pytest.fixture(scope="module")
+def server(request):
+    """Start a stub server shared by the tests of a module."""
+    with stub_server(request) as server:
+        yield server
+
+
+@pytest.fixture
+def fresh_server(request):
+    """Start a stub server for one test, free to change its data."""
+    with stub_server(request) as server:
+        yield server
+
+
+@pytest.fixture
+def client_for():
+    """Return a function building a client of a stub server."""
+
+    def client_for(server, **kwargs):
+        return Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url, **kwargs)
+
+    return client_for
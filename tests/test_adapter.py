@@ -0,0 +1,87 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from bricklink_py.adapter import PoolingHTTPAdapter
+from bricklink_py.bricklink import Bricklink
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive handler answering every GET with an empty list."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        payload = json.dumps({"meta": {"code": 200}, "data": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """Run a local HTTP server for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPoolingHTTPAdapter:
+    """Tests for the PoolingHTTPAdapter class."""
+
+    def test_connections_reused(self, http_server):
+        """Test that keep-alive connections are reused and counted."""
+        session = requests.Session()
+        adapter = PoolingHTTPAdapter(pool_maxsize=2)
+        session.mount("http://", adapter)
+
+        for _ in range(5):
+            session.get(f"{http_server}/colors").json()
+
+        stats = adapter.get_stats()
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connect_time"] > 0
+        pool = stats["pools"][http_server]
+        assert pool == {"num_connections": 1, "num_requests": 5, "idle": 1}
+
+    def test_default_timeout(self):
+        """Test that the default timeout is used when none is given."""
+        adapter = PoolingHTTPAdapter(timeout=(3.05, 27))
+        request = requests.Request("GET", "http://example.com").prepare()
+
+        with patch("requests.adapters.HTTPAdapter.send") as mock_send:
+            adapter.send(request)
+            assert mock_send.call_args.kwargs["timeout"] == (3.05, 27)
+
+            adapter.send(request, timeout=5)
+            assert mock_send.call_args.kwargs["timeout"] == 5
+
+
+class TestBricklinkPooling:
+    """Tests for the connection pool options of the client."""
+
+    def test_adapter_mounted(self):
+        """Test that the client mounts a tuned adapter on its session."""
+        client = Bricklink(
+            "ck", "cs", "tk", "tks", pool_maxsize=32, timeout=10, keep_alive=False
+        )
+
+        assert client.oauth_session.get_adapter("https://x") is client.http_adapter
+        assert client.pool_maxsize == 32
+        assert client.http_adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+        assert client.http_adapter.timeout == 10
+        assert client.oauth_session.headers["Connection"] == "close"
+        assert client.pool_stats()["requests"] == 0
@@ -0,0 +1,117 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from requests import Response
+
+from bricklink_py.async_bricklink import AsyncBricklink, AsyncOAuth1Session
+from bricklink_py.utils import RateLimitError, ResourceNotFoundError
+
+
+def make_response(status_code=200, json_data=None):
+    """Build a requests.Response like the one produced by the async session."""
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(json_data).encode()
+    return response
+
+
+@pytest.fixture
+def async_client():
+    """Create an AsyncBricklink client with test credentials."""
+    return AsyncBricklink(
+        consumer_key="test_consumer_key",
+        consumer_secret="test_consumer_secret",
+        token="test_token",
+        token_secret="test_token_secret",
+    )
+
+
+class TestAsyncOAuth1Session:
+    """Tests for the OAuth1 signing of the async session."""
+
+    def test_sign_drops_none_params(self):
+        """Test that None parameters are dropped and the request is signed."""
+        session = AsyncOAuth1Session("ck", "cs", "tk", "tks")
+        url, headers = session.sign(
+            "get",
+            "https://api.bricklink.com/api/store/v1/orders",
+            {"direction": "in", "status": None, "filed": False},
+        )
+
+        assert url == (
+            "https://api.bricklink.com/api/store/v1/orders?direction=in&filed=False"
+        )
+        assert headers["Authorization"].startswith("OAuth ")
+        assert 'oauth_consumer_key="ck"' in headers["Authorization"]
+        assert 'oauth_token="tk"' in headers["Authorization"]
+        assert 'oauth_signature_method="HMAC-SHA1"' in headers["Authorization"]
+
+
+class TestAsyncBricklink:
+    """Tests for the asyncio Bricklink client."""
+
+    def test_get_request(self, async_client):
+        """Test that resource methods are coroutines returning the data."""
+        send = AsyncMock(
+            return_value=make_response(
+                200, {"meta": {"code": 200}, "data": {"color_id": 4}}
+            )
+        )
+        with patch.object(AsyncOAuth1Session, "_send", send):
+            result = asyncio.run(async_client.color.get_color(4))
+
+        assert result == {"color_id": 4}
+        method, url, headers, body = send.call_args.args
+        assert method == "get"
+        assert url == "https://api.bricklink.com/api/store/v1/colors/4"
+        assert headers["Authorization"].startswith("OAuth ")
+        assert body is None
+
+    def test_put_request_sends_json_body(self, async_client):
+        """Test that the body is sent as JSON for write methods."""
+        send = AsyncMock(
+            return_value=make_response(
+                200, {"meta": {"code": 200}, "data": {"inventory_id": 1}}
+            )
+        )
+        body = {"unit_price": "0.30"}
+        with patch.object(AsyncOAuth1Session, "_send", send):
+            result = asyncio.run(
+                async_client.store_inventory.update_store_inventory(1, body)
+            )
+
+        assert result == {"inventory_id": 1}
+        assert send.call_args.args[0] == "put"
+        assert send.call_args.args[3] == body
+
+    def test_error_semantics(self, async_client):
+        """Test that errors are raised like in the synchronous client."""
+        send = AsyncMock(
+            side_effect=[
+                make_response(200, {"meta": {"code": 404, "message": "Not found"}}),
+                make_response(200, {"meta": {"code": 429, "message": "Too many"}}),
+            ]
+        )
+        with patch.object(AsyncOAuth1Session, "_send", send):
+            with pytest.raises(ResourceNotFoundError):
+                asyncio.run(async_client.order.get_order(1))
+            with pytest.raises(RateLimitError):
+                asyncio.run(async_client.order.get_order(1))
+
+    def test_concurrent_requests(self, async_client):
+        """Test that many requests can be awaited together."""
+        send = AsyncMock(
+            return_value=make_response(200, {"meta": {"code": 200}, "data": []})
+        )
+
+        async def fetch_all():
+            calls = [async_client.order.get_order_items(i) for i in range(50)]
+            return await asyncio.gather(*calls)
+
+        with patch.object(AsyncOAuth1Session, "_send", send):
+            results = asyncio.run(fetch_all())
+
+        assert len(results) == 50
+        assert send.call_count == 50
@@ -0,0 +1,88 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bricklink_py.batch import Batch
+from bricklink_py.utils import ResourceNotFoundError
+
+
+def make_response(data):
+    """Create a successful mock response returning data."""
+    response = MagicMock()
+    response.json.return_value = {"meta": {"code": 200}, "data": data}
+    return response
+
+
+class TestBatch:
+    """Tests for the Batch executor."""
+
+    def test_results_in_submission_order(self):
+        """Test that results keep the submission order, whatever the
+        completion order."""
+
+        def slow_echo(value):
+            time.sleep(0.01 * (5 - value))
+            return value
+
+        with Batch(max_workers=5) as batch:
+            futures = [batch.submit(slow_echo, i) for i in range(5)]
+
+        assert batch.results() == [0, 1, 2, 3, 4]
+        assert [future.result() for future in futures] == [0, 1, 2, 3, 4]
+
+    def test_map(self):
+        """Test mapping a function over several argument lists."""
+        with Batch(max_workers=3) as batch:
+            assert batch.map(pow, [2, 3, 4], [2, 2, 2]) == [4, 9, 16]
+
+    def test_exceptions(self):
+        """Test raising or returning the exceptions of the calls."""
+
+        def fail_odd(value):
+            if value % 2:
+                raise ValueError(value)
+            return value
+
+        with Batch(max_workers=2) as batch:
+            for i in range(4):
+                batch.submit(fail_odd, i)
+
+        with pytest.raises(ValueError):
+            batch.results()
+        results = batch.results(return_exceptions=True)
+        assert results[0] == 0 and results[2] == 2
+        assert isinstance(results[1], ValueError)
+        assert isinstance(results[3], ValueError)
+
+
+class TestClientBatch:
+    """Tests for the batch method of the client."""
+
+    def test_fan_out_resource_calls(
+        self, bricklink_client, mock_oauth_session, mock_error_response
+    ):
+        """Test running resource methods concurrently through the session."""
+
+        def get(url, params=None):
+            if url.endswith("/404/items"):
+                return mock_error_response(404, "Not found")
+            return make_response({"url": url})
+
+        mock_oauth_session.get.side_effect = get
+
+        with bricklink_client.batch(max_workers=4) as batch:
+            for order_id in (1, 2, 404, 3):
+                batch.submit(bricklink_client.order.get_order_items, order_id)
+
+        results = batch.results(return_exceptions=True)
+        assert results[0]["url"].endswith("orders/1/items")
+        assert results[1]["url"].endswith("orders/2/items")
+        assert isinstance(results[2], ResourceNotFoundError)
+        assert results[3]["url"].endswith("orders/3/items")
+        assert mock_oauth_session.get.call_count == 4
+
+    def test_default_workers(self, bricklink_client):
+        """Test that the batch defaults to the connection pool size."""
+        with bricklink_client.batch() as batch:
+            assert batch.max_workers == 10
@@ -0,0 +1,233 @@
+import asyncio
+
+import pytest
+
+from bricklink_py.bulk import BulkUploader
+from bricklink_py.inventory_index import InventoryIndex
+from bricklink_py.rate_limit import RateLimiter
+from bricklink_py.retry import RetryPolicy
+from bricklink_py.stub_server import StubData, StubServer
+from bricklink_py.utils import BricklinkError, QuotaExceededError
+
+pytestmark = pytest.mark.stub_data(parts=50, lots=100, orders=10)
+
+
+def make_bodies(server, count, bad=()):
+    """Build lots to create, those at the bad positions being invalid."""
+    lot = next(iter(server.data.inventories.values()))
+    return [
+        {
+            "item": {
+                "no": "NOT-A-PART" if index in bad else lot["item"]["no"],
+                "type": lot["item"]["type"],
+            },
+            "color_id": lot["color_id"],
+            "quantity": index + 1,
+            "unit_price": "0.100",
+            "new_or_used": "N",
+            "remarks": f"BULK-{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def no_sleep_policy(**kwargs):
+    """Retry policy of the bulk writes, without waiting."""
+    return RetryPolicy(
+        retry_statuses=(429, 503),
+        retry_methods=("post", "put", "delete"),
+        sleep=lambda seconds: None,
+        **kwargs,
+    )
+
+
+class TestBulkUploader:
+    """Tests for the BulkUploader class, against the stub server."""
+
+    def test_chunks(self, fresh_server, client_for):
+        """Test the lots are created by chunks, and reported in order."""
+        bodies = make_bodies(fresh_server, 1050)
+        report = BulkUploader(client_for(fresh_server), chunk_size=100).create(bodies)
+        assert report.ok
+        assert report.requests == 11
+        assert len(fresh_server.data.inventories) == 1150
+        assert [r.lot["remarks"] for r in report.results] == [
+            body["remarks"] for body in bodies
+        ]
+
+    def test_bisect(self, fresh_server, client_for):
+        """Test bad lots are isolated and the others created."""
+        bodies = make_bodies(fresh_server, 64, bad={5, 40})
+        report = BulkUploader(client_for(fresh_server), chunk_size=32).create(bodies)
+        assert not report.ok
+        assert [result.index for result in report.failed] == [5, 40]
+        assert all(r.error.status_code == 400 for r in report.failed)
+        assert len(report.succeeded) == 62
+        assert len(fresh_server.data.inventories) == 162
+        # Two chunks, then 5 levels of halves for each bad lot
+        assert report.requests == 2 + 2 * 2 * 5
+
+        report = BulkUploader(
+            client_for(fresh_server), chunk_size=32, bisect=False
+        ).create(bodies)
+        assert len(report.failed) == 64
+        assert report.requests == 2
+
+    def test_server_limit(self, fresh_server, client_for):
+        """Test chunks too large for the server are split."""
+        fresh_server.max_bulk_lots = 30
+        report = BulkUploader(client_for(fresh_server), chunk_size=100).create(
+            make_bodies(fresh_server, 200)
+        )
+        assert report.ok
+        assert len(fresh_server.data.inventories) == 300
+
+    def test_retry(self, client_for):
+        """Test chunks failing on retryable errors are retried."""
+        with StubServer(
+            data=StubData(parts=50, lots=100, orders=10),
+            rate_limit_rate=0.3,
+            retry_after=0,
+            seed=1,
+        ) as server:
+            report = BulkUploader(
+                client_for(server),
+                chunk_size=10,
+                retry_policy=no_sleep_policy(max_attempts=10),
+            ).create(make_bodies(server, 200))
+            assert report.ok
+            assert len(server.data.inventories) == 300
+            assert server.request_count > 20
+
+    def test_gave_up(self, client_for):
+        """Test chunks still failing after the retries are reported."""
+        with StubServer(
+            data=StubData(parts=50, lots=100, orders=10), error_rate=1.0
+        ) as server:
+            report = BulkUploader(
+                client_for(server),
+                chunk_size=10,
+                retry_policy=no_sleep_policy(max_attempts=2),
+            ).create(make_bodies(server, 30))
+            assert len(report.failed) == 30
+            assert isinstance(report.failed[0].error, BricklinkError)
+            assert report.failed[0].error.status_code == 503
+            assert server.request_count == 6
+
+    def test_index(self, fresh_server, client_for):
+        """Test the created lots reach the attached index."""
+        client = client_for(fresh_server)
+        index = client.store_inventory.attach_index(InventoryIndex())
+        BulkUploader(client, chunk_size=10).create(make_bodies(fresh_server, 25))
+        assert len(index) == 25
+        assert index.by_remarks("BULK-7")[0]["quantity"] == 8
+
+    def test_quota(self, fresh_server, client_for):
+        """Test nothing is sent when the quota cannot cover the chunks."""
+        client = client_for(fresh_server, rate_limiter=RateLimiter(daily_limit=2))
+        with pytest.raises(QuotaExceededError):
+            BulkUploader(client, chunk_size=10).create(make_bodies(fresh_server, 25))
+        assert fresh_server.request_count == 0
+
+
+class TestBulkUpdateDelete:
+    """Tests for update_store_inventories and delete_store_inventories."""
+
+    def test_update(self, fresh_server, client_for):
+        """Test the changes are applied, those of a lot in order."""
+        client = client_for(fresh_server)
+        ids = list(fresh_server.data.inventories)[:50]
+        quantities = {i: fresh_server.data.inventories[i]["quantity"] for i in ids}
+        changes = [(i, {"quantity": "+5"}) for i in ids] + [
+            (i, {"quantity": "-2", "remarks": f"BIN-{i}"}) for i in ids
+        ]
+        report = client.store_inventory.update_store_inventories(changes, 8)
+        assert report.ok
+        assert report.requests == 100
+        assert [r.inventory_id for r in report.results] == ids + ids
+        for i in ids:
+            lot = fresh_server.data.inventories[i]
+            assert lot["quantity"] == quantities[i] + 3
+            assert lot["remarks"] == f"BIN-{i}"
+        assert report.results[-1].lot["remarks"] == f"BIN-{ids[-1]}"
+
+    def test_update_mapping(self, fresh_server, client_for):
+        """Test the changes can be given as a dict."""
+        client = client_for(fresh_server)
+        inventory_id = next(iter(fresh_server.data.inventories))
+        report = client.store_inventory.update_store_inventories(
+            {inventory_id: {"unit_price": "2.500"}}
+        )
+        assert report.results[0].lot["unit_price"] == "2.500"
+
+    def test_failed_lot_stops(self, fresh_server, client_for):
+        """Test the changes following a failed one of a lot are not sent."""
+        client = client_for(fresh_server)
+        good = next(iter(fresh_server.data.inventories))
+        report = client.store_inventory.update_store_inventories(
+            [
+                (123456789, {"quantity": "+1"}),
+                (good, {"remarks": "A"}),
+                (123456789, {"quantity": "+1"}),
+            ]
+        )
+        assert [r.ok for r in report.results] == [False, True, False]
+        assert report.results[2].error is report.results[0].error
+        assert report.requests == 2
+
+    def test_delete(self, fresh_server, client_for):
+        """Test the lots are deleted once, missing ones reported."""
+        client = client_for(fresh_server)
+        index = client.store_inventory.attach_index(
+            InventoryIndex(fresh_server.data.inventories.values())
+        )
+        ids = list(fresh_server.data.inventories)[:20]
+        report = client.store_inventory.delete_store_inventories(
+            ids + ids[:5] + [123456789]
+        )
+        assert len(report) == 21
+        assert [r.inventory_id for r in report.failed] == [123456789]
+        assert not any(i in fresh_server.data.inventories for i in ids)
+        assert len(index) == len(fresh_server.data.inventories) == 80
+
+    def test_rate_limited(self, client_for):
+        """Test rate limited calls are retried and shrink the concurrency."""
+        with StubServer(
+            data=StubData(parts=50, lots=200, orders=10),
+            rate_limit_rate=0.2,
+            retry_after=0,
+            seed=3,
+        ) as server:
+            client = client_for(server)
+            ids = list(server.data.inventories)
+            report = client.store_inventory.update_store_inventories(
+                [(i, {"quantity": 7}) for i in ids],
+                retry_policy=no_sleep_policy(max_attempts=20),
+            )
+            assert report.ok
+            assert report.requests > len(ids)
+            assert all(lot["quantity"] == 7 for lot in server.data.inventories.values())
+
+    def test_async(self, fresh_server):
+        """Test the coroutine versions of the async client."""
+        pytest.importorskip("aiohttp")
+        from bricklink_py.async_bricklink import AsyncBricklink
+
+        ids = list(fresh_server.data.inventories)[:30]
+
+        async def run():
+            async with AsyncBricklink(
+                "ck", "cs", "tk", "tks", base_url=fresh_server.base_url
+            ) as client:
+                updated = await client.store_inventory.update_store_inventories(
+                    [(i, {"remarks": "ASYNC"}) for i in ids], max_workers=4
+                )
+                deleted = await client.store_inventory.delete_store_inventories(
+                    ids[:10]
+                )
+                return updated, deleted
+
+        updated, deleted = asyncio.run(run())
+        assert updated.ok and deleted.ok
+        assert updated.results[0].lot["remarks"] == "ASYNC"
+        assert len(fresh_server.data.inventories) == 90
@@ -0,0 +1,194 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from bricklink_py.cache import BaseCache, ResponseCache, SQLiteCache
+from bricklink_py.utils import BaseResource
+
+
+def make_response(data):
+    """Create a successful mock response returning data."""
+    response = MagicMock()
+    response.json.return_value = {"meta": {"code": 200}, "data": data}
+    return response
+
+
+class TestResponseCache:
+    """Tests for the ResponseCache class."""
+
+    def test_make_key_normalizes_params(self):
+        """Test that keys ignore None parameters and parameter order."""
+        key = BaseCache.make_key("get", "items/PART/3001", {"b": 1, "a": None, "c": 2})
+        assert key == "GET items/PART/3001?b=1&c=2"
+        assert key == BaseCache.make_key("GET", "items/PART/3001", {"c": 2, "b": 1})
+        assert BaseCache.make_key("get", "colors", {"x": None}) == "GET colors"
+
+    def test_hit_miss_and_copies(self):
+        """Test hits, misses and that cached values are copies."""
+        cache = ResponseCache()
+        value = [{"color_id": 1}]
+
+        assert cache.lookup("get", "colors") == (False, None)
+        cache.store("get", "colors", None, value)
+        value[0]["color_id"] = 2
+
+        hit, cached = cache.lookup("get", "colors")
+        assert hit and cached == [{"color_id": 1}]
+        cached.append({})
+        assert cache.lookup("get", "colors")[1] == [{"color_id": 1}]
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_per_endpoint_ttl(self):
+        """Test that endpoints use their own time to live."""
+        cache = ResponseCache(ttls={"colors/{color_id}": 10})
+
+        with patch("bricklink_py.cache.time.time", return_value=1000):
+            cache.store("get", "colors/4", None, {"color_id": 4})
+            cache.store("get", "orders", None, [])
+        assert len(cache) == 1
+
+        with patch("bricklink_py.cache.time.time", return_value=1009):
+            assert cache.lookup("get", "colors/4")[0]
+        with patch("bricklink_py.cache.time.time", return_value=1010):
+            assert not cache.lookup("get", "colors/4")[0]
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(maxsize=2)
+        cache.store("get", "colors/1", None, 1)
+        cache.store("get", "colors/2", None, 2)
+        cache.lookup("get", "colors/1")
+        cache.store("get", "colors/3", None, 3)
+
+        assert cache.lookup("get", "colors/1") == (True, 1)
+        assert cache.lookup("get", "colors/2") == (False, None)
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate(self):
+        """Test explicit invalidation of a URI and the URIs below it."""
+        cache = ResponseCache()
+        cache.store("get", "items/PART/3001", None, 1)
+        cache.store("get", "items/PART/3001/price", {"guide_type": "sold"}, 2)
+        cache.store("get", "items/PART/3002", None, 3)
+
+        cache.invalidate("items/PART/3001")
+        assert not cache.lookup("get", "items/PART/3001")[0]
+        assert not cache.lookup("get", "items/PART/3001/price", {"guide_type": "sold"})[
+            0
+        ]
+        assert cache.lookup("get", "items/PART/3002")[0]
+
+        cache.invalidate()
+        assert len(cache) == 0
+
+
+class TestCachedRequests:
+    """Tests for the cache integration in BaseResource."""
+
+    def test_get_served_from_cache(self, mock_oauth_session):
+        """Test that repeated GETs only hit the network once."""
+        mock_oauth_session.get.return_value = make_response([{"color_id": 1}])
+        resource = BaseResource(mock_oauth_session, cache=ResponseCache())
+
+        assert resource._request("get", "colors") == [{"color_id": 1}]
+        assert resource._request("get", "colors") == [{"color_id": 1}]
+        assert mock_oauth_session.get.call_count == 1
+
+    def test_write_invalidates_resource(self, bricklink_client, mock_oauth_session):
+        """Test that writes drop the cached responses of their resource."""
+        cache = ResponseCache(ttl=60)
+        bricklink_client.store_inventory._cache = cache
+        mock_oauth_session.get.return_value = make_response({"quantity": 1})
+        mock_oauth_session.put.return_value = make_response({"quantity": 2})
+
+        bricklink_client.store_inventory.get_store_inventory(1)
+        bricklink_client.store_inventory.get_store_inventories()
+        bricklink_client.store_inventory.update_store_inventory(1, {"quantity": "+1"})
+        bricklink_client.store_inventory.get_store_inventory(1)
+
+        assert mock_oauth_session.get.call_count == 3
+        assert len(cache) == 1
+
+
+class TestSQLiteCache:
+    """Tests for the SQLiteCache class."""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test that responses survive across cache instances."""
+        path = tmp_path / "cache.db"
+        SQLiteCache(path).store("get", "colors", None, [{"color_id": 1}])
+
+        cache = SQLiteCache(path)
+        assert cache.lookup("get", "colors") == (True, [{"color_id": 1}])
+        assert cache.lookup("get", "colors/1") == (False, None)
+        assert cache.stats()["size"] == 1
+
+    def test_expiry_and_invalidation(self, tmp_path):
+        """Test expired entries and invalidation of a URI prefix."""
+        cache = SQLiteCache(tmp_path / "cache.db", ttls={"colors": 10})
+        now = time.time()
+        with patch("bricklink_py.cache.time.time", return_value=now):
+            cache.store("get", "colors", None, [])
+            cache.store("get", "items/PART/3001_a", None, 1)
+            cache.store("get", "items/PART/3001_a/price", None, 2)
+            cache.store("get", "items/PART/3001xa", None, 3)
+
+        with patch("bricklink_py.cache.time.time", return_value=now + 10):
+            assert not cache.lookup("get", "colors")[0]
+
+        cache.invalidate("items/PART/3001_a")
+        assert len(cache) == 1
+        assert cache.lookup("get", "items/PART/3001xa") == (True, 3)
+
+    def test_size_caps(self, tmp_path):
+        """Test that pruning keeps the newest responses within the caps."""
+        cache = SQLiteCache(tmp_path / "cache.db", max_entries=3, prune_every=1)
+        now = time.time()
+        for i in range(5):
+            with patch("bricklink_py.cache.time.time", return_value=now + i):
+                cache.store("get", f"colors/{i}", None, {"color_id": i})
+
+        assert len(cache) == 3
+        assert cache.lookup("get", "colors/4")[0]
+        assert not cache.lookup("get", "colors/1")[0]
+
+        cache.max_bytes = 2 * len('{"color_id":4}')
+        cache.vacuum()
+        assert len(cache) == 2
+
+    def test_snapshot(self, tmp_path):
+        """Test pre-warming a cache from a snapshot of another one."""
+        source = SQLiteCache(tmp_path / "source.db")
+        source.store("get", "colors/1", None, {"color_id": 1})
+        source.store("get", "categories", None, [{"category_id": 5}])
+        source.export_snapshot(tmp_path / "snapshot.json")
+
+        cache = SQLiteCache(tmp_path / "cache.db")
+        assert cache.load_snapshot(tmp_path / "snapshot.json") == 2
+        assert cache.lookup("get", "categories") == (True, [{"category_id": 5}])
+
+    def test_concurrent_threads(self, tmp_path):
+        """Test reads and writes from several threads."""
+        cache = SQLiteCache(tmp_path / "cache.db")
+
+        def work(i):
+            cache.store("get", f"colors/{i}", None, i)
+            return cache.lookup("get", f"colors/{i}")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(work, range(50)))
+
+        assert results == [(True, i) for i in range(50)]
+        assert len(cache) == 50
+
+    def test_client_with_sqlite_cache(self, tmp_path, mock_oauth_session):
+        """Test that the client serves GETs from the persistent cache."""
+        mock_oauth_session.get.return_value = make_response({"no": "3001"})
+        path = tmp_path / "cache.db"
+
+        for _ in range(2):
+            resource = BaseResource(mock_oauth_session, cache=SQLiteCache(path))
+            assert resource._request("get", "items/PART/3001") == {"no": "3001"}
+
+        assert mock_oauth_session.get.call_count == 1
@@ -1,5 +1,13 @@
+import asyncio
 from unittest.mock import MagicMock
 
+import pytest
+
+from bricklink_py.catalog_item import PriceGuideSpec
+from bricklink_py.utils import ResourceNotFoundError
+
+pytestmark = pytest.mark.stub_data(parts=50, lots=100, orders=10)
+
 
 class TestCatalogItem:
     """Tests for the CatalogItem resource."""
@@ -251,3 +259,76 @@ class TestCatalogItem:
         assert len(result) == 2
         assert result[0]["color_name"] == "Blue"
         assert result[1]["color_name"] == "Red"
+
+
+class TestGetPriceGuides:
+    """Tests for CatalogItem.get_price_guides, against the stub server."""
+
+    def specs(self, server):
+        """Sold and stock, new and used guides of a few parts, in two
+        regions."""
+        parts = [key[1] for key in server.data.items if key[0] == "PART"][:5]
+        return [
+            ("PART", no, 11, guide_type, new_or_used, None, region)
+            for no in parts
+            for guide_type in ("sold", "stock")
+            for new_or_used in ("N", "U")
+            for region in ("europe", "north_america")
+        ]
+
+    def test_results(self, server, client_for):
+        """Test every spec gets its price guide."""
+        client = client_for(server)
+        specs = self.specs(server)
+        results = client.catalog_item.get_price_guides(specs, max_workers=8)
+        assert len(results) == 40
+        spec = PriceGuideSpec("PART", specs[0][1], 11, "sold", "N", None, "europe")
+        assert results[spec] == client.catalog_item.get_price_guide(*spec)
+        assert results[tuple(spec)] == results[spec]
+
+    def test_dedupe(self, server, client_for):
+        """Test equivalent specs are fetched once, None standing for the
+        defaults."""
+        client = client_for(server)
+        no = self.specs(server)[0][1]
+        calls = server.request_count
+        results = client.catalog_item.get_price_guides(
+            [
+                ("PART", no, 11),
+                ("part", no, 11, "STOCK", "n"),
+                {"type": "PART", "no": no, "color_id": 11},
+                {"type": "PART", "no": no, "color_id": 11, "guide_type": None},
+                ("PART", no, 11, None, None, None, None, None, None),
+                PriceGuideSpec("PART", no, 11, new_or_used="U"),
+            ]
+        )
+        assert len(results) == 2
+        assert server.request_count - calls == 2
+
+    def test_errors(self, server, client_for):
+        """Test the errors of the calls."""
+        client = client_for(server)
+        specs = [("PART", "NOT-A-PART"), self.specs(server)[0]]
+        with pytest.raises(ResourceNotFoundError):
+            client.catalog_item.get_price_guides(specs)
+        results = client.catalog_item.get_price_guides(specs, return_exceptions=True)
+        assert isinstance(
+            results[PriceGuideSpec("PART", "NOT-A-PART")], ResourceNotFoundError
+        )
+        assert "avg_price" in results[PriceGuideSpec.of(specs[1])]
+
+    def test_async(self, server):
+        """Test the coroutine version of the async client."""
+        pytest.importorskip("aiohttp")
+        from bricklink_py.async_bricklink import AsyncBricklink
+
+        specs = self.specs(server)
+
+        async def run():
+            async with AsyncBricklink(
+                "ck", "cs", "tk", "tks", base_url=server.base_url
+            ) as client:
+                return await client.catalog_item.get_price_guides(specs)
+
+        results = asyncio.run(run())
+        assert len(results) == 40
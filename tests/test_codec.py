@@ -0,0 +1,82 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.codec import CODECS, JSONCodec, get_codec
+from bricklink_py.utils import JSON_HEADERS, handle_response, request
+
+
+def available_codecs():
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            continue
+    return codecs
+
+
+@pytest.fixture(params=available_codecs(), ids=lambda codec: codec.name)
+def codec(request):
+    """Each codec whose library is installed."""
+    return request.param
+
+
+class TestCodec:
+    """Tests for the JSON codecs."""
+
+    def test_round_trip(self, codec):
+        """Test encoding and decoding a body."""
+        body = {"item": {"no": "3001", "type": "PART"}, "quantity": 5, "ok": True}
+        encoded = codec.dumps(body)
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == body
+
+    def test_decimal(self, codec):
+        """Test Decimal values are encoded as strings."""
+        assert codec.loads(codec.dumps({"unit_price": Decimal("0.1250")})) == {
+            "unit_price": "0.1250"
+        }
+
+    def test_invalid_json(self, codec):
+        """Test invalid JSON raises ValueError."""
+        with pytest.raises(ValueError):
+            codec.loads(b"<html>Bad gateway</html>")
+
+    def test_get_codec(self):
+        """Test selecting codecs by name."""
+        assert type(get_codec("json")) is JSONCodec
+        assert get_codec("auto").name == available_codecs()[0].name
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+    def test_handle_response(self, codec):
+        """Test handle_response decodes the content with the codec."""
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b'{"meta": {"code": 200}, "data": [{"inventory_id": 1}]}'
+
+        assert handle_response(response, codec) == [{"inventory_id": 1}]
+        response.json.assert_not_called()
+
+    def test_request_encodes_body(self, mock_oauth_session, codec):
+        """Test request sends the body encoded by the codec."""
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b'{"meta": {"code": 200}, "data": {}}'
+        mock_oauth_session.post.return_value = response
+        body = {"quantity": "+5"}
+
+        request("post", mock_oauth_session, "inventories", None, body, codec=codec)
+
+        kwargs = mock_oauth_session.post.call_args.kwargs
+        assert codec.loads(kwargs["data"]) == body
+        assert kwargs["headers"] == JSON_HEADERS
+
+    def test_client_option(self):
+        """Test the client accepts a codec name."""
+        client = Bricklink("ck", "cs", "tk", "tks", json_codec="json")
+        assert client.json_codec.name == "json"
+        assert client.store_inventory._request_options["codec"] is client.json_codec
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import requests
+
+from bricklink_py.concurrency import AdaptiveLimit, AsyncAdaptiveLimit, is_congestion
+from bricklink_py.utils import (
+    BricklinkError,
+    QuotaExceededError,
+    RateLimitError,
+    ResourceNotFoundError,
+)
+
+
+class TestIsCongestion:
+    """Tests for the is_congestion function."""
+
+    def test_errors(self):
+        """Test which errors signal an overloaded server."""
+        assert is_congestion(RateLimitError(429, "TOO_MANY"))
+        assert is_congestion(BricklinkError(503, "UNAVAILABLE"))
+        assert is_congestion(requests.ReadTimeout())
+        assert not is_congestion(QuotaExceededError(429, "Daily quota"))
+        assert not is_congestion(ResourceNotFoundError(404, "NOT_FOUND"))
+        assert not is_congestion(ValueError())
+
+
+class TestAdaptiveLimit:
+    """Tests for the AdaptiveLimit class."""
+
+    def test_aimd(self):
+        """Test the limit doubles every round until the first congestion, then
+        grows additively and shrinks multiplicatively."""
+        limit = AdaptiveLimit(initial=4, maximum=8)
+        for _ in range(3):
+            limit.acquire()
+            limit.release()
+        assert limit.limit == 7
+        limit.acquire()
+        limit.release(congested=True)
+        assert limit.limit == 3.5
+        assert limit.congestions == 1
+        for _ in range(4):
+            limit.acquire()
+            limit.release()
+        assert 4.5 < limit.limit < 4.6
+
+        for _ in range(200):
+            limit.acquire()
+            limit.release()
+        assert limit.limit == 8
+        for _ in range(10):
+            limit.acquire()
+            limit.release(congested=True)
+        assert limit.limit == 1
+
+    def test_bounds_threads(self):
+        """Test threads never exceed the limit."""
+        limit = AdaptiveLimit(initial=3, maximum=3)
+
+        def work():
+            for _ in range(20):
+                limit.acquire()
+                time.sleep(0.001)
+                limit.release()
+
+        threads = [threading.Thread(target=work) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert limit.peak == 3
+        assert limit.in_flight == 0
+
+    def test_async(self):
+        """Test coroutines never exceed the limit."""
+        limit = AsyncAdaptiveLimit(initial=2, maximum=2)
+
+        async def work():
+            for _ in range(10):
+                await limit.acquire()
+                await asyncio.sleep(0.001)
+                limit.release()
+
+        async def run():
+            await asyncio.gather(*(work() for _ in range(8)))
+
+        asyncio.run(run())
+        assert limit.peak == 2
+        assert limit.in_flight == 0
@@ -0,0 +1,155 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.cache import ResponseCache
+from bricklink_py.hooks import Hooks, MetricsAggregator, RequestInfo, percentile
+from bricklink_py.retry import RetryPolicy
+from bricklink_py.utils import ResourceNotFoundError
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    """Answer price guides, 404 for unknown colors and 503 once for orders."""
+
+    protocol_version = "HTTP/1.1"
+    failures = {"orders": 1}
+
+    def do_GET(self):
+        if self.path.startswith("/colors/999"):
+            self.reply({"meta": {"code": 404, "message": "Not found"}})
+        elif self.path.startswith("/orders") and self.failures["orders"]:
+            self.failures["orders"] -= 1
+            self.reply({"meta": {"code": 503, "message": "Unavailable"}})
+        else:
+            self.reply({"meta": {"code": 200}, "data": {"path": self.path}})
+
+    def reply(self, payload):
+        payload = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def client():
+    """Create a client talking to a local HTTP server."""
+    APIHandler.failures = {"orders": 1}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), APIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch(
+        "bricklink_py.utils.API_BASE_URL", f"http://127.0.0.1:{server.server_port}/"
+    ):
+        client = Bricklink(
+            "ck",
+            "cs",
+            "tk",
+            "tks",
+            retry_policy=RetryPolicy(sleep=lambda seconds: None),
+            cache=ResponseCache(),
+        )
+        yield client
+    client.oauth_session.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestHooks:
+    """Tests for the Hooks registry."""
+
+    def test_add_remove(self):
+        """Test registering and unregistering callbacks."""
+        hooks = Hooks()
+        calls = []
+        assert not hooks
+
+        hooks.add("before_request", calls.append)
+        assert hooks
+        hooks.emit("before_request", "info")
+        hooks.remove("before_request", calls.append)
+        hooks.emit("before_request", "info")
+
+        assert calls == ["info"]
+        with pytest.raises(ValueError):
+            hooks.add("unknown", calls.append)
+
+
+class TestInstrumentedRequests:
+    """Tests for the hooks called by the resources."""
+
+    def test_timings_and_sizes(self, client):
+        """Test that a call reports its endpoint, timings and sizes."""
+        events = []
+        client.hooks.add("before_request", lambda info: events.append("before"))
+        client.hooks.add("after_response", events.append)
+
+        client.catalog_item.get_price_guide("PART", "3001", color_id=5)
+
+        assert events[0] == "before"
+        info = events[1]
+        assert info.endpoint == "items/{type}/{no}/price"
+        assert info.uri == "items/PART/3001/price"
+        assert info.status_code == 200
+        assert info.response_bytes > 0
+        assert info.sign_time > 0 and info.network_time > 0
+        assert info.total_time >= info.sign_time + info.network_time
+        assert not info.cache_hit and not info.retried
+
+    def test_retry_and_cache_flags(self, client):
+        """Test that retries, errors and cache hits are flagged."""
+        infos = []
+        client.hooks.add("after_response", infos.append)
+        client.hooks.add("on_error", infos.append)
+
+        client.order.get_order(1)
+        client.color.get_color(1)
+        client.color.get_color(1)
+        with pytest.raises(ResourceNotFoundError):
+            client.color.get_color(999)
+
+        assert [(i.attempt, i.error is not None) for i in infos[:2]] == [
+            (1, True),
+            (2, False),
+        ]
+        assert infos[2].cache_hit is False and infos[3].cache_hit is True
+        assert isinstance(infos[4].error, ResourceNotFoundError)
+
+    def test_metrics_aggregator(self, client):
+        """Test the per endpoint report of the aggregator."""
+        metrics = MetricsAggregator()
+        metrics.register(client.hooks)
+
+        for color_id in range(5):
+            client.color.get_color(color_id)
+        client.color.get_color(0)
+
+        report = metrics.report()["colors/{color_id}"]
+        assert report["count"] == 6
+        assert report["cache_hits"] == 1
+        assert report["errors"] == 0
+        assert 0 <= report["p50"] <= report["p95"] <= report["p99"] <= report["max"]
+
+
+class TestMetricsAggregator:
+    """Tests for the MetricsAggregator percentiles."""
+
+    def test_percentiles(self):
+        """Test the percentiles computed from recorded calls."""
+        metrics = MetricsAggregator()
+        for total_time in range(1, 102):
+            info = RequestInfo("get", "colors", "colors")
+            info.total_time = total_time
+            metrics.record(info)
+
+        report = metrics.report()["colors"]
+        assert (report["p50"], report["p95"], report["p99"]) == (51, 96, 100)
+        assert percentile([], 50) == 0.0
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+import pytest
+
+from bricklink_py.inventory_index import InventoryIndex, lot_key
+from bricklink_py.records import InventoryLot
+
+pytestmark = pytest.mark.stub_data(parts=50, lots=300, orders=20)
+
+
+def make_lot(inventory_id, no="3001", color_id=11, new_or_used="N", **fields):
+    """Build a store inventory lot."""
+    return {
+        "inventory_id": inventory_id,
+        "item": {"no": no, "type": "PART", "category_id": 5},
+        "color_id": color_id,
+        "new_or_used": new_or_used,
+        "quantity": 1,
+        "remarks": "",
+        **fields,
+    }
+
+
+class TestInventoryIndex:
+    """Tests for the InventoryIndex class."""
+
+    def test_lookups(self):
+        """Test every index finds its lots."""
+        index = InventoryIndex(
+            [
+                make_lot(1, remarks="A1"),
+                make_lot(2, remarks="A1", unit_price="0.10"),
+                make_lot(3, color_id=5, remarks="B2"),
+                make_lot(4, new_or_used="U"),
+            ]
+        )
+        assert len(index) == 4
+        assert 3 in index
+        assert index.get(3)["color_id"] == 5
+        assert [lot["inventory_id"] for lot in index.find("part", "3001", 11)] == [
+            1,
+            2,
+        ]
+        assert [lot["inventory_id"] for lot in index.find("PART", "3001", 11, "U")] == [
+            4
+        ]
+        assert index.find("PART", "3002", 11) == []
+        assert len(index.by_category(5)) == 4
+        assert [lot["inventory_id"] for lot in index.by_remarks("A1")] == [1, 2]
+
+    def test_match(self):
+        """Test matching an order item."""
+        index = InventoryIndex([make_lot(1), make_lot(2, color_id=5)])
+        order_item = {
+            "inventory_id": 99,
+            "item": {"no": "3001", "type": "PART"},
+            "color_id": 5,
+            "new_or_used": "N",
+        }
+        assert [lot["inventory_id"] for lot in index.match(order_item)] == [2]
+        assert lot_key(order_item) == ("PART", "3001", 5, "N")
+
+    def test_replace_and_remove(self):
+        """Test replacing a lot moves it between the index entries."""
+        index = InventoryIndex([make_lot(1, remarks="A1")])
+        index.add(make_lot(1, color_id=5, remarks="B2"))
+        assert len(index) == 1
+        assert index.find("PART", "3001", 11) == []
+        assert index.by_remarks("A1") == []
+        assert index.find("PART", "3001", 5)[0]["remarks"] == "B2"
+
+        assert index.remove(1)["inventory_id"] == 1
+        assert index.remove(1) is None
+        assert len(index) == 0
+        assert index.by_category(5) == []
+        assert index._by_key == index._by_category == index._by_remarks == {}
+
+    def test_records(self):
+        """Test record lots are indexed like dicts."""
+        index = InventoryIndex([InventoryLot(make_lot(1))])
+        assert isinstance(index.find("PART", "3001", 11)[0], InventoryLot)
+
+    def test_threads(self):
+        """Test concurrent writers leave the index consistent."""
+        index = InventoryIndex()
+
+        def write(start):
+            for inventory_id in range(start, start + 500):
+                index.add(make_lot(inventory_id, color_id=inventory_id % 7))
+                if inventory_id % 2:
+                    index.remove(inventory_id)
+
+        threads = [threading.Thread(target=write, args=(i * 500,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(index) == 2000
+        assert sum(len(index.find("PART", "3001", c)) for c in range(7)) == 2000
+
+
+class TestAttachedIndex:
+    """Tests for the index attached to the StoreInventory resource."""
+
+    def test_writes(self, fresh_server, client_for):
+        """Test creations, updates and deletions are applied to the index."""
+        client = client_for(fresh_server)
+        index = client.store_inventory.attach_index(
+            InventoryIndex(client.store_inventory.get_store_inventories())
+        )
+        lot = next(iter(fresh_server.data.inventories.values()))
+        body = {
+            "item": {"no": lot["item"]["no"], "type": lot["item"]["type"]},
+            "color_id": lot["color_id"],
+            "quantity": 3,
+            "unit_price": "1.000",
+            "new_or_used": "U",
+            "remarks": "NEW-BIN",
+        }
+
+        created = client.store_inventory.create_store_inventory(body)
+        assert index.get(created["inventory_id"]) == created
+        assert index.by_remarks("NEW-BIN") == [created]
+
+        client.store_inventory.update_store_inventory(
+            created["inventory_id"], {"quantity": "+2", "remarks": "OTHER-BIN"}
+        )
+        assert index.get(created["inventory_id"])["quantity"] == 5
+        assert index.by_remarks("NEW-BIN") == []
+
+        client.store_inventory.delete_store_inventory(created["inventory_id"])
+        assert created["inventory_id"] not in index
+
+        assert len(index) == len(fresh_server.data.inventories)
+        for lot in fresh_server.data.inventories.values():
+            assert index.get(lot["inventory_id"]) == lot
+
+    def test_detach(self, fresh_server, client_for):
+        """Test a detached index is left untouched."""
+        client = client_for(fresh_server)
+        index = client.store_inventory.attach_index(InventoryIndex())
+        client.store_inventory.attach_index(None)
+        inventory_id = next(iter(fresh_server.data.inventories))
+        client.store_inventory.update_store_inventory(inventory_id, {"quantity": 9})
+        assert len(index) == 0
+
+    def test_async(self, fresh_server):
+        """Test the index attached to the async client."""
+        pytest.importorskip("aiohttp")
+        from bricklink_py.async_bricklink import AsyncBricklink
+
+        inventory_id = next(iter(fresh_server.data.inventories))
+
+        async def run():
+            async with AsyncBricklink(
+                "ck", "cs", "tk", "tks", base_url=fresh_server.base_url
+            ) as client:
+                index = client.store_inventory.attach_index(
+                    InventoryIndex(await client.store_inventory.get_store_inventories())
+                )
+                await client.store_inventory.update_store_inventory(
+                    inventory_id, {"remarks": "ASYNC"}
+                )
+                await client.store_inventory.delete_store_inventory(inventory_id)
+                return index
+
+        index = asyncio.run(run())
+        assert inventory_id not in index
+        assert index.by_remarks("ASYNC") == []
+        assert len(index) == len(fresh_server.data.inventories)
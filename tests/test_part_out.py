@@ -0,0 +1,166 @@
+import pytest
+
+from bricklink_py.part_out import PartOut
+
+pytestmark = pytest.mark.stub_data(parts=200, minifigs=30, sets=60)
+
+
+def server_bom(client, no, **flags):
+    """Bill of materials of a set broken down by the server."""
+    groups = client.catalog_item.get_subsets("SET", no, **flags)
+    bom = {}
+    for group in groups:
+        entry = group["entries"][0]
+        key = (entry["item"]["type"], entry["item"]["no"], entry["color_id"])
+        bom[key] = bom.get(key, 0) + entry["quantity"]
+    return bom
+
+
+def nested_set(server):
+    """A set holding another set."""
+    return next(
+        key[1]
+        for key, groups in server.data.subsets.items()
+        if any(group["entries"][0]["item"]["type"] == "SET" for group in groups)
+    )
+
+
+def subsets(entries):
+    """Subsets of (type, no, color_id, quantity, extra, is_alternate) entries."""
+    return [
+        {
+            "match_no": 0,
+            "entries": [
+                {
+                    "item": {"no": no, "type": type},
+                    "color_id": color_id,
+                    "quantity": quantity,
+                    "extra_quantity": extra,
+                    "is_alternate": alternate,
+                }
+            ],
+        }
+        for type, no, color_id, quantity, extra, alternate in entries
+    ]
+
+
+class FakeCatalogItem:
+    """Catalog item resource serving fixed subsets."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.calls = []
+
+    def get_subsets(self, type, no, **flags):
+        self.calls.append((type, no, flags))
+        return subsets(self.graph.get((type, no), []))
+
+
+class FakeClient:
+    def __init__(self, graph):
+        self.catalog_item = FakeCatalogItem(graph)
+
+
+GRAPH = {
+    ("SET", "1-1"): [
+        ("PART", "3001", 5, 4, 1, False),
+        ("PART", "3002", 5, 1, 0, True),
+        ("MINIFIG", "fig1", 0, 2, 0, False),
+        ("SET", "2-1", 0, 3, 0, False),
+    ],
+    ("SET", "2-1"): [
+        ("PART", "3001", 5, 1, 0, False),
+        ("MINIFIG", "fig1", 0, 1, 0, False),
+    ],
+    ("MINIFIG", "fig1"): [
+        ("PART", "973", 1, 1, 0, False),
+        ("PART", "3626", 3, 1, 0, False),
+    ],
+}
+
+
+class TestPartOut:
+    """Tests for the PartOut class."""
+
+    def test_multiplicities(self):
+        """Test quantities multiply down the sets in sets and minifigs."""
+        client = FakeClient(GRAPH)
+        bom = PartOut(client).bom("set", "1-1")
+        assert bom == {
+            ("PART", "3001", 5): 4 + 3,
+            ("PART", "973", 1): 2 + 3,
+            ("PART", "3626", 3): 2 + 3,
+        }
+        # Every assembly fetched once, fig1 although it is in two of them
+        assert len(client.catalog_item.calls) == 3
+
+    def test_flags(self):
+        """Test the assemblies are only broken when asked to."""
+        client = FakeClient(GRAPH)
+        part_out = PartOut(
+            client, break_minifigs=False, break_subsets=False, include_extra=True
+        )
+        assert part_out.bom("SET", "1-1") == {
+            ("PART", "3001", 5): 5,
+            ("MINIFIG", "fig1", 0): 2,
+            ("SET", "2-1", 0): 3,
+        }
+        assert part_out.fetches == 1
+
+    def test_box_and_instruction(self):
+        """Test the box and instruction flags are sent for sets only."""
+        client = FakeClient(GRAPH)
+        PartOut(client, box=True, instruction=True).bom("SET", "1-1")
+        flags = {call[0]: call[2] for call in client.catalog_item.calls}
+        assert flags["SET"] == {"box": True, "instruction": True}
+        assert flags["MINIFIG"] == {"box": False, "instruction": False}
+
+    def test_total(self):
+        """Test the bill of materials of a collection."""
+        part_out = PartOut(FakeClient(GRAPH))
+        total = part_out.total([("SET", "2-1", 2), ("SET", "2-1"), ("MINIFIG", "fig1")])
+        assert total == {
+            ("PART", "3001", 5): 3,
+            ("PART", "973", 1): 4,
+            ("PART", "3626", 3): 4,
+        }
+
+    def test_cycle(self):
+        """Test an assembly containing itself is reported."""
+        graph = {("SET", "1-1"): [("SET", "1-1", 0, 1, 0, False)]}
+        with pytest.raises(ValueError):
+            PartOut(FakeClient(graph)).bom("SET", "1-1")
+
+    def test_matches_server(self, server, client_for):
+        """Test the bill of materials matches the server side break down."""
+        client = client_for(server)
+        no = nested_set(server)
+        for flags in (
+            {"break_minifigs": True, "break_subsets": True},
+            {"break_minifigs": False, "break_subsets": True},
+            {"break_minifigs": True, "break_subsets": False},
+        ):
+            assert PartOut(client, **flags).bom("SET", no) == server_bom(
+                client, no, **flags
+            )
+
+    def test_fetch_once(self, server, client_for):
+        """Test 500 sets fetch every assembly once."""
+        client = client_for(server)
+        sets = [no for type, no in server.data.items if type == "SET"]
+        items = [("SET", sets[i % len(sets)]) for i in range(500)]
+        part_out = PartOut(client, max_workers=8)
+        calls = server.request_count
+        boms = part_out.boms(items)
+        assert len(boms) == len(sets)
+        minifigs = {
+            group["entries"][0]["item"]["no"]
+            for no in sets
+            for group in server.data.subsets[("SET", no)]
+            if group["entries"][0]["item"]["type"] == "MINIFIG"
+        }
+        assert part_out.fetches == len(sets) + len(minifigs)
+        assert server.request_count - calls == part_out.fetches
+
+        part_out.total(items)
+        assert server.request_count - calls == part_out.fetches
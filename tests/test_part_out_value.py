@@ -0,0 +1,148 @@
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bricklink_py.catalog_item import PriceGuideSpec  # noqa: E402
+from bricklink_py.part_out_value import part_out_value  # noqa: E402
+from bricklink_py.price_guide import PriceGuideCache  # noqa: E402
+from bricklink_py.utils import ResourceNotFoundError  # noqa: E402
+
+pytestmark = pytest.mark.stub_data(parts=100, minifigs=20, sets=30)
+
+
+def entry(type, no, color_id, quantity):
+    return {
+        "match_no": 0,
+        "entries": [
+            {
+                "item": {"no": no, "type": type},
+                "color_id": color_id,
+                "quantity": quantity,
+                "extra_quantity": 0,
+                "is_alternate": False,
+            }
+        ],
+    }
+
+
+class FakeCatalogItem:
+    """Catalog item resource serving fixed subsets and price guides."""
+
+    subsets = {
+        ("SET", "1-1"): [
+            entry("PART", "3001", 5, 4),
+            entry("MINIFIG", "fig1", 0, 1),
+        ],
+        ("SET", "2-1"): [entry("PART", "3001", 5, 1), entry("PART", "3002", 1, 2)],
+        ("MINIFIG", "fig1"): [entry("PART", "973", 1, 1), entry("PART", "9999", 1, 3)],
+    }
+    prices = {"3001": "0.1000", "3002": "0.3333", "973": "1.2500"}
+
+    def __init__(self):
+        self.specs = []
+
+    def get_subsets(self, type, no, **flags):
+        return self.subsets.get((type, no), [])
+
+    def get_price_guides(self, specs, max_workers=16, return_exceptions=False):
+        results = {}
+        for spec in map(PriceGuideSpec.of, specs):
+            self.specs.append(spec)
+            if spec.no == "9999":
+                results[spec] = ResourceNotFoundError(404, "Item not found")
+            else:
+                results[spec] = {
+                    "qty_avg_price": self.prices[spec.no],
+                    "unit_quantity": 1,
+                    "price_detail": [
+                        {"quantity": 1, "unit_price": self.prices[spec.no]}
+                    ],
+                }
+        return results
+
+
+class FakeClient:
+    def __init__(self):
+        self.catalog_item = FakeCatalogItem()
+
+
+class TestPartOutValue:
+    """Tests for the part_out_value function."""
+
+    def test_values(self):
+        """Test the values of the parts and of the sets."""
+        client = FakeClient()
+        value = part_out_value(client, [("SET", "1-1", 2), "2-1"], guide_type="stock")
+        assert value.sets == [("SET", "1-1"), ("SET", "2-1")]
+        assert value.set_values.tolist() == [1.65, 0.7666]
+        assert value.total == 4.0666  # exact, 2 * 1.65 + 0.7666
+        assert value.keys == [
+            ("PART", "3001", 5),
+            ("PART", "973", 1),
+            ("PART", "9999", 1),
+            ("PART", "3002", 1),
+        ]
+        assert value.quantities.tolist() == [9, 2, 6, 2]
+        assert value.missing == [("PART", "9999", 1)]
+        assert list(value.errors) == [("PART", "9999", 1)]
+        assert {spec.guide_type for spec in client.catalog_item.specs} == {"stock"}
+
+    def test_dedupe(self):
+        """Test every part-color pair is priced once across the sets."""
+        client = FakeClient()
+        part_out_value(client, ["1-1", "2-1", "1-1"], new_or_used="U")
+        specs = client.catalog_item.specs
+        assert len(specs) == len(set(specs)) == 4
+        assert all(spec.new_or_used == "U" for spec in specs)
+
+    def test_rows(self):
+        """Test the per part rows, the most valuable first."""
+        value = part_out_value(FakeClient(), "1-1")
+        rows = value.rows()
+        assert [row["item"]["no"] for row in rows] == ["973", "3001", "9999"]
+        assert rows[0] == {
+            "item": {"no": "973", "type": "PART"},
+            "color_id": 1,
+            "quantity": 1,
+            "unit_price": 1.25,
+            "value": 1.25,
+        }
+        assert rows[2]["value"] is None
+
+    def test_statistics(self):
+        """Test prices computed from the price details."""
+        value = part_out_value(FakeClient(), "2-1", price="median")
+        assert value.unit_prices.tolist() == [0.1, 0.3333]
+        with pytest.raises(ValueError):
+            part_out_value(FakeClient(), "2-1", price="mode")
+
+    def test_against_server(self, server, client_for):
+        """Test the total matches pricing the server side break down one
+        part at a time, and a cache saves the second computation."""
+        client = client_for(server)
+        cache = client.catalog_item.attach_price_guide_cache(PriceGuideCache())
+        sets = [no for type, no in server.data.items if type == "SET"][:10]
+
+        value = part_out_value(client, sets, new_or_used="U")
+        expected = Decimal(0)
+        for no in sets:
+            for group in client.catalog_item.get_subsets(
+                "SET", no, break_minifigs=True, break_subsets=True
+            ):
+                part = group["entries"][0]
+                guide = client.catalog_item.get_price_guide(
+                    "PART", part["item"]["no"], part["color_id"], "sold", "U"
+                )
+                if guide["unit_quantity"]:
+                    expected += part["quantity"] * Decimal(guide["qty_avg_price"])
+        assert Decimal(str(value.total)) == expected
+
+        calls = server.request_count
+        again = part_out_value(client, sets, new_or_used="U")
+        assert again.total == value.total
+        # Only the subsets are fetched again, by the new PartOut engine
+        assert server.request_count - calls < len(value)
+        assert cache.stats()["misses"] == len(value)
+        cache.close()
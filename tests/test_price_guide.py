@@ -0,0 +1,172 @@
+import threading
+
+import pytest
+
+from bricklink_py.catalog_item import PriceGuideSpec
+from bricklink_py.price_guide import PriceGuideCache
+
+
+class Clock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Fetcher:
+    """Fetch function counting its calls, returning a new guide each time."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def __call__(self, spec):
+        with self.lock:
+            self.calls.append(spec)
+            if self.fail:
+                raise ConnectionError("down")
+            return {"item": {"no": spec.no}, "avg_price": str(len(self.calls))}
+
+
+SOLD = PriceGuideSpec("PART", "3001", 11, "sold")
+STOCK = PriceGuideSpec("PART", "3001", 11, "stock")
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    """Cache with a one day sold TTL, one hour stock TTL, one hour of stale
+    answers."""
+    with PriceGuideCache(
+        sold_ttl=86400, stock_ttl=3600, stale_ttl=3600, clock=clock
+    ) as cache:
+        yield cache
+
+
+class TestPriceGuideCache:
+    """Tests for the PriceGuideCache class."""
+
+    def test_hit_and_age(self, cache, clock):
+        """Test a fresh guide is served from the cache with its age."""
+        fetch = Fetcher()
+        assert cache.fetch(SOLD, fetch)["age"] == 0
+        clock.now += 60
+        guide = cache.fetch(("part", "3001", 11, "SOLD"), fetch)
+        assert guide["age"] == 60
+        assert guide["avg_price"] == "1"
+        assert len(fetch.calls) == 1
+        assert cache.age(SOLD) == 60
+        assert cache.age(STOCK) is None
+
+    def test_guide_type_ttl(self, cache, clock):
+        """Test sold guides stay fresh longer than stock guides."""
+        fetch = Fetcher()
+        cache.fetch(SOLD, fetch)
+        cache.fetch(STOCK, fetch)
+        clock.now += 7200  # stock expired past its stale window
+        assert cache.fetch(SOLD, fetch)["age"] == 7200
+        assert cache.fetch(STOCK, fetch)["age"] == 0
+        assert fetch.calls == [SOLD, STOCK, STOCK]
+
+    def test_stale_while_revalidate(self, cache, clock):
+        """Test an expired guide is served while refreshed in the background."""
+        fetch = Fetcher()
+        cache.fetch(STOCK, fetch)
+        clock.now += 3700
+        stale = cache.fetch(STOCK, fetch)
+        assert stale["age"] == 3700
+        assert stale["avg_price"] == "1"
+        cache.close()  # waits for the refresh
+        fresh = cache.fetch(STOCK, fetch)
+        assert fresh["age"] == 0
+        assert fresh["avg_price"] == "2"
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.refreshes == 1
+
+    def test_refresh_once(self, clock):
+        """Test concurrent stale answers start a single refresh."""
+        release = threading.Event()
+        fetch = Fetcher()
+
+        def slow(spec):
+            release.wait(5)
+            return fetch(spec)
+
+        cache = PriceGuideCache(stock_ttl=10, stale_ttl=100, clock=clock)
+        cache.store(STOCK, {"avg_price": "0"})
+        clock.now += 20
+        for _ in range(5):
+            assert cache.fetch(STOCK, slow)["avg_price"] == "0"
+        release.set()
+        cache.close()
+        assert len(fetch.calls) == 1
+
+    def test_refresh_error(self, cache, clock):
+        """Test a failed refresh keeps the stale guide."""
+        cache.fetch(STOCK, Fetcher())
+        clock.now += 3700
+        assert cache.fetch(STOCK, Fetcher(fail=True))["avg_price"] == "1"
+        cache.close()
+        assert cache.refresh_errors == 1
+        assert cache.fetch(STOCK, Fetcher())["avg_price"] == "1"
+
+    def test_max_age(self, cache, clock):
+        """Test guides older than max_age are fetched again."""
+        fetch = Fetcher()
+        cache.fetch(SOLD, fetch)
+        clock.now += 600
+        assert cache.fetch(SOLD, fetch, max_age=900)["age"] == 600
+        assert cache.fetch(SOLD, fetch, max_age=300)["age"] == 0
+        assert len(fetch.calls) == 2
+
+    def test_lru_and_invalidate(self, clock):
+        """Test the least recently used guides are evicted first."""
+        fetch = Fetcher()
+        with PriceGuideCache(maxsize=2, clock=clock) as cache:
+            cache.fetch(SOLD, fetch)
+            cache.fetch(STOCK, fetch)
+            cache.fetch(SOLD, fetch)
+            cache.fetch(STOCK._replace(new_or_used="U"), fetch)
+            assert cache.age(STOCK) is None
+            assert cache.age(SOLD) is not None
+            cache.invalidate(SOLD)
+            assert len(cache) == 1
+            cache.invalidate()
+            assert len(cache) == 0
+
+
+@pytest.mark.stub_data(parts=20, lots=10, orders=1)
+class TestAttachPriceGuideCache:
+    """Tests for CatalogItem.attach_price_guide_cache, against the stub
+    server."""
+
+    def test_get_price_guide(self, fresh_server, clock, client_for):
+        """Test get_price_guide and get_price_guides use the cache."""
+        client = client_for(fresh_server)
+        no = next(key[1] for key in fresh_server.data.items if key[0] == "PART")
+        expected = client.catalog_item.get_price_guide("PART", no, 11, "sold")
+
+        with client.catalog_item.attach_price_guide_cache(
+            PriceGuideCache(clock=clock)
+        ) as cache:
+            calls = fresh_server.request_count
+            guide = client.catalog_item.get_price_guide("PART", no, 11, "sold")
+            assert guide == dict(expected, age=0)
+            clock.now += 30
+            results = client.catalog_item.get_price_guides(
+                [("PART", no, 11, "sold"), ("PART", no, 11, "stock")]
+            )
+            assert results[SOLD._replace(no=no)]["age"] == 30
+            assert fresh_server.request_count - calls == 2
+            assert cache.stats()["hits"] == 1
+
+        client.catalog_item.attach_price_guide_cache(None)
+        assert "age" not in client.catalog_item.get_price_guide("PART", no, 11)
@@ -0,0 +1,163 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bricklink_py.price_stats import (  # noqa: E402
+    PriceDetails,
+    parse_price,
+    parse_prices,
+    to_decimals,
+)
+from bricklink_py.stub_server import StubData  # noqa: E402
+
+
+def guide(*entries):
+    """Price guide of (quantity, unit_price) entries."""
+    return {
+        "price_detail": [
+            {"quantity": quantity, "unit_price": price} for quantity, price in entries
+        ]
+    }
+
+
+def percentile(entries, q):
+    """Reference quantity weighted percentile, one entry at a time."""
+    entries = sorted(entries, key=lambda entry: Decimal(entry[1]))
+    total = sum(quantity for quantity, _ in entries)
+    seen = 0
+    for quantity, price in entries:
+        seen += quantity
+        if seen >= Fraction(q, 100) * total:
+            return float(Decimal(price))
+
+
+def trimmed_mean(entries, proportion):
+    """Reference trimmed mean, one entry at a time."""
+    entries = sorted(entries, key=lambda entry: Decimal(entry[1]))
+    total = sum(quantity for quantity, _ in entries)
+    low, high = proportion * total, (1 - proportion) * total
+    amount = kept = seen = Fraction(0)
+    for quantity, price in entries:
+        weight = max(0, min(seen + quantity, high) - max(seen, low))
+        amount += weight * Fraction(Decimal(price))
+        kept += weight
+        seen += quantity
+    return float(amount / kept)
+
+
+class TestParsePrice:
+    """Tests for the parse_price function."""
+
+    def test_exact(self):
+        """Test prices are parsed to exact 1/10,000."""
+        assert parse_price("1.2345") == 12345
+        assert parse_price("0.1") == 1000
+        assert parse_price("12") == 120000
+        assert parse_price(3) == 30000
+        assert parse_price(0.1) == 1000
+
+    def test_rounding(self):
+        """Test extra decimals are rounded half to even, not truncated."""
+        assert parse_price("0.00005") == 0
+        assert parse_price("0.00015") == 2
+        assert parse_price("1.23456") == 12346
+        assert parse_price("1e-3") == 10
+
+    def test_vectorized(self):
+        """Test parse_prices agrees with parse_price, ties included."""
+        values = ["0.3925", "1", "1234.5678", "0.00015", "0.00025", "2.00005", 7]
+        assert parse_prices(values).tolist() == [parse_price(v) for v in values]
+        assert parse_prices([]).tolist() == []
+
+    def test_to_decimals(self):
+        """Test statistics convert back to Decimals."""
+        assert to_decimals(np.array([1.2345, np.nan])) == [Decimal("1.2345"), None]
+
+
+class TestPriceDetails:
+    """Tests for the PriceDetails class."""
+
+    def test_pack(self):
+        """Test the entries of the guides are packed with their offsets."""
+        details = PriceDetails.from_guides(
+            {"a": guide((1, "0.1"), (2, "0.2")), "b": guide(), "c": guide((3, "1"))}
+        )
+        assert details.keys == ["a", "b", "c"]
+        assert details.offsets.tolist() == [0, 2, 2, 3]
+        assert details.prices.tolist() == [1000, 2000, 10000]
+        assert details.lots.tolist() == [2, 0, 1]
+        assert details.total_quantity().tolist() == [3, 0, 3]
+
+    def test_weighted_median(self):
+        """Test the median is weighted by quantity."""
+        details = PriceDetails.from_guides(
+            [
+                guide((1, "0.05"), (1, "0.06"), (10, "0.10")),
+                guide((5, "1.00"), (5, "2.00")),
+                guide((2, "3.00")),
+            ]
+        )
+        assert details.weighted_median().tolist() == [0.1, 1.0, 3.0]
+
+    def test_percentiles(self):
+        """Test several percentiles, min and max at once."""
+        details = PriceDetails.from_guides(
+            [guide((1, "0.4"), (1, "0.1"), (1, "0.3"), (1, "0.2"))]
+        )
+        assert details.percentile([0, 25, 26, 100]).tolist() == [[0.1, 0.1, 0.2, 0.4]]
+        assert details.min().tolist() == [0.1]
+        assert details.max().tolist() == [0.4]
+        with pytest.raises(ValueError):
+            details.percentile(101)
+
+    def test_trimmed_mean(self):
+        """Test outliers are trimmed by quantity."""
+        details = PriceDetails.from_guides(
+            [guide((1, "0.01"), (8, "1.00"), (1, "99.00")), guide((4, "2"), (6, "3"))]
+        )
+        assert details.trimmed_mean(0.1).tolist() == [1.0, 2.625]
+        assert details.weighted_mean()[1] == pytest.approx(2.6)
+        with pytest.raises(ValueError):
+            details.trimmed_mean(0.5)
+
+    def test_empty_guides(self):
+        """Test guides without entries, and errors kept by
+        return_exceptions, have NaN statistics."""
+        details = PriceDetails.from_guides(
+            [guide(), ValueError("not found"), guide((1, "0.5"))]
+        )
+        stats = details.summary()
+        assert np.isnan(stats["median"][:2]).all()
+        assert np.isnan(stats["trimmed_mean"][:2]).all()
+        assert stats["median"][2] == 0.5
+        assert stats["p90"][2] == 0.5
+        empty = PriceDetails.from_guides([guide()])
+        assert np.isnan(empty.summary()["p10"]).all()
+
+    def test_matches_loops(self):
+        """Test the vectorized statistics match per guide loops on generated
+        guides."""
+        data = StubData(parts=200, lots=1, orders=1)
+        parts = [key for key in data.items if key[0] == "PART"]
+        guides = [
+            data.price_guide(type, no, {"guide_type": guide_type})
+            for type, no in parts
+            for guide_type in ("sold", "stock")
+        ]
+        details = PriceDetails.from_guides(guides)
+        stats = details.summary(percentiles=(5, 25, 75, 95), trim=0.2)
+        for i, guide_ in enumerate(guides):
+            entries = [(e["quantity"], e["unit_price"]) for e in guide_["price_detail"]]
+            if not entries:
+                assert np.isnan(stats["median"][i])
+                continue
+            assert stats["median"][i] == percentile(entries, 50)
+            assert stats["p5"][i] == percentile(entries, 5)
+            assert stats["p95"][i] == percentile(entries, 95)
+            assert stats["trimmed_mean"][i] == pytest.approx(
+                trimmed_mean(entries, Fraction(1, 5))
+            )
+            assert stats["total_quantity"][i] == guide_["total_quantity"]
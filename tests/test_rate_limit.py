@@ -0,0 +1,123 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.rate_limit import RateLimiter
+from bricklink_py.utils import BaseResource, QuotaExceededError, RateLimitError
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """Tests for the RateLimiter class."""
+
+    def test_burst_then_smoothing(self):
+        """Test that calls beyond the burst are spaced by the rate."""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        assert clock.sleeps == [0.5, 0.5]
+        assert clock.now == 1.0
+
+    def test_reserve_does_not_sleep(self):
+        """Test that reserve returns the delay of each reserved call."""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=1, clock=clock, sleep=clock.sleep)
+
+        assert [limiter.reserve() for _ in range(3)] == [0.0, 1.0, 2.0]
+        assert clock.sleeps == []
+
+    def test_daily_quota(self):
+        """Test the remaining counter and the exhausted quota error."""
+        clock = FakeClock()
+        limiter = RateLimiter(daily_limit=3, window=100, clock=clock)
+
+        assert limiter.remaining == 3
+        limiter.acquire()
+        limiter.acquire()
+        assert limiter.remaining == 1
+        limiter.acquire()
+        assert limiter.remaining == 0
+
+        with pytest.raises(QuotaExceededError) as excinfo:
+            limiter.acquire()
+        assert isinstance(excinfo.value, RateLimitError)
+
+        # The quota frees up as the window rolls
+        clock.now = 100
+        assert limiter.remaining == 3
+        limiter.acquire()
+        assert limiter.used == 1
+
+    def test_wait_for_quota(self):
+        """Test that the limiter waits for the oldest calls to expire."""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            daily_limit=2, window=100, wait_for_quota=True, clock=clock
+        )
+
+        clock.now = 10
+        limiter.reserve()
+        clock.now = 20
+        limiter.reserve()
+        clock.now = 50
+
+        assert limiter.reserve() == 60
+        assert limiter.reserve() == 70
+
+    def test_unlimited(self):
+        """Test that a limiter without limits never waits."""
+        limiter = RateLimiter()
+        assert limiter.remaining is None
+        assert all(limiter.reserve() == 0 for _ in range(100))
+
+
+class TestBaseResourceRateLimit:
+    """Tests for the rate limiter integration in BaseResource."""
+
+    def test_limiter_consulted_before_request(self, mock_oauth_session):
+        """Test that _request acquires from the limiter before each call."""
+        limiter = MagicMock()
+        resource = BaseResource(mock_oauth_session, rate_limiter=limiter)
+
+        with patch("bricklink_py.utils.request") as mock_request:
+            mock_request.side_effect = lambda *args: limiter.acquire.call_count
+            assert resource._request("get", "colors") == 1
+            assert resource._request("get", "colors") == 2
+
+    def test_quota_error_skips_request(self, mock_oauth_session):
+        """Test that no request is sent once the quota is exhausted."""
+        limiter = RateLimiter(daily_limit=1)
+        resource = BaseResource(mock_oauth_session, rate_limiter=limiter)
+
+        resource._request("get", "colors")
+        with pytest.raises(QuotaExceededError):
+            resource._request("get", "colors")
+        assert mock_oauth_session.get.call_count == 1
+
+    def test_client_shares_limiter(self, mock_oauth_session):
+        """Test that the client passes its limiter to all resources."""
+        limiter = RateLimiter(daily_limit=5000)
+        with patch("bricklink_py.bricklink.OAuth1Session"):
+            client = Bricklink("ck", "cs", "tk", "tks", rate_limiter=limiter)
+
+        assert client.rate_limiter is limiter
+        assert client.order._rate_limiter is limiter
+        assert client.item_mapping._rate_limiter is limiter
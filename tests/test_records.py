@@ -0,0 +1,133 @@
+import copy
+import pickle
+import sys
+
+import pytest
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.cache import ResponseCache
+from bricklink_py.records import InventoryLot, Item, OrderItem, OrderSummary
+
+pytestmark = pytest.mark.stub_data(parts=50, lots=200, orders=20)
+
+LOT = {
+    "inventory_id": 42,
+    "item": {"no": "3001", "name": "Brick 2 x 4", "type": "PART", "category_id": 5},
+    "color_id": 11,
+    "quantity": 7,
+    "unit_price": "0.1200",
+    "new_or_used": "N",
+    "remarks": "BIN-1",
+    "date_created": "2024-12-01T10:00:00.000Z",
+    "unknown_field": [1, 2],
+}
+
+
+class TestRecord:
+    """Tests for the record types."""
+
+    def test_attributes(self):
+        """Test the fields are read as attributes."""
+        lot = InventoryLot(LOT)
+        assert lot.inventory_id == 42
+        assert lot.quantity == 7
+        assert lot.item.no == "3001"
+        assert isinstance(lot.item, Item)
+
+    def test_mapping(self):
+        """Test the records behave like the payload dict."""
+        lot = InventoryLot(LOT)
+        assert lot == LOT
+        assert dict(lot).keys() == LOT.keys()
+        assert len(lot) == len(LOT)
+        assert lot["item"]["no"] == "3001"
+        assert lot["unknown_field"] == [1, 2]
+        assert lot.get("bind_id") is None
+        assert "bind_id" not in lot
+        assert lot.to_dict() == LOT
+        assert type(lot.to_dict()["item"]) is dict
+
+    def test_missing_fields(self):
+        """Test missing fields raise like a dict would."""
+        lot = InventoryLot({"inventory_id": 1})
+        with pytest.raises(AttributeError):
+            lot.quantity
+        with pytest.raises(KeyError):
+            lot["quantity"]
+
+    def test_lazy_nested(self):
+        """Test nested fields become records on first access only."""
+        lot = InventoryLot(LOT)
+        assert type(lot._item) is dict
+        item = lot.item
+        assert lot.item is item
+        assert type(lot._item) is Item
+
+    def test_interned_strings(self):
+        """Test repeated string values share one object."""
+        first = InventoryLot(dict(LOT, date_created="".join(["2024", "-12-01"])))
+        second = InventoryLot(dict(LOT, date_created="".join(["2024", "-12-01"])))
+        assert first.date_created is second.date_created
+
+    def test_compact(self):
+        """Test a record takes less memory than its dict."""
+        full = {name: 0 for name in InventoryLot._fields}
+        assert sys.getsizeof(InventoryLot(full)) * 2 < sys.getsizeof(full)
+
+    def test_copy_and_pickle(self):
+        """Test records can be copied and pickled."""
+        lot = InventoryLot(LOT)
+        lot.item
+        assert copy.deepcopy(lot) == LOT
+        assert pickle.loads(pickle.dumps(lot)) == LOT
+
+    def test_order(self):
+        """Test the nested records of an order."""
+        order = OrderSummary(
+            {
+                "order_id": 1,
+                "cost": {"currency_code": "USD", "grand_total": "5.00"},
+                "payment": {"method": "PayPal"},
+            }
+        )
+        assert order.cost.grand_total == "5.00"
+        assert order.payment.method == "PayPal"
+
+
+class TestClientRecords:
+    """Tests for the records option of the client."""
+
+    def test_disabled_by_default(self, server, client_for):
+        """Test dicts are returned without the option."""
+        client = client_for(server)
+        assert type(client.store_inventory.get_store_inventories()[0]) is dict
+
+    def test_resources(self, server):
+        """Test the resources return records."""
+        client = Bricklink(
+            "ck",
+            "cs",
+            "tk",
+            "tks",
+            base_url=server.base_url,
+            records=True,
+            cache=ResponseCache(ttl=60),
+        )
+        lots = client.store_inventory.get_store_inventories()
+        assert all(isinstance(lot, InventoryLot) for lot in lots)
+        assert lots == list(server.data.inventories.values())
+
+        cached = client.store_inventory.get_store_inventories()
+        assert isinstance(cached[0], InventoryLot)
+        assert cached == lots
+
+        streamed = list(client.store_inventory.iter_store_inventories())
+        assert isinstance(streamed[0], InventoryLot)
+
+        orders = client.order.get_orders()
+        assert isinstance(orders[0], OrderSummary)
+        batches = client.order.get_order_items(orders[0].order_id)
+        assert isinstance(batches[0][0], OrderItem)
+
+        assert isinstance(client.catalog_item.get_item("PART", "3001"), Item)
+        assert type(client.color.get_color(1)) is dict
@@ -0,0 +1,132 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from bricklink_py.retry import RetryPolicy
+from bricklink_py.utils import (
+    BaseResource,
+    BricklinkError,
+    QuotaExceededError,
+    RateLimitError,
+    ResourceNotFoundError,
+    handle_response,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def sleeps():
+    """Collect the delays slept by a retry policy."""
+    return []
+
+
+@pytest.fixture
+def policy(sleeps):
+    """Create a retry policy without jitter that records its sleeps."""
+    return RetryPolicy(max_attempts=4, jitter=0, sleep=sleeps.append)
+
+
+class TestRetryPolicy:
+    """Tests for the RetryPolicy class."""
+
+    def test_exponential_backoff(self, policy, sleeps):
+        """Test that transient errors are retried with growing delays."""
+        func = MagicMock(
+            side_effect=[
+                BricklinkError(503, "Unavailable"),
+                requests.ConnectionError(),
+                BricklinkError(500, "Error"),
+                {"ok": True},
+            ]
+        )
+
+        assert policy.call(func, "get", "colors") == {"ok": True}
+        assert sleeps == [0.5, 1.0, 2.0]
+        assert policy.stats == {
+            "calls": 1,
+            "retried_calls": 1,
+            "retries": 3,
+            "gave_up": 0,
+        }
+
+    def test_gives_up_after_max_attempts(self, policy, sleeps):
+        """Test that the last error is raised with the attempts made."""
+        func = MagicMock(side_effect=RateLimitError(429, "Rate limit exceeded"))
+
+        with pytest.raises(RateLimitError) as excinfo:
+            policy.call(func, "get", "colors")
+
+        assert excinfo.value.attempts == 4
+        assert func.call_count == 4
+        assert policy.stats["gave_up"] == 1
+
+    def test_non_retryable_errors(self, policy, sleeps):
+        """Test that client errors, quota errors and writes are not retried."""
+        for method, exc in (
+            ("get", ResourceNotFoundError(404, "Not found")),
+            ("get", QuotaExceededError(429, "Daily quota exhausted")),
+            ("put", BricklinkError(503, "Unavailable")),
+            ("post", requests.ConnectionError()),
+        ):
+            func = MagicMock(side_effect=exc)
+            with pytest.raises(type(exc)):
+                policy.call(func, method, "inventories")
+            assert func.call_count == 1
+
+        assert sleeps == []
+
+    def test_retry_after(self, policy, sleeps):
+        """Test that the Retry-After delay is honoured."""
+        func = MagicMock(
+            side_effect=[RateLimitError(429, "Rate limit exceeded", None, 7), {}]
+        )
+
+        policy.call(func, "get", "colors")
+        assert sleeps == [7]
+
+    def test_jitter_and_cap(self):
+        """Test that jitter stays within the capped backoff delay."""
+        policy = RetryPolicy(backoff_factor=1, backoff_max=4, jitter=1.0)
+        delays = [policy.get_delay(retry) for retry in range(1, 10)]
+        assert all(0 <= delay <= 4 for delay in delays)
+
+
+class TestRetryIntegration:
+    """Tests for the retry policy integration in BaseResource."""
+
+    def test_request_retried(self, mock_oauth_session, sleeps):
+        """Test that _request retries failed requests and acquires from the
+        rate limiter before every attempt."""
+        limiter = MagicMock()
+        policy = RetryPolicy(sleep=sleeps.append)
+        resource = BaseResource(
+            mock_oauth_session, rate_limiter=limiter, retry_policy=policy
+        )
+
+        with patch("bricklink_py.utils.request") as mock_request:
+            mock_request.side_effect = [BricklinkError(502, "Bad gateway"), {"a": 1}]
+            assert resource._request("get", "colors") == {"a": 1}
+
+        assert mock_request.call_count == 2
+        assert limiter.acquire.call_count == 2
+
+    def test_rate_limit_error_retry_after(self, mock_response):
+        """Test that handle_response reads the Retry-After header."""
+        response = mock_response(429, {"meta": {"code": 429}})
+        response.headers = {"Retry-After": "12"}
+
+        with pytest.raises(RateLimitError) as excinfo:
+            handle_response(response)
+        assert excinfo.value.retry_after == 12
+
+
+class TestParseRetryAfter:
+    """Tests for the parse_retry_after function."""
+
+    def test_values(self):
+        """Test parsing of delays, past HTTP dates and invalid values."""
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from bricklink_py.single_flight import SingleFlight
+from bricklink_py.utils import BaseResource, ResourceNotFoundError
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight class."""
+
+    def run_concurrently(self, group, func, count=5):
+        """Call group.do with the same key from several threads while func is
+        blocked, and return the outcomes of the calls."""
+        release = threading.Event()
+
+        def blocked():
+            release.wait(5)
+            return func()
+
+        def call():
+            try:
+                return group.do("key", blocked)
+            except Exception as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(call) for _ in range(count)]
+            while group.saved < count - 1:
+                time.sleep(0.001)
+            release.set()
+            return [future.result() for future in futures]
+
+    def test_identical_calls_share_result(self):
+        """Test that concurrent calls share one execution and get copies."""
+        group = SingleFlight()
+        func = MagicMock(return_value={"avg_price": "1.00"})
+
+        results = self.run_concurrently(group, func)
+
+        assert func.call_count == 1
+        assert all(result == {"avg_price": "1.00"} for result in results)
+        assert len({id(result) for result in results}) == 5
+        assert group.stats() == {"calls": 1, "saved": 4}
+
+    def test_leader_result_not_shared(self):
+        """Test the caller of the leading call mutating its result does not
+        change the copies of the waiters."""
+        group = SingleFlight()
+        release = threading.Event()
+
+        def blocked():
+            release.wait(5)
+            return {"seen": []}
+
+        def call(index):
+            result = group.do("key", blocked)
+            result["seen"].append(index)
+            return result
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(call, index) for index in range(5)]
+            while group.saved < 4:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+        assert [result["seen"] for result in results] == [[i] for i in range(5)]
+
+    def test_exception_shared(self):
+        """Test that all the waiting callers get the exception."""
+        group = SingleFlight()
+        error = ResourceNotFoundError(404, "Not found")
+
+        results = self.run_concurrently(group, MagicMock(side_effect=error))
+        assert results == [error] * 5
+
+    def test_sequential_calls_not_shared(self):
+        """Test that calls made one after the other are not coalesced."""
+        group = SingleFlight()
+        func = MagicMock(return_value=1)
+
+        assert group.do("key", func) == 1
+        assert group.do("key", func) == 1
+        assert func.call_count == 2
+        assert group.saved == 0
+
+        with pytest.raises(ValueError):
+            group.do("key", MagicMock(side_effect=ValueError))
+
+
+class TestSingleFlightRequests:
+    """Tests for the single flight integration in BaseResource."""
+
+    def test_only_gets_coalesced(self, mock_oauth_session):
+        """Test that _request coalesces GETs with the same parameters."""
+        group = MagicMock(wraps=SingleFlight())
+        resource = BaseResource(mock_oauth_session, single_flight=group)
+
+        resource._request("get", "items/PART/3001/price", {"a": 1, "b": None})
+        resource._request("put", "inventories/1", body={"quantity": "+1"})
+
+        group.do.assert_called_once()
+        assert group.do.call_args.args[0] == "GET items/PART/3001/price?a=1"
+        assert mock_oauth_session.put.call_count == 1
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.streaming import JSONArrayStream
+from bricklink_py.utils import RateLimitError, ResourceNotFoundError, data_parser
+
+pytestmark = pytest.mark.stub_data(lots=10000, orders=500)
+
+
+def parse(body: bytes, chunk_size: int, parser=None):
+    """Feed a body to a parser by chunks and return every record."""
+    parser = parser or JSONArrayStream("data")
+    records = []
+    for start in range(0, len(body), chunk_size):
+        records.extend(parser.feed(body[start : start + chunk_size]))
+    records.extend(parser.close())
+    return records
+
+
+class TestJSONArrayStream:
+    """Tests for the incremental JSON array parser."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+    def test_chunks(self, chunk_size):
+        """Test records split across chunks are parsed."""
+        records = [
+            {"inventory_id": i, "remarks": "café ☃", "price": 1.5e-3 * i}
+            for i in range(50)
+        ]
+        body = json.dumps(
+            {"meta": {"code": 200}, "data": records}, indent=2, ensure_ascii=False
+        ).encode()
+        parser = JSONArrayStream("data")
+
+        assert parse(body, chunk_size, parser) == records
+        assert parser.values == {"meta": {"code": 200}}
+
+    def test_numbers(self):
+        """Test numbers split across chunks are not truncated."""
+        assert parse(b'{"data": [12345, 678]}', 3) == [12345, 678]
+
+    def test_numbers_byte_by_byte(self):
+        """Test floats and exponents cut after any byte are not split."""
+        body = b'{"meta": {"n": -1.5E+2}, "data": [1.0, 12.5e-3, 3E2, -0.25, 7]}'
+        parser = JSONArrayStream("data")
+        assert parse(body, 1, parser) == [1.0, 12.5e-3, 3e2, -0.25, 7]
+        assert parser.values == {"meta": {"n": -150.0}}
+        assert parse(b'{"data":[1.0]}', 1) == [1.0]
+
+    def test_meta_after_data(self):
+        """Test members after the array are parsed."""
+        parser = JSONArrayStream("data")
+        assert parse(b'{"data": [], "meta": {"code": 200}}', 4, parser) == []
+        assert parser.values["meta"] == {"code": 200}
+
+    def test_single_record(self):
+        """Test a data object that is not an array is returned whole."""
+        assert parse(b'{"data": {"order_id": 1}}', 5) == [{"order_id": 1}]
+
+    def test_truncated(self):
+        """Test a truncated body raises ValueError."""
+        with pytest.raises(ValueError):
+            parse(b'{"data": [{"a": 1}, {"a"', 4)
+
+    def test_not_json(self):
+        """Test a body that is not a JSON object raises ValueError."""
+        with pytest.raises(ValueError):
+            parse(b"<html>Bad gateway</html>", 4)
+
+    def test_meta_error(self):
+        """Test the error of the meta is raised before any record."""
+        body = b'{"meta": {"code": 429, "message": "TOO_MANY"}, "data": [{"a": 1}]}'
+        parser = data_parser({"Retry-After": "3"})
+        with pytest.raises(RateLimitError) as exc_info:
+            parser.feed(body[:50])
+        assert exc_info.value.retry_after == 3
+
+
+class TestStreamRequest:
+    """Tests for the streaming resource methods, against the stub server."""
+
+    def test_iter_store_inventories(self, server, client_for):
+        """Test streaming returns the same lots as the whole response."""
+        client = client_for(server)
+        lots = client.store_inventory.get_store_inventories(status="-R")
+        assert list(client.store_inventory.iter_store_inventories(status="-R")) == lots
+
+    def test_iter_orders(self, server, client_for):
+        """Test streaming the orders."""
+        client = client_for(server)
+        assert list(client.order.iter_orders()) == client.order.get_orders()
+
+    def test_memory_flat(self, server, client_for):
+        """Test streaming keeps far less memory than the whole response."""
+        client = client_for(server)
+        client.store_inventory.get_store_inventories()  # warm the stub
+
+        def peak(func):
+            tracemalloc.start()
+            try:
+                func()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        def consume():
+            for lot in client.store_inventory.iter_store_inventories():
+                pass
+
+        whole = peak(client.store_inventory.get_store_inventories)
+        assert peak(consume) < whole / 3
+
+    def test_error(self, server):
+        """Test API errors are raised by the iterator."""
+        client = Bricklink("ck", "cs", "tk", "tks", base_url=server.base_url + "x/")
+        with pytest.raises(ResourceNotFoundError):
+            list(client.store_inventory.iter_store_inventories())
+
+    def test_async(self, server):
+        """Test streaming with the async client."""
+        pytest.importorskip("aiohttp")
+        from bricklink_py.async_bricklink import AsyncBricklink
+
+        async def collect():
+            async with AsyncBricklink(
+                "ck", "cs", "tk", "tks", base_url=server.base_url
+            ) as client:
+                return [
+                    lot async for lot in client.store_inventory.iter_store_inventories()
+                ]
+
+        lots = asyncio.run(collect())
+        assert len(lots) == len(server.data.inventories)
@@ -0,0 +1,205 @@
+from decimal import Decimal
+
+import pytest
+import requests
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.retry import RetryPolicy
+from bricklink_py.stub_server import StubData, StubServer, _matches
+from bricklink_py.utils import (
+    AuthenticationError,
+    BricklinkError,
+    RateLimitError,
+    ResourceNotFoundError,
+)
+
+CREDENTIALS = ("ck", "cs", "tk", "tks")
+
+
+@pytest.fixture
+def server():
+    """Start a stub server checking the OAuth signatures."""
+    with StubServer(
+        data=StubData(parts=50, minifigs=10, sets=10, lots=100, orders=10),
+        credentials=CREDENTIALS,
+    ) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    """Create a client talking to the stub server."""
+    client = Bricklink(*CREDENTIALS, base_url=server.base_url)
+    yield client
+    client.oauth_session.close()
+
+
+class TestStubData:
+    """Tests for the synthetic data."""
+
+    def test_deterministic(self):
+        """Test the same seed generates the same data."""
+        first = StubData(parts=20, lots=30, orders=5, seed=1)
+        second = StubData(parts=20, lots=30, orders=5, seed=1)
+        assert first.inventories == second.inventories
+        assert first.orders == second.orders
+        assert first.price_guide("PART", "3001", {}) == second.price_guide(
+            "PART", "3001", {}
+        )
+
+    def test_scale(self):
+        """Test the data is generated at the requested scale."""
+        data = StubData(parts=20, minifigs=5, sets=5, lots=300, orders=7)
+        assert len(data.inventories) == 300
+        assert len(data.orders) == 7
+        assert len(data.part_nos) == 20
+
+    def test_matches(self):
+        """Test the include and exclude filters."""
+        assert _matches("P", None)
+        assert _matches("P", "P,S")
+        assert not _matches("B", "P,S")
+        assert not _matches("N", "-N,-R")
+        assert _matches("Y", "-N,-R")
+
+
+class TestStubServer:
+    """Tests for the stub server, through the client."""
+
+    def test_catalog(self, client):
+        """Test the catalog endpoints."""
+        item = client.catalog_item.get_item("PART", "3001")
+        assert item["no"] == "3001"
+
+        guide = client.catalog_item.get_price_guide("PART", "3001", guide_type="sold")
+        assert guide["unit_quantity"] == len(guide["price_detail"])
+        assert len(client.color.get_color_list()) == 60
+
+        with pytest.raises(ResourceNotFoundError):
+            client.catalog_item.get_item("PART", "missing")
+
+    def test_subsets(self, client, server):
+        """Test breaking minifigs down into parts."""
+        no = server.data.set_nos[0]
+        subsets = client.catalog_item.get_subsets("SET", no)
+        broken = client.catalog_item.get_subsets("SET", no, break_minifigs=True)
+
+        types = {entry["entries"][0]["item"]["type"] for entry in broken}
+        assert types == {"PART"}
+
+        def count(groups):
+            return sum(group["entries"][0]["quantity"] for group in groups)
+
+        minifig_parts = sum(
+            count(server.data.subsets[("MINIFIG", group["entries"][0]["item"]["no"])])
+            * group["entries"][0]["quantity"]
+            for group in subsets
+            if group["entries"][0]["item"]["type"] == "MINIFIG"
+        )
+        minifigs = sum(
+            group["entries"][0]["quantity"]
+            for group in subsets
+            if group["entries"][0]["item"]["type"] == "MINIFIG"
+        )
+        assert count(broken) == count(subsets) - minifigs + minifig_parts
+
+    def test_inventory_filters(self, client, server):
+        """Test the inventory filters."""
+        lots = client.store_inventory.get_store_inventories(status="-N,-R")
+        expected = [
+            lot
+            for lot in server.data.inventories.values()
+            if lot["status"] not in ("N", "R")
+        ]
+        assert len(lots) == len(expected)
+
+    def test_inventory_writes(self, client):
+        """Test creating, updating and deleting a lot."""
+        lot = client.store_inventory.create_store_inventory(
+            {
+                "item": {"no": "3001", "type": "PART"},
+                "color_id": 1,
+                "quantity": 10,
+                "unit_price": "0.5",
+                "new_or_used": "N",
+            }
+        )
+        inventory_id = lot["inventory_id"]
+
+        client.store_inventory.update_store_inventory(inventory_id, {"quantity": "+5"})
+        client.store_inventory.update_store_inventory(inventory_id, {"quantity": "-3"})
+        lot = client.store_inventory.get_store_inventory(inventory_id)
+        assert lot["quantity"] == 12
+
+        client.store_inventory.delete_store_inventory(inventory_id)
+        with pytest.raises(ResourceNotFoundError):
+            client.store_inventory.get_store_inventory(inventory_id)
+
+    def test_create_validation(self, client):
+        """Test creating a lot of an unknown item fails."""
+        with pytest.raises(BricklinkError) as exc_info:
+            client.store_inventory.create_store_inventory(
+                {"item": {"no": "nope", "type": "PART"}, "color_id": 1}
+            )
+        assert exc_info.value.status_code == 400
+
+    def test_orders(self, client):
+        """Test listing and reading orders."""
+        orders = client.order.get_orders()
+        order = client.order.get_order(orders[0]["order_id"])
+        items = client.order.get_order_items(order["order_id"])
+        assert len(items[0]) == order["unique_count"]
+
+    def test_signature_checked(self, server):
+        """Test requests signed with other credentials are rejected."""
+        client = Bricklink("ck", "wrong", "tk", "tks", base_url=server.base_url)
+        with pytest.raises(AuthenticationError):
+            client.color.get_color_list()
+
+        response = requests.get(f"{server.base_url}colors")
+        assert response.status_code == 401
+
+    def test_injected_errors(self):
+        """Test the injected 503 and 429 errors."""
+        with StubServer(data=StubData(lots=10), error_rate=1.0) as server:
+            client = Bricklink(*CREDENTIALS, base_url=server.base_url)
+            with pytest.raises(BricklinkError) as exc_info:
+                client.color.get_color_list()
+            assert exc_info.value.status_code == 503
+
+        with StubServer(
+            data=StubData(lots=10), rate_limit_rate=1.0, retry_after=7
+        ) as server:
+            client = Bricklink(*CREDENTIALS, base_url=server.base_url)
+            with pytest.raises(RateLimitError) as exc_info:
+                client.color.get_color_list()
+            assert exc_info.value.retry_after == 7
+
+    def test_daily_limit_with_retry(self):
+        """Test the retry policy gives up once the daily limit is reached."""
+        with StubServer(data=StubData(lots=10), daily_limit=2, retry_after=0) as server:
+            client = Bricklink(
+                *CREDENTIALS,
+                base_url=server.base_url,
+                retry_policy=RetryPolicy(max_attempts=2, sleep=lambda seconds: None),
+            )
+            client.color.get_color_list()
+            client.category.get_category_list()
+            with pytest.raises(RateLimitError):
+                client.setting.get_shipping_methods()
+            assert server.request_count == 4
+
+    def test_json_codec(self, server):
+        """Test a client using the fastest installed codec."""
+        client = Bricklink(*CREDENTIALS, base_url=server.base_url, json_codec="auto")
+        lot = client.store_inventory.create_store_inventory(
+            {
+                "item": {"no": "3001", "type": "PART"},
+                "color_id": 1,
+                "quantity": 1,
+                "unit_price": Decimal("0.125"),
+                "new_or_used": "U",
+            }
+        )
+        assert lot["unit_price"] == "0.1250"
+        assert client.store_inventory.get_store_inventory(lot["inventory_id"]) == lot
@@ -0,0 +1,201 @@
+import copy
+
+import pytest
+
+from bricklink_py.bricklink import Bricklink
+from bricklink_py.inventory_index import InventoryIndex
+from bricklink_py.rate_limit import RateLimiter
+from bricklink_py.sync import InventorySync, diff_inventory, update_body
+from bricklink_py.utils import QuotaExceededError
+from bricklink_py.write_behind import WriteBehindBuffer
+
+pytestmark = pytest.mark.stub_data(parts=50, lots=300, orders=20)
+
+
+def make_lot(inventory_id, no="3001", color_id=11, **fields):
+    """Build a store inventory lot."""
+    return {
+        "inventory_id": inventory_id,
+        "item": {"no": no, "type": "PART", "name": "Brick", "category_id": 5},
+        "color_id": color_id,
+        "new_or_used": "N",
+        "quantity": 10,
+        "unit_price": "0.1000",
+        "remarks": "",
+        "date_created": "2024-12-01T10:00:00.000Z",
+        **fields,
+    }
+
+
+class TestDiff:
+    """Tests for the diff of the current and desired lots."""
+
+    def test_unchanged(self):
+        """Test identical lots need no call, prices being compared by
+        value."""
+        current = [make_lot(1), make_lot(2, no="3002")]
+        desired = [make_lot(1, unit_price=0.1), make_lot(2, no="3002")]
+        plan = diff_inventory(current, desired)
+        assert len(plan) == 0
+        assert not plan
+        assert plan.unchanged == 2
+
+    def test_update_body(self):
+        """Test only the changed fields are sent, the quantity as a delta."""
+        current = make_lot(1)
+        assert update_body(current, make_lot(1, quantity=13)) == {"quantity": "+3"}
+        assert update_body(current, make_lot(1, quantity=4, remarks="B")) == {
+            "quantity": "-6",
+            "remarks": "B",
+        }
+        assert update_body(current, {"unit_price": "0.12"}) == {"unit_price": "0.12"}
+        body = update_body(current, {"tier_price1": "0.09"})
+        assert body["tier_price1"] == "0.09"
+        assert set(body) == {
+            "tier_quantity1",
+            "tier_price1",
+            "tier_quantity2",
+            "tier_price2",
+            "tier_quantity3",
+            "tier_price3",
+        }
+
+    def test_match_by_item(self):
+        """Test desired lots without inventory ID are matched by item, color,
+        condition and preferably remarks."""
+        current = [make_lot(1, remarks="A"), make_lot(2, remarks="B")]
+        wanted = make_lot(None, remarks="B", quantity=12)
+        del wanted["inventory_id"]
+        plan = diff_inventory(current, [wanted])
+        assert plan.updates == [(2, {"quantity": "+2"})]
+        assert plan.deletes == [1]
+
+    def test_create_and_delete(self):
+        """Test missing lots are created and extra lots deleted."""
+        current = [make_lot(1), make_lot(2, no="3002"), make_lot(3, no="3003")]
+        new = make_lot(None, no="3004")
+        del new["inventory_id"]
+        desired = [make_lot(1), make_lot(2, no="3002", quantity=0), new]
+        plan = diff_inventory(current, desired)
+        assert plan.creates == [
+            {
+                "item": {"no": "3004", "type": "PART"},
+                "color_id": 11,
+                "quantity": 10,
+                "unit_price": "0.1000",
+                "new_or_used": "N",
+                "remarks": "",
+            }
+        ]
+        assert sorted(plan.deletes) == [2, 3]
+
+        plan = diff_inventory(current, desired, delete_missing=False)
+        assert plan.deletes == [2]
+
+    def test_replace(self):
+        """Test a lot whose color changed is deleted and created again."""
+        plan = diff_inventory([make_lot(1)], [make_lot(1, color_id=5)])
+        assert plan.deletes == [1]
+        assert plan.creates[0]["color_id"] == 5
+
+    def test_stale_inventory_id(self):
+        """Test a lot whose inventory ID left the store is matched by item,
+        so planning the same snapshot again after a sync is empty."""
+        desired = [make_lot(1, color_id=5)]
+        plan = diff_inventory([make_lot(1), make_lot(2, no="3002")], desired)
+        assert plan.deletes == [1, 2] and len(plan.creates) == 1
+
+        # The lot created again got a new inventory ID
+        plan = diff_inventory([make_lot(7, color_id=5)], desired)
+        assert len(plan) == 0
+        assert plan.unchanged == 1
+
+
+class TestInventorySync:
+    """Tests for the InventorySync class, against the stub server."""
+
+    def test_sync(self, fresh_server, client_for):
+        """Test the store ends in the desired state with minimal calls."""
+        client = client_for(fresh_server)
+        index = client.store_inventory.attach_index(InventoryIndex())
+        desired = copy.deepcopy(list(fresh_server.data.inventories.values()))
+        desired[0]["quantity"] += 5
+        desired[1]["unit_price"] = "9.9900"
+        removed = desired.pop(2)["inventory_id"]
+        new = dict(desired[3], remarks="NEW")
+        del new["inventory_id"]
+        desired.append(new)
+
+        sync = InventorySync(client, max_workers=4)
+        plan = sync.plan(desired)
+        assert len(plan) == 4
+        index.update(fresh_server.data.inventories.values())
+
+        calls = fresh_server.request_count
+        result = sync.apply(plan)
+        assert result.ok
+        assert fresh_server.request_count - calls == 4
+        assert len(result.created) == 1
+        assert len(result.updated) == 2
+        assert result.deleted == [removed]
+
+        assert removed not in fresh_server.data.inventories
+        assert fresh_server.data.inventories[desired[0]["inventory_id"]][
+            "quantity"
+        ] == (desired[0]["quantity"])
+        assert index.get(result.created[0]["inventory_id"])["remarks"] == "NEW"
+        assert not sync.plan(desired)
+
+    def test_write_behind(self, fresh_server, client_for):
+        """Test the updates are sent, not buffered, with a write-behind
+        buffer attached, and pending updates are flushed before planning."""
+        client = client_for(fresh_server)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_delay=None)
+        )
+        lots = copy.deepcopy(list(fresh_server.data.inventories.values())[:2])
+        client.store_inventory.update_store_inventory(
+            lots[0]["inventory_id"], {"quantity": "+1"}
+        )
+        desired = [dict(lot, quantity=lot["quantity"] + 3) for lot in lots]
+
+        sync = InventorySync(client, delete_missing=False)
+        result = sync.sync(desired)
+        assert result.ok
+        assert len(buffer) == 0
+        assert [lot["quantity"] for lot in result.updated] == [
+            lot["quantity"] for lot in desired
+        ]
+        for lot in desired:
+            assert fresh_server.data.inventories[lot["inventory_id"]]["quantity"] == (
+                lot["quantity"]
+            )
+        buffer.close()
+
+    def test_errors(self, fresh_server, client_for):
+        """Test failed calls are reported without stopping the others."""
+        client = client_for(fresh_server)
+        lot = next(iter(fresh_server.data.inventories.values()))
+        plan = diff_inventory(
+            [make_lot(123456789), lot], [make_lot(123456789, quantity=1)]
+        )
+        result = InventorySync(client).apply(plan)
+        assert not result.ok
+        assert result.errors[0][:2] == ("update", {"quantity": "-9"})
+        assert result.deleted == [lot["inventory_id"]]
+
+    def test_quota(self, fresh_server):
+        """Test nothing is sent when the quota cannot cover the plan."""
+        client = Bricklink(
+            "ck",
+            "cs",
+            "tk",
+            "tks",
+            base_url=fresh_server.base_url,
+            rate_limiter=RateLimiter(daily_limit=2),
+        )
+        plan = diff_inventory(list(fresh_server.data.inventories.values())[:3], [])
+        calls = fresh_server.request_count
+        with pytest.raises(QuotaExceededError):
+            InventorySync(client).apply(plan)
+        assert fresh_server.request_count == calls
@@ -0,0 +1,110 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bricklink_py.records import InventoryLot, to_records  # noqa: E402
+from bricklink_py.table import InventoryTable  # noqa: E402
+
+
+def lot(inventory_id, no, color_id, quantity, price, category_id=1, **fields):
+    return {
+        "inventory_id": inventory_id,
+        "item": {"no": no, "type": "PART", "category_id": category_id},
+        "color_id": color_id,
+        "quantity": quantity,
+        "unit_price": price,
+        "new_or_used": "N",
+        "status": "Y",
+        "remarks": "",
+        **fields,
+    }
+
+
+LOTS = [
+    lot(1, "3001", 5, 10, "0.1000", category_id=1),
+    lot(2, "3001", 11, 4, "0.0300", category_id=1),
+    lot(3, "3003", 5, 20, "0.0500", category_id=2, new_or_used="U"),
+    lot(4, "3004", 1, 1, "2.5000", category_id=2, status="S"),
+]
+
+
+@pytest.fixture
+def table():
+    """Build a table of four lots."""
+    return InventoryTable.from_lots(LOTS)
+
+
+class TestInventoryTable:
+    """Tests for the InventoryTable class."""
+
+    def test_from_lots(self, table):
+        """Test the columns are built from the lots."""
+        assert len(table) == 4
+        assert table["inventory_id"].tolist() == [1, 2, 3, 4]
+        assert table["item_no"].tolist() == ["3001", "3001", "3003", "3004"]
+        assert table["unit_price"].dtype == np.float64
+        assert table["stock_value"].tolist() == pytest.approx([1.0, 0.12, 1.0, 2.5])
+
+    def test_from_records(self):
+        """Test records give the same table as dicts."""
+        table = InventoryTable.from_lots(to_records(LOTS, InventoryLot))
+        assert table["quantity"].tolist() == [10, 4, 20, 1]
+
+    def test_filter(self, table):
+        """Test filtering by mask and conditions."""
+        cheap = table.filter(table["unit_price"] < 0.08)
+        assert cheap["inventory_id"].tolist() == [2, 3]
+
+        new_cheap = table.filter(table["unit_price"] < 0.08, new_or_used="N")
+        assert new_cheap["inventory_id"].tolist() == [2]
+
+        colors = table.filter(color_id=[5, 1])
+        assert colors["inventory_id"].tolist() == [1, 3, 4]
+
+    def test_sort(self, table):
+        """Test sorting by several columns."""
+        ordered = table.sort("item_no", "unit_price", descending=True)
+        assert ordered["inventory_id"].tolist() == [4, 3, 1, 2]
+
+    def test_group_by(self, table):
+        """Test aggregating by category."""
+        result = table.group_by("category_id").agg(
+            lots=("inventory_id", "count"),
+            quantity=("quantity", "sum"),
+            value=("stock_value", "sum"),
+            cheapest=("unit_price", "min"),
+            average=("unit_price", "mean"),
+        )
+        assert result["category_id"].tolist() == [1, 2]
+        assert result["lots"].tolist() == [2, 2]
+        assert result["quantity"].tolist() == [14, 21]
+        assert result["quantity"].dtype == np.int64
+        assert result["value"].tolist() == pytest.approx([1.12, 3.5])
+        assert result["cheapest"].tolist() == pytest.approx([0.03, 0.05])
+        assert result["average"].tolist() == pytest.approx([0.065, 1.275])
+
+    def test_group_by_several_keys(self, table):
+        """Test grouping by two columns."""
+        result = table.group_by("item_no", "color_id").count()
+        assert list(zip(result["item_no"], result["color_id"], result["count"])) == [
+            ("3001", 5, 1),
+            ("3001", 11, 1),
+            ("3003", 5, 1),
+            ("3004", 1, 1),
+        ]
+
+    def test_empty(self):
+        """Test an empty table."""
+        table = InventoryTable.from_lots([])
+        assert len(table) == 0
+        result = table.group_by("color_id").agg(top=("unit_price", "max"))
+        assert len(result["top"]) == 0
+
+    def test_rows_and_with_column(self, table):
+        """Test adding a column and reading rows back."""
+        repriced = table.with_column("new_price", table["unit_price"] * 1.1)
+        row = next(repriced.rows())
+        assert row["inventory_id"] == 1
+        assert row["new_price"] == pytest.approx(0.11)
+        with pytest.raises(ValueError):
+            table.with_column("bad", [1])
@@ -8,6 +8,7 @@ from bricklink_py.utils import (
     BricklinkError,
     RateLimitError,
     ResourceNotFoundError,
+    endpoint_template,
     handle_response,
     request,
 )
@@ -167,3 +168,14 @@ class TestRequest:
         with pytest.raises(ValueError) as excinfo:
             request("invalid", mock_oauth_session, "test_endpoint")
         assert "Unsupported HTTP method" in str(excinfo.value)
+
+
+class TestEndpointTemplate:
+    """Tests for the endpoint_template function."""
+
+    def test_templates(self):
+        """Test matching URIs against the endpoint templates."""
+        assert endpoint_template("items/SET/75281-1/price") == "items/{type}/{no}/price"
+        assert endpoint_template("item_mapping/300121") == "item_mapping/{element_id}"
+        assert endpoint_template("orders/1/items") == "orders/{order_id}/items"
+        assert endpoint_template("unknown/uri") == "unknown/uri"
@@ -0,0 +1,229 @@
+import time
+
+import pytest
+
+from bricklink_py.rate_limit import RateLimiter
+from bricklink_py.write_behind import Journal, WriteBehindBuffer, merge_updates
+
+pytestmark = pytest.mark.stub_data(parts=50, lots=100, orders=10)
+
+
+class TestMergeUpdates:
+    """Tests for the merge_updates function."""
+
+    def test_deltas(self):
+        """Test quantity deltas are summed."""
+        assert merge_updates({"quantity": "+3"}, {"quantity": "-1"}) == {
+            "quantity": "+2"
+        }
+        assert merge_updates({"quantity": "-3"}, {"quantity": "-1"}) == {
+            "quantity": "-4"
+        }
+        assert merge_updates({"quantity": "+1"}, {"quantity": "-1"}) == {}
+
+    def test_absolute(self):
+        """Test absolute quantities override and absorb deltas."""
+        assert merge_updates({"quantity": "+3"}, {"quantity": 5}) == {"quantity": 5}
+        assert merge_updates({"quantity": 5}, {"quantity": "-2"}) == {"quantity": 3}
+
+    def test_last_writer_wins(self):
+        """Test other fields keep the last value."""
+        assert merge_updates(
+            {"unit_price": "1.00", "remarks": "A"}, {"unit_price": "0.90"}
+        ) == {"unit_price": "0.90", "remarks": "A"}
+
+
+class TestWriteBehindBuffer:
+    """Tests for the WriteBehindBuffer class, against the stub server."""
+
+    def test_coalesce(self, fresh_server, client_for):
+        """Test the updates of a lot are sent as one call."""
+        client = client_for(fresh_server)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_delay=None)
+        )
+        ids = list(fresh_server.data.inventories)[:10]
+        quantities = {i: fresh_server.data.inventories[i]["quantity"] for i in ids}
+        for i in ids:
+            assert (
+                client.store_inventory.update_store_inventory(
+                    i, {"unit_price": "1.000"}
+                )
+                is None
+            )
+            client.store_inventory.update_store_inventory(i, {"quantity": "+5"})
+            client.store_inventory.update_store_inventory(
+                i, {"quantity": "-2", "unit_price": "0.900"}
+            )
+        assert len(buffer) == 10
+        assert fresh_server.request_count == 0
+
+        report = buffer.flush()
+        assert report.ok
+        assert fresh_server.request_count == 10
+        assert len(buffer) == 0
+        assert buffer.updates == 30 and buffer.sent == 10
+        for i in ids:
+            lot = fresh_server.data.inventories[i]
+            assert lot["quantity"] == quantities[i] + 3
+            assert lot["unit_price"] == "0.900"
+
+    def test_cancelled_out(self, fresh_server, client_for):
+        """Test updates cancelling out cost no call."""
+        client = client_for(fresh_server)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_delay=None)
+        )
+        inventory_id = next(iter(fresh_server.data.inventories))
+        client.store_inventory.update_store_inventory(inventory_id, {"quantity": "+1"})
+        client.store_inventory.update_store_inventory(inventory_id, {"quantity": "-1"})
+        assert len(buffer.flush()) == 0
+        assert fresh_server.request_count == 0
+
+    def test_max_pending(self, fresh_server, client_for):
+        """Test a flush is triggered by the number of pending lots."""
+        client = client_for(fresh_server)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_pending=5, max_delay=None)
+        )
+        for inventory_id in list(fresh_server.data.inventories)[:12]:
+            client.store_inventory.update_store_inventory(
+                inventory_id, {"remarks": "X"}
+            )
+        assert fresh_server.request_count == 10
+        assert len(buffer) == 2
+
+    def test_max_delay(self, fresh_server, client_for):
+        """Test pending updates are flushed after max_delay."""
+        client = client_for(fresh_server)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_delay=0.1)
+        )
+        inventory_id = next(iter(fresh_server.data.inventories))
+        client.store_inventory.update_store_inventory(inventory_id, {"remarks": "T"})
+        deadline = time.monotonic() + 5
+        while not buffer.sent and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert fresh_server.data.inventories[inventory_id]["remarks"] == "T"
+        buffer.close()
+
+    def test_failed(self, fresh_server, client_for):
+        """Test updates failing for good are dropped and reported."""
+        client = client_for(fresh_server)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_delay=None)
+        )
+        client.store_inventory.update_store_inventory(123456789, {"remarks": "X"})
+        report = buffer.flush()
+        assert not report.ok
+        assert len(buffer) == 0
+        assert buffer.failed[0].inventory_id == 123456789
+
+    def test_journal_replay(self, fresh_server, tmp_path, client_for):
+        """Test pending updates survive a crash through the journal."""
+        path = tmp_path / "updates.log"
+        client = client_for(fresh_server)
+        ids = list(fresh_server.data.inventories)[:3]
+        quantity = fresh_server.data.inventories[ids[0]]["quantity"]
+
+        crashed = WriteBehindBuffer(max_delay=None, journal=path, fsync=False)
+        client.store_inventory.attach_write_behind(crashed)
+        client.store_inventory.update_store_inventory(ids[0], {"quantity": "+4"})
+        client.store_inventory.update_store_inventory(ids[1], {"remarks": "R"})
+        crashed.flush()
+        client.store_inventory.update_store_inventory(ids[0], {"quantity": "+1"})
+        client.store_inventory.update_store_inventory(ids[2], {"remarks": "S"})
+        crashed._journal._file.write('{"seq": 9, "id"')  # torn last record
+        crashed._journal._file.flush()
+
+        resumed = WriteBehindBuffer(max_delay=None, journal=path, fsync=False)
+        assert resumed.pending() == {
+            ids[0]: {"quantity": "+1"},
+            ids[2]: {"remarks": "S"},
+        }
+        client.store_inventory.attach_write_behind(resumed)
+        resumed.close()
+        assert fresh_server.data.inventories[ids[0]]["quantity"] == quantity + 5
+        assert fresh_server.data.inventories[ids[2]]["remarks"] == "S"
+        assert path.read_text() == ""
+
+    def test_close_detaches(self, fresh_server, tmp_path, client_for):
+        """Test updates made after the buffer is closed are sent at once."""
+        client = client_for(fresh_server)
+        lot_id = list(fresh_server.data.inventories)[0]
+        with client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(journal=str(tmp_path / "j.log"), fsync=False)
+        ) as buffer:
+            client.store_inventory.update_store_inventory(lot_id, {"remarks": "A"})
+        assert buffer.sent == 1
+
+        calls = fresh_server.request_count
+        lot = client.store_inventory.update_store_inventory(lot_id, {"remarks": "B"})
+        assert lot["remarks"] == "B"
+        assert fresh_server.request_count - calls == 1
+        assert fresh_server.data.inventories[lot_id]["remarks"] == "B"
+        assert len(buffer) == 0
+        with pytest.raises(RuntimeError):
+            buffer.add(lot_id, {"remarks": "C"})
+
+    def test_quota_requeued(self, fresh_server, client_for):
+        """Test updates held back by the daily quota stay pending."""
+        limiter = RateLimiter(daily_limit=2)
+        client = client_for(fresh_server, rate_limiter=limiter)
+        buffer = client.store_inventory.attach_write_behind(
+            WriteBehindBuffer(max_delay=None, max_workers=1)
+        )
+        ids = list(fresh_server.data.inventories)[:5]
+        for i in ids:
+            client.store_inventory.update_store_inventory(i, {"remarks": "Q"})
+        report = buffer.flush()
+        assert len(report.succeeded) == 2
+        assert fresh_server.request_count == 2
+        assert len(buffer) == 3 and buffer.failed == []
+
+        limiter.daily_limit = None
+        assert buffer.flush().ok
+        assert len(buffer) == 0 and buffer.sent == 5
+        assert all(fresh_server.data.inventories[i]["remarks"] == "Q" for i in ids)
+
+    def test_journal_record(self, tmp_path):
+        """Test the records of sent updates drop the earlier updates only."""
+        journal = Journal(tmp_path / "j.log", fsync=False)
+        journal.update(1, 7, {"quantity": "+1"})
+        journal.update(2, 8, {"remarks": "A"})
+        journal.update(3, 7, {"quantity": "+2"})
+        journal.sent(1, 7)
+        assert journal.replay() == [
+            (2, 8, {"remarks": "A"}),
+            (3, 7, {"quantity": "+2"}),
+        ]
+
+    def test_journal_torn_record(self, tmp_path):
+        """Test the records following a record torn by a crash are kept."""
+        path = tmp_path / "j.log"
+        journal = Journal(path, fsync=False)
+        journal.update(1, 5, {"quantity": "+1"})
+        journal.close()
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"seq": 2, "id": 6, "bo')
+
+        journal = Journal(path, fsync=False)
+        assert journal.replay() == [(1, 5, {"quantity": "+1"})]
+        journal.update(3, 7, {"remarks": "A"})
+        journal.close()
+
+        journal = Journal(path, fsync=False)
+        assert journal.replay() == [
+            (1, 5, {"quantity": "+1"}),
+            (3, 7, {"remarks": "A"}),
+        ]
+        journal.close()
+
+    def test_async_unsupported(self):
+        """Test the async client refuses write-behind buffers."""
+        pytest.importorskip("aiohttp")
+        from bricklink_py.async_bricklink import AsyncBricklink
+
+        client = AsyncBricklink("ck", "cs", "tk", "tks")
+        with pytest.raises(TypeError):
+            client.store_inventory.attach_write_behind(WriteBehindBuffer())